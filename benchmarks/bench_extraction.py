@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmark readability extraction and markdown conversion throughput over a corpus of saved HTML pages.
+
+Extracts every ``*.html`` file in the corpus directory inline (one core) and
+through the crawler's extraction pool with an increasing number of workers,
+then reports pages per second and pages per second per core.
+
+Usage:
+    uv run python -m benchmarks.bench_extraction path/to/html_dir [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.crawler import extraction
+
+
+def run(pages: list[str], workers: int) -> float:
+    os.environ["CRAWLER_EXTRACTION_WORKERS"] = str(workers)
+    extraction.shutdown_pool()
+    # Warm the pool up so process start-up isn't measured.
+    if workers:
+        list(ThreadPoolExecutor(workers).map(extraction.extract, pages[:workers]))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        list(executor.map(extraction.extract, pages))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("corpus", type=Path, help="directory of saved .html pages")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    pages = [
+        path.read_text(encoding="utf-8", errors="ignore")
+        for path in sorted(args.corpus.glob("*.html"))
+    ]
+    if not pages:
+        parser.error(f"no .html files found in {args.corpus}")
+    sizes = [len(page.encode("utf-8")) for page in pages]
+    total_mb = sum(sizes) / 1e6
+    large = sum(size > extraction.inline_extraction_max_bytes() for size in sizes)
+    print(f"{len(pages)} pages, {total_mb:.1f} MB, {large} above the inline limit")
+
+    print(f"{'mode':<12}{'seconds':>10}{'pages/s':>10}{'pages/s/core':>14}")
+    for workers in [0, *args.workers]:
+        elapsed = run(pages, workers)
+        cores = max(1, workers)
+        label = "inline" if workers == 0 else f"pool x{workers}"
+        rate = len(pages) / elapsed
+        print(f"{label:<12}{elapsed:>10.2f}{rate:>10.1f}{rate / cores:>14.1f}")
+    extraction.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmark the per-request cost of building sub-workflow graphs.
+
+Compares compiling a graph on every request (the old behaviour of the API
+handlers) with fetching it from the CompiledGraphRegistry.
+
+Usage:
+    uv run python -m benchmarks.bench_graph_registry [--iterations 200]
+"""
+
+import argparse
+import timeit
+
+from src.podcast.graph.builder import build_graph as build_podcast_graph
+from src.ppt.graph.builder import build_graph as build_ppt_graph
+from src.prompt_enhancer.graph.builder import build_graph as build_prompt_enhancer_graph
+from src.prose.graph.builder import build_graph as build_prose_graph
+from src.server.graph_registry import CompiledGraphRegistry
+
+BUILDERS = {
+    "podcast": build_podcast_graph,
+    "ppt": build_ppt_graph,
+    "prose": build_prose_graph,
+    "prompt_enhancer": build_prompt_enhancer_graph,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    registry = CompiledGraphRegistry(BUILDERS)
+    print(f"{'workflow':<16}{'rebuild (ms)':>14}{'registry (ms)':>15}")
+    for name, builder in BUILDERS.items():
+        rebuild = timeit.timeit(builder, number=args.iterations) / args.iterations
+        registry.get(name)
+        cached = (
+            timeit.timeit(lambda: registry.get(name), number=args.iterations)
+            / args.iterations
+        )
+        print(f"{name:<16}{rebuild * 1000:>14.3f}{cached * 1000:>15.5f}")
+
+
+if __name__ == "__main__":
+    main()
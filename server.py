@@ -50,6 +50,12 @@ if __name__ == "__main__":
         default=8000,
         help="Port to bind the server to (default: 8000)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes, requires CHECKPOINTER=sqlite (default: 1)",
+    )
     parser.add_argument(
         "--log-level",
         type=str,
@@ -72,6 +78,7 @@ if __name__ == "__main__":
             host=args.host,
             port=args.port,
             reload=reload,
+            workers=args.workers,
             log_level=args.log_level,
         )
     except Exception as e:
@@ -1,19 +1,90 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import os
+import threading
+from collections import OrderedDict
+
+from langchain_core.language_models import BaseChatModel
 from langgraph.prebuilt import create_react_agent
 
 from src.prompts import apply_prompt_template
+from src.prompts.layout import static_first
+from src.llms.cache import with_llm_cache
 from src.llms.llm import get_llm_by_type
+from src.llms.token_budget import fit_messages
 from src.config.agents import AGENT_LLM_MAP
 
+# Compiled agents kept for reuse by steps with the same agent, tools and model;
+# 0 disables the cache.
+AGENT_CACHE_MAX_SIZE = int(os.getenv("AGENT_CACHE_MAX_SIZE", "64"))
 
-# Create agents using configured LLM types
-def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template: str):
-    """Factory function to create agents with consistent configuration."""
+_agent_cache: OrderedDict[tuple, object] = OrderedDict()
+_agent_cache_lock = threading.Lock()
+
+
+def _agent_cache_key(
+    agent_name: str,
+    agent_type: str,
+    tools: list,
+    prompt_template: str,
+    llm: BaseChatModel,
+) -> tuple:
+    # Tools and the model are identified by object rather than by value: tools
+    # of an MCP session only work while that session is open. The cached agent
+    # keeps them alive, so their ids can't be reused by other objects.
+    tool_ids = tuple((tool.name, id(tool)) for tool in tools)
+    return agent_name, agent_type, prompt_template, id(llm), tool_ids
+
+
+def _prompt(state, prompt_template: str, agent_type: str, llm: BaseChatModel) -> list:
+    messages = fit_messages(
+        apply_prompt_template(prompt_template, state), agent_type, llm
+    )
+    return static_first(messages[:1], messages[1:])
+
+
+def _build_agent(
+    agent_name: str,
+    agent_type: str,
+    tools: list,
+    prompt_template: str,
+    llm: BaseChatModel,
+):
     return create_react_agent(
         name=agent_name,
-        model=get_llm_by_type(AGENT_LLM_MAP[agent_type]),
+        model=with_llm_cache(llm, agent_type),
         tools=tools,
-        prompt=lambda state: apply_prompt_template(prompt_template, state),
+        # Applied before every model call, so accumulated tool outputs are
+        # truncated once they overflow the agent's budget
+        prompt=lambda state: _prompt(state, prompt_template, agent_type, llm),
     )
+
+
+# Create agents using configured LLM types
+def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template: str):
+    """Factory function to create agents with consistent configuration.
+
+    Agents are cached, so building one for the same tool objects again returns
+    the compiled agent of the previous call.
+    """
+    llm = get_llm_by_type(AGENT_LLM_MAP[agent_type])
+    key = _agent_cache_key(agent_name, agent_type, tools, prompt_template, llm)
+    with _agent_cache_lock:
+        agent = _agent_cache.get(key)
+        if agent is not None:
+            _agent_cache.move_to_end(key)
+            return agent
+
+    agent = _build_agent(agent_name, agent_type, tools, prompt_template, llm)
+    if AGENT_CACHE_MAX_SIZE > 0:
+        with _agent_cache_lock:
+            _agent_cache[key] = agent
+            while len(_agent_cache) > AGENT_CACHE_MAX_SIZE:
+                _agent_cache.popitem(last=False)
+    return agent
+
+
+def clear_agent_cache() -> None:
+    with _agent_cache_lock:
+        _agent_cache.clear()
@@ -13,8 +13,38 @@ AGENT_LLM_MAP: dict[str, LLMType] = {
     "researcher": "basic",
     "coder": "coding",
     "reporter": "basic",
+    "observation_summarizer": "basic",
     "podcast_script_writer": "basic",
     "ppt_composer": "basic",
     "prose_writer": "basic",
     "prompt_enhancer": "basic",
 }
+
+# Agents whose LLM responses may be served from the response cache when
+# LLM_CACHE_ENABLED is set. Tool-using agents are excluded because their
+# answers depend on live tool results, and the reporter because it streams its
+# output, which bypasses the cache.
+AGENT_LLM_CACHE: dict[str, bool] = {
+    "coordinator": True,
+    "planner": True,
+    "researcher": False,
+    "coder": False,
+    "reporter": False,
+    "observation_summarizer": True,
+    "podcast_script_writer": True,
+    "ppt_composer": True,
+    "prose_writer": True,
+    "prompt_enhancer": True,
+}
+
+# Prompt token budget per agent. Prompts beyond it are truncated, least
+# important messages first (see src/llms/token_budget.py).
+DEFAULT_TOKEN_BUDGET = 32000
+AGENT_TOKEN_BUDGET: dict[str, int] = {
+    "coordinator": 8000,
+    "planner": 24000,
+    "researcher": 48000,
+    "coder": 48000,
+    "reporter": 48000,
+    "observation_summarizer": 24000,
+}
@@ -21,8 +21,12 @@ class Configuration:
     max_plan_iterations: int = 1  # Maximum number of plan iterations
     max_step_num: int = 3  # Maximum number of steps in a plan
     max_search_results: int = 3  # Maximum number of search results
+    max_parallel_steps: int = 3  # Maximum number of plan steps executed concurrently
     mcp_settings: dict = None  # MCP settings, including dynamic loaded tools
     report_style: str = ReportStyle.ACADEMIC.value  # Report style
+    max_observation_tokens: int = 8000  # Observations budget of the reporter prompt
+    # Run the background investigation search concurrently with the coordinator
+    speculative_background_investigation: bool = False
 
     @classmethod
     def from_runnable_config(
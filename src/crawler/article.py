@@ -2,23 +2,66 @@
 # SPDX-License-Identifier: MIT
 
 import re
+from typing import Optional
 from urllib.parse import urljoin
 
 from markdownify import markdownify as md
 
+from .excerpt import markdown_excerpt
+
 
 class Article:
     url: str
 
-    def __init__(self, title: str, html_content: str):
+    def __init__(self, title: str, html_content: str, markdown: Optional[str] = None):
         self.title = title
         self.html_content = html_content
+        # Markdown of html_content, when it was converted by the extraction
+        # worker; it is cached along with the article.
+        self.markdown = markdown
+
+    def to_dict(self) -> dict:
+        return {
+            "url": getattr(self, "url", None),
+            "title": self.title,
+            "html_content": self.html_content,
+            "markdown": self.markdown,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Article":
+        article = cls(
+            title=data.get("title"),
+            html_content=data.get("html_content"),
+            markdown=data.get("markdown"),
+        )
+        article.url = data.get("url")
+        return article
 
     def to_markdown(self, including_title: bool = True) -> str:
         markdown = ""
         if including_title:
             markdown += f"# {self.title}\n\n"
-        markdown += md(self.html_content)
+        if self.markdown is not None:
+            markdown += self.markdown
+        else:
+            markdown += md(self.html_content)
+        return markdown
+
+    def to_markdown_excerpt(
+        self,
+        max_tokens: int,
+        query: Optional[str] = None,
+        including_title: bool = True,
+    ) -> str:
+        """
+        Convert at most ``max_tokens`` of the article to markdown, preferring
+        the parts most relevant to ``query`` when one is given.
+        """
+        markdown = ""
+        if including_title:
+            markdown += f"# {self.title}\n\n"
+        markdown += markdown_excerpt(self.html_content, max_tokens, query)
         return markdown
 
     def to_message(self) -> list[dict]:
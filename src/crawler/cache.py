@@ -0,0 +1,92 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import logging
+from typing import Awaitable, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.utils.cache import TTLCache
+
+from .article import Article
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref_src"}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so that trivially different spellings share a cache entry.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters (``utm_*``, ``gclid``...), and sorts the query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        userinfo = parts.username
+        if parts.password:
+            userinfo += f":{parts.password}"
+        host = f"{userinfo}@{host}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class CrawlCache:
+    """
+    Caches extracted articles by canonical URL.
+
+    Articles are kept in memory and, when ``CRAWL_CACHE_DIR`` is set, in
+    gzip-compressed files named by the digest of the canonical URL, limited to
+    ``CRAWL_CACHE_DIR_MAX_BYTES``. Concurrent crawls of the same URL are
+    coalesced into a single fetch and extraction.
+    """
+
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+
+    @classmethod
+    def from_env(cls) -> "CrawlCache":
+        return cls(
+            TTLCache.from_env(
+                "CRAWL_CACHE",
+                ttl_seconds=24 * 3600,
+                max_entries=256,
+                compress=True,
+                dir_max_bytes=256 * 1024 * 1024,
+            )
+        )
+
+    @staticmethod
+    def _should_cache(data: dict) -> bool:
+        return bool(data.get("html_content"))
+
+    def get_or_crawl(self, url: str, crawl: Callable[[str], Article]) -> Article:
+        key = canonicalize_url(url)
+        data = self.cache.get_or_compute(
+            key, lambda: crawl(url).to_dict(), should_cache=self._should_cache
+        )
+        article = Article.from_dict(data)
+        article.url = url
+        return article
+
+    async def aget_or_crawl(
+        self, url: str, crawl: Callable[[str], Awaitable[Article]]
+    ) -> Article:
+        async def compute() -> dict:
+            return (await crawl(url)).to_dict()
+
+        data = await self.cache.aget_or_compute(
+            canonicalize_url(url), compute, should_cache=self._should_cache
+        )
+        article = Article.from_dict(data)
+        article.url = url
+        return article
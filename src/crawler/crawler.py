@@ -1,15 +1,26 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-import sys
+import asyncio
+import os
+from typing import Optional, Union
 
 from .article import Article
+from .cache import CrawlCache
 from .jina_client import JinaClient
 from .readability_extractor import ReadabilityExtractor
 
 
 class Crawler:
+    def __init__(self, cache: Optional[CrawlCache] = None):
+        self.cache = cache
+
     def crawl(self, url: str) -> Article:
+        if self.cache is None:
+            return self._crawl(url)
+        return self.cache.get_or_crawl(url, self._crawl)
+
+    def _crawl(self, url: str) -> Article:
         # To help LLMs better understand content, we extract clean
         # articles from HTML, convert them to markdown, and split
         # them into text and image blocks for one single and unified
@@ -26,3 +37,42 @@ class Crawler:
         article = extractor.extract_article(html)
         article.url = url
         return article
+
+    async def acrawl(self, url: str) -> Article:
+        """Crawl ``url`` without blocking the event loop."""
+        if self.cache is None:
+            return await self._acrawl(url)
+        return await self.cache.aget_or_crawl(url, self._acrawl)
+
+    async def _acrawl(self, url: str) -> Article:
+        jina_client = JinaClient()
+        html = await jina_client.acrawl(url, return_format="html")
+        # Readability extraction is CPU bound, keep it off the event loop.
+        extractor = ReadabilityExtractor()
+        article = await asyncio.to_thread(extractor.extract_article, html)
+        article.url = url
+        return article
+
+    async def crawl_many(
+        self, urls: list[str], max_concurrency: Optional[int] = None
+    ) -> list[Union[Article, BaseException]]:
+        """
+        Crawl several URLs concurrently.
+
+        Returns one entry per input URL, in order: the crawled article, or the
+        exception that made that URL fail. A failure never aborts the others.
+        """
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("CRAWLER_MAX_CONCURRENCY", "5"))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def crawl_one(url: str) -> Article:
+            async with semaphore:
+                return await self.acrawl(url)
+
+        unique_urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(
+            *(crawl_one(url) for url in unique_urls), return_exceptions=True
+        )
+        by_url = dict(zip(unique_urls, results))
+        return [by_url[url] for url in urls]
@@ -0,0 +1,197 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Budgeted markdown excerpts of crawled articles.
+
+Instead of converting a whole page to markdown and cutting an arbitrary
+prefix, the article HTML is split into block-level chunks. Without a query the
+chunks are converted in document order until the token budget is spent; with a
+query the chunks most relevant to it are selected first and only those are
+converted.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Union
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from markdownify import markdownify as md
+
+BLOCK_TAGS = {
+    "p",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "ul",
+    "ol",
+    "dl",
+    "pre",
+    "blockquote",
+    "table",
+    "figure",
+    "img",
+}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+CHUNK_TOKENS = 150
+OMISSION_MARKER = "[...]"
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or that the this to "
+    "was what when where which who why with about into over under their its".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used to budget excerpts (about four characters each)."""
+    return math.ceil(len(text) / 4)
+
+
+@dataclass
+class _Chunk:
+    position: int
+    blocks: list[Union[Tag, NavigableString]] = field(default_factory=list)
+    text: str = ""
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    def to_markdown(self) -> str:
+        return "\n\n".join(
+            md(str(block)).strip() for block in self.blocks if str(block).strip()
+        )
+
+
+def _iter_blocks(node: Tag) -> Iterator[Union[Tag, NavigableString]]:
+    for child in node.children:
+        if isinstance(child, Tag):
+            if child.name in BLOCK_TAGS or not child.find(BLOCK_TAGS):
+                yield child
+            else:
+                yield from _iter_blocks(child)
+        elif isinstance(child, NavigableString) and child.strip():
+            yield child
+
+
+def _iter_chunks(html: str) -> Iterator[_Chunk]:
+    soup = BeautifulSoup(html or "", "html.parser")
+    chunk = _Chunk(position=0)
+    for block in _iter_blocks(soup):
+        text = block.get_text(" ", strip=True) if isinstance(block, Tag) else block
+        is_heading = isinstance(block, Tag) and block.name in HEADING_TAGS
+        # Headings open a new chunk so they stay attached to their section.
+        if chunk.blocks and (is_heading or chunk.tokens >= CHUNK_TOKENS):
+            yield chunk
+            chunk = _Chunk(position=chunk.position + 1)
+        chunk.blocks.append(block)
+        chunk.text = f"{chunk.text} {text}".strip()
+    if chunk.blocks:
+        yield chunk
+
+
+def _terms(text: str) -> list[str]:
+    return [
+        word
+        for word in _WORD_PATTERN.findall(text.lower())
+        if len(word) > 1 and word not in _STOPWORDS
+    ]
+
+
+def _rank_chunks(chunks: list[_Chunk], query: str) -> list[_Chunk]:
+    """Order chunks by BM25-style relevance to the query, best first."""
+    query_terms = set(_terms(query))
+    chunk_terms = [Counter(_terms(chunk.text)) for chunk in chunks]
+    document_frequency = Counter(
+        term for terms in chunk_terms for term in query_terms if term in terms
+    )
+    average_length = sum(sum(terms.values()) for terms in chunk_terms) / max(
+        1, len(chunks)
+    )
+
+    def score(index: int) -> float:
+        terms = chunk_terms[index]
+        length = sum(terms.values())
+        total = 0.0
+        for term in query_terms:
+            frequency = terms.get(term, 0)
+            if not frequency:
+                continue
+            idf = math.log(
+                1
+                + (len(chunks) - document_frequency[term] + 0.5)
+                / (document_frequency[term] + 0.5)
+            )
+            total += (
+                idf
+                * (frequency * 2.2)
+                / (frequency + 1.2 * (0.25 + 0.75 * length / max(1.0, average_length)))
+            )
+        # The opening of an article usually summarizes it.
+        if index == 0:
+            total += 0.5
+        return total
+
+    order = sorted(range(len(chunks)), key=lambda i: (-score(i), i))
+    return [chunks[i] for i in order]
+
+
+def _truncate(markdown: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4
+    if len(markdown) <= max_chars:
+        return markdown
+    cut = markdown.rfind(" ", 0, max_chars)
+    return markdown[: cut if cut > 0 else max_chars].rstrip() + " " + OMISSION_MARKER
+
+
+def markdown_excerpt(html: str, max_tokens: int, query: Optional[str] = None) -> str:
+    """
+    Convert the most useful ``max_tokens`` of an article's HTML to markdown.
+
+    Args:
+        html: Cleaned article HTML.
+        max_tokens: Token budget for the returned markdown.
+        query: Optional text (e.g. the current research step) used to pick the
+            most relevant chunks. Without it the article is read in order.
+    """
+    if max_tokens <= 0:
+        return ""
+
+    if not query or not _terms(query):
+        parts = []
+        remaining = max_tokens
+        for chunk in _iter_chunks(html):
+            markdown = chunk.to_markdown()
+            if estimate_tokens(markdown) > remaining:
+                parts.append(_truncate(markdown, remaining))
+                break
+            parts.append(markdown)
+            remaining -= estimate_tokens(markdown)
+        return "\n\n".join(part for part in parts if part)
+
+    chunks = list(_iter_chunks(html))
+    selected = []
+    remaining = max_tokens
+    for chunk in _rank_chunks(chunks, query):
+        if chunk.tokens <= remaining:
+            selected.append(chunk)
+            remaining -= chunk.tokens
+    if not selected and chunks:
+        best = _rank_chunks(chunks, query)[0]
+        return _truncate(best.to_markdown(), max_tokens)
+
+    parts = []
+    previous = -1
+    for chunk in sorted(selected, key=lambda c: c.position):
+        if previous >= 0 and chunk.position != previous + 1:
+            parts.append(OMISSION_MARKER)
+        parts.append(chunk.to_markdown())
+        previous = chunk.position
+    # Markdown syntax adds a little to the plain text the chunks were sized by.
+    return _truncate("\n\n".join(part for part in parts if part), max_tokens)
@@ -0,0 +1,98 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Readability extraction off the calling thread.
+
+Extracting an article with ``use_readability=True`` and converting it to
+markdown are CPU heavy (readability may also shell out to Node), so large
+pages are dispatched to a process pool where they don't hold the GIL of the
+server process. Small pages take a pure-Python fast path inline, where the cost
+of shipping the HTML to a worker would dominate.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from markdownify import markdownify as md
+from readabilipy import simple_json_from_html_string
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def extraction_workers() -> int:
+    """Number of extraction processes; ``0`` extracts every page inline."""
+    default = min(4, os.cpu_count() or 1)
+    return int(os.getenv("CRAWLER_EXTRACTION_WORKERS", str(default)))
+
+
+def inline_extraction_max_bytes() -> int:
+    """Pages up to this many UTF-8 bytes use the inline pure-Python fast path."""
+    return int(os.getenv("CRAWLER_INLINE_EXTRACTION_MAX_BYTES", "32768"))
+
+
+def extract_article_data(html: str, use_readability: bool = True) -> dict:
+    """Extract the title, cleaned HTML content and markdown of an article."""
+    article = simple_json_from_html_string(html, use_readability=use_readability)
+    content = article.get("content")
+    return {
+        "title": article.get("title"),
+        "content": content,
+        "markdown": md(content) if content else None,
+    }
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned workers don't inherit the server's threads and locks.
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started crawler extraction pool with {workers} workers")
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def shutdown_pool() -> None:
+    """Stop the extraction workers; a new pool is started on next use."""
+    _reset_pool()
+
+
+def extract(html: str) -> dict:
+    """
+    Extract an article, choosing between the inline fast path and the pool.
+
+    Blocks the calling thread (but not the GIL) until the article is ready, so
+    async callers should run it via ``asyncio.to_thread``.
+    """
+    workers = extraction_workers()
+    max_bytes = inline_extraction_max_bytes()
+    # A page has at least as many bytes as characters, skip encoding long ones
+    if len(html) <= max_bytes and len(html.encode("utf-8")) <= max_bytes:
+        return extract_article_data(html, use_readability=False)
+    if workers <= 0:
+        return extract_article_data(html)
+    try:
+        return _get_pool(workers).submit(extract_article_data, html).result()
+    except BrokenProcessPool:
+        logger.warning("Crawler extraction pool broke, extracting inline")
+        _reset_pool()
+        return extract_article_data(html)
@@ -1,15 +1,15 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from readabilipy import simple_json_from_html_string
-
 from .article import Article
+from .extraction import extract
 
 
 class ReadabilityExtractor:
     def extract_article(self, html: str) -> Article:
-        article = simple_json_from_html_string(html, use_readability=True)
+        article = extract(html)
         return Article(
             title=article.get("title"),
             html_content=article.get("content"),
+            markdown=article.get("markdown"),
         )
@@ -1,26 +1,57 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
-from src.prompts.planner_model import StepType
 import logging
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
+
+from src.config.configuration import Configuration
+from src.prompts.planner_model import Plan, StepType
+from .checkpointer import build_checkpointer
 from .types import State
 from .nodes import (
-    coordinator_node,
-    planner_node,
-    reporter_node,
+    coordinator_node_async,
+    planner_node_async,
+    reporter_node_async,
     research_team_node,
     researcher_node,
     coder_node,
-    human_feedback_node,
-    background_investigation_node,
+    human_feedback_node_async,
+    background_investigation_node_async,
 )
 
 logger = logging.getLogger(__name__)
 
-def continue_to_running_research_team(state: State):
-    logger.info("=== ROUTING DEBUG START ===")
+STEP_TYPE_TO_AGENT = {
+    StepType.RESEARCH: "researcher",
+    StepType.PROCESSING: "coder",
+    StepType.CODE_GENERATION: "coder",
+}
+
+
+def get_next_step_indexes(plan: Plan, max_parallel_steps: int) -> list[int]:
+    """Return the indexes of the plan steps that can be executed next.
+
+    This is the ready part of the plan's topological order: every unexecuted
+    step whose dependencies have all been executed, in plan order, capped at
+    ``max_parallel_steps``. Steps that are not ready wait for a later wave.
+    """
+    max_parallel_steps = max(1, int(max_parallel_steps))
+    indexes = []
+    for index, step in enumerate(plan.steps):
+        if step.execution_res:
+            continue
+        if not all(plan.steps[i].execution_res for i in plan.get_dependencies(index)):
+            continue
+        indexes.append(index)
+        if len(indexes) >= max_parallel_steps:
+            break
+    return indexes
+
+
+def continue_to_running_research_team(state: State, config: RunnableConfig):
     current_plan = state.get("current_plan")
 
     if not current_plan or not current_plan.steps:
@@ -32,60 +63,39 @@ def continue_to_running_research_team(state: State):
         logger.info("All steps completed, routing to planner")
         return "planner"
 
-    for step in current_plan.steps:
-        if not step.execution_res:
-            break
-
-    if step.step_type and step.step_type == StepType.RESEARCH:
-        logger.info(f"Routing to researcher: {step.title}")
-        return "researcher"
-    if step.step_type and step.step_type == StepType.PROCESSING:
-        logger.info("Routing to coder")
-        return "coder"
-    return "planner"
-
-
-    # # Find the first unexecuted step
-    # current_step = None
-    # for i, step in enumerate(current_plan.steps):
-    #     if not step.execution_res:
-    #         current_step = step
-    #         logger.info(f"Found unexecuted step {i+1}: {step.title}")
-    #         logger.info(f"Step type: {step.step_type}")
-    #         logger.info(f"Step description: {step.description}")
-    #         break
-
-    # if not current_step:
-    #     logger.info("No unexecuted step found, routing to planner")
-    #     return "planner"
-
-    # # Route based on step type - FIX: use current_step instead of step
-    # if current_step.step_type and current_step.step_type == StepType.RESEARCH:
-    #     logger.info("Routing to researcher")
-    #     return "researcher"
-    # elif current_step.step_type and current_step.step_type == StepType.PROCESSING:
-    #     logger.info("Routing to coder (processing)")
-    #     return "coder"
-    # elif current_step.step_type and current_step.step_type == StepType.CODE_GENERATION:
-    #     logger.info("Routing to coder (code generation)")
-    #     return "coder"
-    # else:
-    #     logger.warning(f"Unknown step type: {current_step.step_type}, routing to planner")
-    #     return "planner"
+    configurable = Configuration.from_runnable_config(config)
+    sends = []
+    for index in get_next_step_indexes(current_plan, configurable.max_parallel_steps):
+        step = current_plan.steps[index]
+        agent = STEP_TYPE_TO_AGENT.get(step.step_type)
+        if not agent:
+            logger.warning(f"Unknown step type: {step.step_type}, skipping")
+            continue
+        logger.info(f"Routing step {index + 1} '{step.title}' to {agent}")
+        sends.append(Send(agent, {**state, "current_step_index": index}))
+
+    if not sends:
+        return "planner"
+    return sends
 
 
 def _build_base_graph():
-    """Build and return the base state graph with all nodes and edges."""
+    """Build and return the base state graph with all nodes and edges.
+
+    The graph is run with ``astream``/``ainvoke``, so the nodes that wait on
+    the network are registered in their async versions and run on the event
+    loop instead of holding a worker thread each.
+    """
     builder = StateGraph(State)
     builder.add_edge(START, "coordinator")
-    builder.add_node("coordinator", coordinator_node)
-    builder.add_node("background_investigator", background_investigation_node)
-    builder.add_node("planner", planner_node)
-    builder.add_node("reporter", reporter_node)
+    builder.add_node("coordinator", coordinator_node_async)
+    builder.add_node("background_investigator", background_investigation_node_async)
+    builder.add_node("planner", planner_node_async)
+    builder.add_node("reporter", reporter_node_async)
     builder.add_node("research_team", research_team_node)
     builder.add_node("researcher", researcher_node)
     builder.add_node("coder", coder_node)
-    builder.add_node("human_feedback", human_feedback_node)
+    builder.add_node("human_feedback", human_feedback_node_async)
     builder.add_edge("background_investigator", "planner")
     builder.add_conditional_edges(
         "research_team",
@@ -98,9 +108,8 @@ def _build_base_graph():
 
 def build_graph_with_memory():
     """Build and return the agent workflow graph with memory."""
-    # use persistent memory to save conversation history
-    # TODO: be compatible with SQLite / PostgreSQL
-    memory = MemorySaver()
+    # use the configured checkpointer to save conversation history
+    memory = build_checkpointer()
 
     # build state graph
     builder = _build_base_graph()
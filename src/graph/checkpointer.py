@@ -0,0 +1,463 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Checkpoint savers used to persist the conversation state of the workflow graph.
+"""
+
+import asyncio
+import enum
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, List, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.types import TASKS
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointerBackend(enum.Enum):
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+
+class TTLMemorySaver(InMemorySaver):
+    """
+    In-memory checkpoint saver that evicts threads not updated within ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: Optional[float] = None,
+        sweep_interval_seconds: float = 60.0,
+        serde: Optional[SerializerProtocol] = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._last_updated: dict[str, float] = {}
+        self._last_sweep = time.monotonic()
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        self._last_updated[config["configurable"]["thread_id"]] = time.monotonic()
+        self.evict_expired_threads()
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._last_updated.pop(thread_id, None)
+        super().delete_thread(thread_id)
+
+    def evict_expired_threads(self, force: bool = False) -> List[str]:
+        """Delete the threads that have not been updated within the TTL."""
+        if not self.ttl_seconds:
+            return []
+        now = time.monotonic()
+        if not force and now - self._last_sweep < self.sweep_interval_seconds:
+            return []
+        self._last_sweep = now
+        expired = [
+            thread_id
+            for thread_id, updated in self._last_updated.items()
+            if now - updated > self.ttl_seconds
+        ]
+        for thread_id in expired:
+            self.delete_thread(thread_id)
+        if expired:
+            logger.info(f"Evicted {len(expired)} expired threads from memory")
+        return expired
+
+
+class SQLiteSaver(BaseCheckpointSaver[str]):
+    """
+    Checkpoint saver that stores checkpoints in a SQLite database file.
+
+    Each checkpoint is stored with its channel values, serialized by the graph's
+    serializer and compressed with zlib. The database runs in WAL mode so that
+    several server processes on the same host can share one file. Threads not
+    updated within ``ttl_seconds`` are evicted, and ``keep_last`` bounds the
+    number of checkpoints kept per thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        ttl_seconds: Optional[float] = None,
+        keep_last: Optional[int] = None,
+        sweep_interval_seconds: float = 60.0,
+        serde: Optional[SerializerProtocol] = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        # The parent checkpoint is needed to restore pending sends
+        self.keep_last = max(keep_last, 2) if keep_last else None
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._setup()
+
+    def _setup(self) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    checkpoint BLOB NOT NULL,
+                    metadata BLOB NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                )
+                """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS writes (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    task_path TEXT NOT NULL DEFAULT '',
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                )
+                """)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS checkpoints_updated_at "
+                "ON checkpoints (thread_id, updated_at)"
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def _dumps(self, obj: Any) -> bytes:
+        type_, data = self.serde.dumps_typed(obj)
+        return type_.encode() + b":" + zlib.compress(data)
+
+    def _loads(self, blob: bytes) -> Any:
+        type_, data = blob.split(b":", 1)
+        return self.serde.loads_typed((type_.decode(), zlib.decompress(data)))
+
+    def _load_pending_sends(
+        self, thread_id: str, checkpoint_ns: str, parent_checkpoint_id: Optional[str]
+    ) -> List[Any]:
+        if not parent_checkpoint_id:
+            return []
+        rows = self.conn.execute(
+            "SELECT value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? "
+            "AND checkpoint_id = ? AND channel = ? ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, parent_checkpoint_id, TASKS),
+        ).fetchall()
+        return [self._loads(value) for (value,) in rows]
+
+    def _to_checkpoint_tuple(self, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, blob, meta = row
+        writes = self.conn.execute(
+            "SELECT task_id, channel, value FROM writes WHERE thread_id = ? "
+            "AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        checkpoint: Checkpoint = self._loads(blob)
+        checkpoint["pending_sends"] = self._load_pending_sends(
+            thread_id, checkpoint_ns, parent_checkpoint_id
+        )
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=checkpoint,
+            metadata=self._loads(meta),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self._loads(value))
+                for task_id, channel, value in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "checkpoint, metadata FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: tuple = (thread_id, checkpoint_ns)
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        with self._lock:
+            row = self.conn.execute(query, params).fetchone()
+            return self._to_checkpoint_tuple(row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "checkpoint, metadata FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (
+                checkpoint_ns := config["configurable"].get("checkpoint_ns")
+            ) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_checkpoint_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+            results = []
+            for row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                checkpoint_tuple = self._to_checkpoint_tuple(row)
+                if filter and not all(
+                    checkpoint_tuple.metadata.get(key) == value
+                    for key, value in filter.items()
+                ):
+                    continue
+                results.append(checkpoint_tuple)
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        c = checkpoint.copy()
+        c.pop("pending_sends", None)  # type: ignore[misc]
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    self._dumps(c),
+                    self._dumps(get_checkpoint_metadata(config, metadata)),
+                    time.time(),
+                ),
+            )
+            if self.keep_last:
+                self._prune(thread_id, checkpoint_ns)
+        self.evict_expired_threads()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+        """Delete all but the ``keep_last`` latest checkpoints of a thread."""
+        stale = self.conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? "
+            "AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.keep_last),
+        ).fetchall()
+        for (checkpoint_id,) in stale:
+            for table in ("checkpoints", "writes"):
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                )
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        with self._lock, self.conn:
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                # Regular writes are idempotent, special writes (errors,
+                # interrupts) replace the previous value
+                verb = "INSERT OR IGNORE" if write_idx >= 0 else "INSERT OR REPLACE"
+                self.conn.execute(
+                    f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_id,
+                        task_id,
+                        write_idx,
+                        channel,
+                        self._dumps(value),
+                        task_path,
+                    ),
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,)
+            )
+            self.conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+    def evict_expired_threads(self, force: bool = False) -> List[str]:
+        """Delete the threads that have not been updated within the TTL."""
+        if not self.ttl_seconds:
+            return []
+        now = time.time()
+        if not force and now - self._last_sweep < self.sweep_interval_seconds:
+            return []
+        self._last_sweep = now
+        with self._lock:
+            expired = [
+                thread_id
+                for (thread_id,) in self.conn.execute(
+                    "SELECT thread_id FROM checkpoints GROUP BY thread_id "
+                    "HAVING MAX(updated_at) < ?",
+                    (now - self.ttl_seconds,),
+                ).fetchall()
+            ]
+        for thread_id in expired:
+            self.delete_thread(thread_id)
+        if expired:
+            logger.info(f"Evicted {len(expired)} expired threads from {self.path}")
+        return expired
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in results:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def _get_float_env(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def build_checkpointer() -> BaseCheckpointSaver:
+    """
+    Build the checkpoint saver selected by the ``CHECKPOINTER`` environment variable.
+
+    Supported values are ``memory`` (default) and ``sqlite``. The SQLite file is
+    set by ``CHECKPOINTER_SQLITE_PATH``, ``CHECKPOINTER_TTL_SECONDS`` enables
+    eviction of idle threads and ``CHECKPOINTER_KEEP_LAST`` bounds the number
+    of checkpoints kept per thread.
+    """
+    backend = os.getenv("CHECKPOINTER", CheckpointerBackend.MEMORY.value).lower()
+    ttl_seconds = _get_float_env("CHECKPOINTER_TTL_SECONDS")
+    if backend == CheckpointerBackend.MEMORY.value:
+        return TTLMemorySaver(ttl_seconds=ttl_seconds)
+    if backend == CheckpointerBackend.SQLITE.value:
+        keep_last = os.getenv("CHECKPOINTER_KEEP_LAST")
+        return SQLiteSaver(
+            os.getenv("CHECKPOINTER_SQLITE_PATH", "data/checkpoints.sqlite"),
+            ttl_seconds=ttl_seconds,
+            keep_last=int(keep_last) if keep_last else None,
+        )
+    raise ValueError(f"Unsupported checkpointer: {backend}")
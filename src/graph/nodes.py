@@ -1,21 +1,26 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import json
 import logging
 import os
+from collections import OrderedDict
 from typing import Annotated, Literal
 from src.prompts.planner_model import StepType
 
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
-from langchain_core.tools import tool
+from langchain_core.tools import BaseTool, tool
 from langgraph.types import Command, interrupt
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from pydantic import ValidationError
 
 from src.agents import create_agent
+from src.tools.crawl import crawl_relevance_query
+from src.tools.mcp_pool import get_mcp_session_pool
 from src.tools.search import LoggedTavilySearch
 from src.tools import (
+    batch_crawl_tool,
     crawl_tool,
     get_web_search_tool,
     get_retriever_tool,
@@ -30,11 +35,15 @@ from src.tools import (
 
 from src.config.agents import AGENT_LLM_MAP
 from src.config.configuration import Configuration
+from src.llms.cache import with_llm_cache
 from src.llms.llm import get_llm_by_type
-from src.prompts.planner_model import Plan
+from src.llms.token_budget import fit_messages
+from src.prompts.layout import prefix_caching_enabled, static_first
+from src.prompts.planner_model import Plan, Step
 from src.prompts.template import apply_prompt_template
 from src.utils.json_utils import repair_json_output
 
+from .observations import acompact_observations, compact_observations
 from .types import State
 from ..config import SELECTED_SEARCH_ENGINE, SearchEngine
 
@@ -52,52 +61,66 @@ def handoff_to_planner(
     return
 
 
-def background_investigation_node(state: State, config: RunnableConfig):
-    logger.info("background investigation node is running.")
-    configurable = Configuration.from_runnable_config(config)
-    query = state["messages"][-1].content
-    background_investigation_results = None
+def _background_search_tool(configurable: Configuration):
+    if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value:
+        return LoggedTavilySearch(max_results=configurable.max_search_results)
+    return get_web_search_tool(configurable.max_search_results)
+
+
+def _background_investigation_update(searched_content) -> dict:
     if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value:
-        searched_content = LoggedTavilySearch(
-            max_results=configurable.max_search_results
-        ).invoke(query)
-        ##print("sync", json.dumps(searched_content, indent=2, ensure_ascii=False))
         if isinstance(searched_content, list):
             background_investigation_results = [
                 f"## {elem['title']}\n\n{elem['content']}" for elem in searched_content
             ]
-            #print(f"background_investigation_results: {background_investigation_results}")
             return {
                 "background_investigation_results": "\n\n".join(
                     background_investigation_results
                 )
             }
-        else:
-            logger.error(
-                f"Tavily search returned malformed response: {searched_content}"
-            )
-    else:
-        background_investigation_results = get_web_search_tool(
-            configurable.max_search_results
-        ).invoke(query)
+        logger.error(f"Tavily search returned malformed response: {searched_content}")
+        searched_content = None
     return {
         "background_investigation_results": json.dumps(
-            background_investigation_results, ensure_ascii=False
+            searched_content, ensure_ascii=False
         )
     }
 
 
-def planner_node(
-    state: State, config: RunnableConfig
-) -> Command[Literal["human_feedback", "reporter"]]:
-    """Planner node that generate the full plan."""
-    logger.info("Planner generating full plan")
+def background_investigation_node(state: State, config: RunnableConfig):
+    logger.info("background investigation node is running.")
     configurable = Configuration.from_runnable_config(config)
-    # print(f"state: {state}")
-    # print(f"messages: {state['messages']}")
-    # print(f"background_investigation_results: {state['background_investigation_results']}")
-    # print(f"configurable: {configurable}")
-    plan_iterations = state["plan_iterations"] if state.get("plan_iterations", 0) else 0
+    query = state["messages"][-1].content
+    searched_content = _background_search_tool(configurable).invoke(query)
+    return _background_investigation_update(searched_content)
+
+
+async def background_investigation_node_async(state: State, config: RunnableConfig):
+    """Async version of background_investigation_node."""
+    logger.info("background investigation node is running.")
+    configurable = Configuration.from_runnable_config(config)
+    query = state["messages"][-1].content
+    searched_content = await _background_search_tool(configurable).ainvoke(query)
+    return _background_investigation_update(searched_content)
+
+
+def _validate_plan(plan: dict) -> Plan:
+    """Validate a planner response, dropping step dependencies that do not form a DAG."""
+    try:
+        return Plan.model_validate(plan)
+    except ValidationError as e:
+        if not any(step.get("depends_on") for step in plan.get("steps") or []):
+            raise
+        logger.warning(f"Invalid step dependencies, executing steps in order: {e}")
+        steps = [
+            {k: v for k, v in step.items() if k != "depends_on"}
+            for step in plan["steps"]
+        ]
+        return Plan.model_validate({**plan, "steps": steps})
+
+
+def _planner_prompt(state: State, configurable: Configuration, plan_iterations: int):
+    """Return the planner messages and the model to send them to."""
     messages = apply_prompt_template("planner", state, configurable)
 
     if (
@@ -116,27 +139,26 @@ def planner_node(
             }
         ]
 
+    messages = fit_messages(
+        messages, "planner", get_llm_by_type(AGENT_LLM_MAP["planner"])
+    )
+    messages = static_first(messages[:1], messages[1:])
     print(f"messages: {messages}")
     if AGENT_LLM_MAP["planner"] == "basic":
-        llm = get_llm_by_type(AGENT_LLM_MAP["planner"]).with_structured_output(
+        llm = with_llm_cache(
+            get_llm_by_type(AGENT_LLM_MAP["planner"]), "planner"
+        ).with_structured_output(
             Plan,
             method="json_mode",
         )
     else:
-        llm = get_llm_by_type(AGENT_LLM_MAP["planner"])
+        llm = with_llm_cache(get_llm_by_type(AGENT_LLM_MAP["planner"]), "planner")
+    return messages, llm
 
-    # if the plan iterations is greater than the max plan iterations, return the reporter node
-    if plan_iterations >= configurable.max_plan_iterations:
-        return Command(goto="reporter")
 
-    full_response = ""
-    if AGENT_LLM_MAP["planner"] == "basic":
-        response = llm.invoke(messages)
-        full_response = response.model_dump_json(indent=4, exclude_none=True)
-    else:
-        response = llm.stream(messages)
-        for chunk in response:
-            full_response += chunk.content
+def _planner_command(
+    state: State, full_response: str, plan_iterations: int
+) -> Command[Literal["human_feedback", "reporter"]]:
     logger.debug(f"Current state messages: {state['messages']}")
     logger.info(f"Planner response: {full_response}")
 
@@ -150,7 +172,7 @@ def planner_node(
             return Command(goto="__end__")
     if curr_plan.get("has_enough_context"):
         logger.info("Planner response has enough context.")
-        new_plan = Plan.model_validate(curr_plan)
+        new_plan = _validate_plan(curr_plan)
         return Command(
             update={
                 "messages": [AIMessage(content=full_response, name="planner")],
@@ -167,6 +189,51 @@ def planner_node(
     )
 
 
+def planner_node(
+    state: State, config: RunnableConfig
+) -> Command[Literal["human_feedback", "reporter"]]:
+    """Planner node that generate the full plan."""
+    logger.info("Planner generating full plan")
+    configurable = Configuration.from_runnable_config(config)
+    plan_iterations = state["plan_iterations"] if state.get("plan_iterations", 0) else 0
+
+    # if the plan iterations is greater than the max plan iterations, return the reporter node
+    if plan_iterations >= configurable.max_plan_iterations:
+        return Command(goto="reporter")
+
+    messages, llm = _planner_prompt(state, configurable, plan_iterations)
+    full_response = ""
+    if AGENT_LLM_MAP["planner"] == "basic":
+        response = llm.invoke(messages)
+        full_response = response.model_dump_json(indent=4, exclude_none=True)
+    else:
+        for chunk in llm.stream(messages):
+            full_response += chunk.content
+    return _planner_command(state, full_response, plan_iterations)
+
+
+async def planner_node_async(
+    state: State, config: RunnableConfig
+) -> Command[Literal["human_feedback", "reporter"]]:
+    """Async version of planner_node."""
+    logger.info("Planner generating full plan")
+    configurable = Configuration.from_runnable_config(config)
+    plan_iterations = state["plan_iterations"] if state.get("plan_iterations", 0) else 0
+
+    if plan_iterations >= configurable.max_plan_iterations:
+        return Command(goto="reporter")
+
+    messages, llm = _planner_prompt(state, configurable, plan_iterations)
+    full_response = ""
+    if AGENT_LLM_MAP["planner"] == "basic":
+        response = await llm.ainvoke(messages)
+        full_response = response.model_dump_json(indent=4, exclude_none=True)
+    else:
+        async for chunk in llm.astream(messages):
+            full_response += chunk.content
+    return _planner_command(state, full_response, plan_iterations)
+
+
 def human_feedback_node(
     state,
 ) -> Command[Literal["planner", "research_team", "reporter", "__end__"]]:
@@ -213,7 +280,7 @@ def human_feedback_node(
     #print(f"new_plan: {Plan.model_validate(new_plan)}")
     return Command(
         update={
-            "current_plan": Plan.model_validate(new_plan),
+            "current_plan": _validate_plan(new_plan),
             "plan_iterations": plan_iterations,
             "locale": new_plan["locale"],
         },
@@ -221,18 +288,31 @@ def human_feedback_node(
     )
 
 
-def coordinator_node(
-    state: State, config: RunnableConfig
-) -> Command[Literal["planner", "background_investigator", "__end__"]]:
-    """Coordinator node that communicate with customers."""
-    logger.info("Coordinator talking.")
-    configurable = Configuration.from_runnable_config(config)
-    messages = apply_prompt_template("coordinator", state)
-    response = (
-        get_llm_by_type(AGENT_LLM_MAP["coordinator"])
-        .bind_tools([handoff_to_planner])
-        .invoke(messages)
+async def human_feedback_node_async(
+    state,
+) -> Command[Literal["planner", "research_team", "reporter", "__end__"]]:
+    """Async version of human_feedback_node; it doesn't wait on I/O itself, but
+    running it on the event loop keeps it out of the graph's thread pool."""
+    return human_feedback_node(state)
+
+
+def _coordinator_prompt(state: State):
+    """Return the coordinator messages and the model to send them to."""
+    messages = fit_messages(
+        apply_prompt_template("coordinator", state),
+        "coordinator",
+        get_llm_by_type(AGENT_LLM_MAP["coordinator"]),
     )
+    messages = static_first(messages[:1], messages[1:])
+    llm = with_llm_cache(
+        get_llm_by_type(AGENT_LLM_MAP["coordinator"]), "coordinator"
+    ).bind_tools([handoff_to_planner])
+    return messages, llm
+
+
+def _coordinator_command(
+    state: State, configurable: Configuration, response
+) -> Command[Literal["planner", "background_investigator", "__end__"]]:
     logger.debug(f"Current state messages: {state['messages']}")
 
     goto = "__end__"
@@ -264,10 +344,66 @@ def coordinator_node(
     )
 
 
-def reporter_node(state: State, config: RunnableConfig):
-    """Reporter node that write a final report."""
-    logger.info("Reporter write final report")
+def coordinator_node(
+    state: State, config: RunnableConfig
+) -> Command[Literal["planner", "background_investigator", "__end__"]]:
+    """Coordinator node that communicate with customers."""
+    logger.info("Coordinator talking.")
     configurable = Configuration.from_runnable_config(config)
+    messages, llm = _coordinator_prompt(state)
+    return _coordinator_command(state, configurable, llm.invoke(messages))
+
+
+def _speculative_background_investigation(
+    state: State, configurable: Configuration
+) -> bool:
+    if not state.get("enable_background_investigation"):
+        return False
+    enabled = configurable.speculative_background_investigation
+    if isinstance(enabled, str):
+        return enabled.lower() in ("1", "true", "yes")
+    return bool(enabled)
+
+
+async def coordinator_node_async(
+    state: State, config: RunnableConfig
+) -> Command[Literal["planner", "background_investigator", "__end__"]]:
+    """Async version of coordinator_node.
+
+    In speculative mode the background investigation only needs the user's
+    message, so its search starts together with the coordinator call. The
+    result goes straight to the planner when the coordinator hands off, and is
+    discarded when it ends the conversation.
+    """
+    logger.info("Coordinator talking.")
+    configurable = Configuration.from_runnable_config(config)
+    messages, llm = _coordinator_prompt(state)
+    search = None
+    if _speculative_background_investigation(state, configurable):
+        search = asyncio.create_task(background_investigation_node_async(state, config))
+    try:
+        response = await llm.ainvoke(messages)
+        command = _coordinator_command(state, configurable, response)
+        if search is None or command.goto != "background_investigator":
+            return command
+        try:
+            investigation = await search
+        except Exception as e:
+            logger.warning(
+                f"Speculative background investigation failed, running it again: {e}"
+            )
+            return command
+        return Command(update={**command.update, **investigation}, goto="planner")
+    finally:
+        # No-op once the search was awaited; otherwise its result is not needed
+        if search is not None:
+            search.cancel()
+
+
+def _reporter_prompt(
+    state: State, configurable: Configuration, observations: list[str]
+) -> tuple[list, bool]:
+    """Return the reporter messages and whether the plan generated code."""
     current_plan = state.get("current_plan")
 
     # Create the basic input for the reporter
@@ -282,10 +418,11 @@ def reporter_node(state: State, config: RunnableConfig):
 
     # Apply the reporter template
     invoke_messages = apply_prompt_template("reporter", input_, configurable)
-    observations = state.get("observations", [])
+    system_prompt, requirements = invoke_messages[:1], invoke_messages[1:]
+    instructions, findings = [], []
 
     # Add a reminder about the new report format, citation style, and table usage
-    invoke_messages.append(
+    instructions.append(
         HumanMessage(
             content="IMPORTANT: Structure your report according to the format in the prompt. Remember to include:\n\n1. Key Points - A bulleted list of the most important findings\n2. Overview - A brief introduction to the topic\n3. Detailed Analysis - Organized into logical sections\n4. Survey Note (optional) - For more comprehensive reports\n5. Key Citations - List all references at the end\n\nFor citations, DO NOT include inline citations in the text. Instead, place all citations in the 'Key Citations' section at the end using the format: `- [Source Title](URL)`. Include an empty line between each citation for better readability.\n\nPRIORITIZE USING MARKDOWN TABLES for data presentation and comparison. Use tables whenever presenting comparative data, statistics, features, or options. Structure tables with clear headers and aligned columns. Example table format:\n\n| Feature | Description | Pros | Cons |\n|---------|-------------|------|------|\n| Feature 1 | Description 1 | Pros 1 | Cons 1 |\n| Feature 2 | Description 2 | Pros 2 | Cons 2 |",
             name="system",
@@ -302,7 +439,7 @@ def reporter_node(state: State, config: RunnableConfig):
 
     # Add special instructions for software project reports
     if has_code_generation:
-        invoke_messages.append(
+        instructions.append(
             HumanMessage(
                 content="SPECIAL INSTRUCTIONS FOR SOFTWARE PROJECT REPORT:\n\nThis report covers a software development project with generated code. Your report MUST include these additional sections:\n\n## **Generated Project Structure**\n- Show the complete folder and file organization\n- Explain the purpose of each major directory\n- Highlight key configuration files\n\n## **Key Components Analysis**\n- **Frontend Components** (if applicable): List and describe main UI components\n- **Backend Components** (if applicable): Describe API endpoints, services, models\n- **Database Schema** (if applicable): Show table structures and relationships\n- **Configuration Files**: Explain package.json, requirements.txt, config files, etc.\n- **Core Features**: Highlight the main functionalities implemented\n\n## **Technical Implementation**\n- **Technology Stack Used**: List all frameworks, libraries, and tools\n- **Architecture Pattern**: Explain the overall design pattern (MVC, microservices, etc.)\n- **Security Measures**: Describe authentication, authorization, data protection\n- **Performance Considerations**: Caching, optimization, scalability features\n\n## **Setup and Deployment Guide**\n- **Prerequisites**: Required software, versions, system requirements\n- **Installation Steps**: Step-by-step setup instructions\n- **Environment Configuration**: Environment variables, database setup\n- **Running the Application**: How to start and access the application\n- **Testing Instructions**: How to run tests and verify functionality\n\n## **Development Roadmap**\n- **Immediate Next Steps**: Priority improvements and bug fixes\n- **Feature Enhancements**: Potential new features to add\n- **Technical Improvements**: Code refactoring, performance optimizations\n- **Maintenance Considerations**: Regular updates, security patches\n\nUse tables extensively to organize technical information, comparisons, and feature lists. Make the report actionable for developers who will work with this code.",
                 name="system",
@@ -318,7 +455,7 @@ def reporter_node(state: State, config: RunnableConfig):
         elif "python" in observation.lower() or "import " in observation:
             source_type = "data_processing"
 
-        invoke_messages.append(
+        findings.append(
             HumanMessage(
                 content=f"Below are {source_type} findings for the research task (Observation {i+1}):\n\n{observation}",
                 name="observation",
@@ -326,19 +463,28 @@ def reporter_node(state: State, config: RunnableConfig):
         )
 
     # Add final formatting instructions
-    invoke_messages.append(
+    instructions.append(
         HumanMessage(
             content="FINAL FORMATTING REQUIREMENTS:\n\n1. **Use clear section headers** with proper markdown formatting (##, ###)\n2. **Include executive summary** at the beginning for quick overview\n3. **Use tables for all comparative data** - technology comparisons, feature lists, etc.\n4. **Include code snippets** when explaining technical implementations\n5. **Provide actionable recommendations** - not just descriptions but concrete next steps\n6. **Ensure proper citation format** in the References section\n7. **Use bullet points strategically** for lists and key points\n8. **Include visual hierarchy** with proper heading levels\n\nRemember: This report should be comprehensive enough that someone can understand the entire project scope, implementation, and next steps just by reading it.",
             name="system",
         )
     )
 
-    logger.debug(f"Current invoke messages: {invoke_messages}")
+    if prefix_caching_enabled():
+        # The instructions only vary with the code generation flag, so they go
+        # right after the system prompt, ahead of the task and its findings
+        invoke_messages = static_first(
+            system_prompt + instructions, requirements + findings
+        )
+    else:
+        *leading, final_instructions = instructions
+        invoke_messages = (
+            system_prompt + requirements + leading + findings + [final_instructions]
+        )
+    return invoke_messages, has_code_generation
 
-    # Generate the report
-    response = get_llm_by_type(AGENT_LLM_MAP["reporter"]).invoke(invoke_messages)
-    response_content = response.content
 
+def _finish_report(response_content: str, has_code_generation: bool) -> dict:
     logger.info(f"Reporter response generated successfully. Length: {len(response_content)} characters")
     logger.debug(f"Reporter response preview: {response_content[:500]}...")
 
@@ -360,10 +506,97 @@ def reporter_node(state: State, config: RunnableConfig):
     return {"final_report": response_content}
 
 
+def reporter_node(state: State, config: RunnableConfig):
+    """Reporter node that write a final report."""
+    logger.info("Reporter write final report")
+    configurable = Configuration.from_runnable_config(config)
+    observations = compact_observations(
+        state.get("observations", []),
+        int(configurable.max_observation_tokens),
+        state.get("locale", "en-US"),
+    )
+    invoke_messages, has_code_generation = _reporter_prompt(
+        state, configurable, observations
+    )
+    llm = get_llm_by_type(AGENT_LLM_MAP["reporter"])
+    invoke_messages = fit_messages(invoke_messages, "reporter", llm)
+    logger.debug(f"Current invoke messages: {invoke_messages}")
+
+    # Stream the report, so that the "messages" stream mode of the graph
+    # forwards it to the client token by token while it is being written
+    response = None
+    for chunk in llm.stream(invoke_messages, config):
+        response = chunk if response is None else response + chunk
+    return _finish_report(response.content if response else "", has_code_generation)
+
+
+async def reporter_node_async(state: State, config: RunnableConfig):
+    """Async version of reporter_node."""
+    logger.info("Reporter write final report")
+    configurable = Configuration.from_runnable_config(config)
+    observations = await acompact_observations(
+        state.get("observations", []),
+        int(configurable.max_observation_tokens),
+        state.get("locale", "en-US"),
+    )
+    invoke_messages, has_code_generation = _reporter_prompt(
+        state, configurable, observations
+    )
+    llm = get_llm_by_type(AGENT_LLM_MAP["reporter"])
+    invoke_messages = fit_messages(invoke_messages, "reporter", llm)
+    logger.debug(f"Current invoke messages: {invoke_messages}")
+
+    response = None
+    async for chunk in llm.astream(invoke_messages, config):
+        response = chunk if response is None else response + chunk
+    return _finish_report(response.content if response else "", has_code_generation)
+
+
 def research_team_node(state: State):
-    """Research team node that collaborates on tasks."""
+    """Research team node that collaborates on tasks.
+
+    Folds the results of the steps executed in the last wave back into the
+    plan in step order, so observations stay deterministic no matter which
+    of the concurrently running agents finished first.
+    """
     logger.info("Research team is collaborating on tasks.")
-    pass
+    current_plan = state.get("current_plan")
+    step_results = state.get("step_results") or {}
+    if not step_results or not isinstance(current_plan, Plan):
+        return None
+
+    observations = list(state.get("observations", []))
+    for index in sorted(step_results):
+        if index >= len(current_plan.steps):
+            logger.warning(f"Dropping result of unknown step {index}")
+            continue
+        step = current_plan.steps[index]
+        if step.execution_res:
+            continue
+        step.execution_res = step_results[index]
+        observations.append(step_results[index])
+
+    return {
+        "current_plan": current_plan,
+        "observations": observations,
+        "step_results": None,
+    }
+
+
+def _get_current_step(state: State) -> tuple[int | None, Step | None]:
+    """Return the step assigned to this agent run, with its index in the plan.
+
+    Steps dispatched by the research team carry ``current_step_index``; when it
+    is missing, the first unexecuted step is used.
+    """
+    current_plan = state.get("current_plan")
+    index = state.get("current_step_index")
+    if index is not None and 0 <= index < len(current_plan.steps):
+        return index, current_plan.steps[index]
+    for index, step in enumerate(current_plan.steps):
+        if not step.execution_res:
+            return index, step
+    return None, None
 
 
 async def _execute_agent_step(
@@ -371,21 +604,17 @@ async def _execute_agent_step(
 ) -> Command[Literal["research_team"]]:
     """Helper function to execute a step using the specified agent."""
     current_plan = state.get("current_plan")
-    observations = state.get("observations", [])
-
-    # Find the first unexecuted step
-    current_step = None
-    completed_steps = []
-    for step in current_plan.steps:
-        if not step.execution_res:
-            current_step = step
-            break
-        else:
-            completed_steps.append(step)
 
+    step_index, current_step = _get_current_step(state)
     if not current_step:
         logger.warning("No unexecuted step found")
         return Command(goto="research_team")
+    # Only the findings of the steps this one actually depends on are relevant
+    completed_steps = [
+        current_plan.steps[i]
+        for i in current_plan.get_ancestors(step_index)
+        if current_plan.steps[i].execution_res
+    ]
 
     logger.info(f"Executing step: {current_step.title}, agent: {agent_name}")
 
@@ -397,14 +626,18 @@ async def _execute_agent_step(
             completed_steps_info += f"## Existing Finding {i + 1}: {step.title}\n\n"
             completed_steps_info += f"<finding>\n{step.execution_res}\n</finding>\n\n"
 
-    # Prepare the input for the agent with completed steps info
+    # Prepare the input for the agent with completed steps info. The findings
+    # get their own message, so they can be truncated to fit the prompt budget
+    # without cutting the task.
     agent_input = {
         "messages": [
             HumanMessage(
-                content=f"{completed_steps_info}# Current Task\n\n## Title\n\n{current_step.title}\n\n## Description\n\n{current_step.description}\n\n## Locale\n\n{state.get('locale', 'en-US')}"
+                content=f"# Current Task\n\n## Title\n\n{current_step.title}\n\n## Description\n\n{current_step.description}\n\n## Locale\n\n{state.get('locale', 'en-US')}"
             )
         ]
     }
+    if completed_steps_info:
+        agent_input["messages"].insert(0, HumanMessage(content=completed_steps_info))
 
     # Add citation reminder for researcher agent
     if agent_name == "researcher":
@@ -428,6 +661,14 @@ async def _execute_agent_step(
             )
         )
 
+    if prefix_caching_enabled():
+        # The fixed instructions go ahead of the step's task and findings,
+        # which are what differs between steps
+        agent_input["messages"] = static_first(
+            [m for m in agent_input["messages"] if m.name == "system"],
+            [m for m in agent_input["messages"] if m.name != "system"],
+        )
+
     # Invoke the agent
     default_recursion_limit = 25
     try:
@@ -452,16 +693,22 @@ async def _execute_agent_step(
         recursion_limit = default_recursion_limit
 
     logger.info(f"Agent input: {agent_input}")
-    result = await agent.ainvoke(
-        input=agent_input, config={"recursion_limit": recursion_limit}
+    # Let crawl tools pick the page excerpts most relevant to this step
+    relevance_token = crawl_relevance_query.set(
+        f"{current_step.title}\n{current_step.description}"
     )
+    try:
+        result = await agent.ainvoke(
+            input=agent_input, config={"recursion_limit": recursion_limit}
+        )
+    finally:
+        crawl_relevance_query.reset(relevance_token)
 
     # Process the result
     response_content = result["messages"][-1].content
     logger.debug(f"{agent_name.capitalize()} full response: {response_content}")
 
-    # Update the step with the execution result
-    current_step.execution_res = response_content
+    # The research team folds the result into the plan once the wave finishes
     logger.info(f"Step '{current_step.title}' execution completed by {agent_name}")
 
     return Command(
@@ -472,12 +719,36 @@ async def _execute_agent_step(
                     name=agent_name,
                 )
             ],
-            "observations": observations + [response_content],
+            "step_results": {step_index: response_content},
         },
         goto="research_team",
     )
 
 
+# Annotated copies of pooled MCP tools by (original tool id, server name). Steps
+# running on the same pooled session get the same copies, so their agent is
+# reused from the agent cache.
+MCP_TOOL_COPIES_MAX_SIZE = 256
+_mcp_tool_copies: OrderedDict[tuple[int, str], tuple[BaseTool, BaseTool]] = (
+    OrderedDict()
+)
+
+
+def _annotated_mcp_tool(tool: BaseTool, server_name: str) -> BaseTool:
+    key = (id(tool), server_name)
+    entry = _mcp_tool_copies.get(key)
+    # The original is kept with its copy, so its id can't be reused meanwhile
+    if entry is not None and entry[0] is tool:
+        return entry[1]
+    annotated = tool.model_copy(
+        update={"description": f"Powered by '{server_name}'.\n{tool.description}"}
+    )
+    _mcp_tool_copies[key] = (tool, annotated)
+    while len(_mcp_tool_copies) > MCP_TOOL_COPIES_MAX_SIZE:
+        _mcp_tool_copies.popitem(last=False)
+    return annotated
+
+
 async def _setup_and_execute_agent_step(
     state: State,
     config: RunnableConfig,
@@ -521,14 +792,16 @@ async def _setup_and_execute_agent_step(
 
     # Create and execute agent with MCP tools if available
     if mcp_servers:
-        async with MultiServerMCPClient(mcp_servers) as client:
+        # Sessions are pooled and stay connected across steps; the pooled tools
+        # are shared, so they are annotated on copies
+        thread_id = (config.get("configurable") or {}).get("thread_id")
+        async with get_mcp_session_pool().tools(mcp_servers, thread_id) as mcp_tools:
             loaded_tools = default_tools[:]
-            for tool in client.get_tools():
+            for tool in mcp_tools:
                 if tool.name in enabled_tools:
-                    tool.description = (
-                        f"Powered by '{enabled_tools[tool.name]}'.\n{tool.description}"
+                    loaded_tools.append(
+                        _annotated_mcp_tool(tool, enabled_tools[tool.name])
                     )
-                    loaded_tools.append(tool)
             agent = create_agent(agent_type, agent_type, loaded_tools, agent_type)
             return await _execute_agent_step(state, agent, agent_type)
     else:
@@ -543,7 +816,11 @@ async def researcher_node(
     """Researcher node that do research"""
     logger.info("Researcher node is researching.")
     configurable = Configuration.from_runnable_config(config)
-    tools = [get_web_search_tool(configurable.max_search_results), crawl_tool]
+    tools = [
+        get_web_search_tool(configurable.max_search_results),
+        crawl_tool,
+        batch_crawl_tool,
+    ]
     retriever_tool = get_retriever_tool(state.get("resources", []))
     if retriever_tool:
         tools.insert(0, retriever_tool)
@@ -563,12 +840,7 @@ async def coder_node(
     logger.info("Coder node is executing.")
 
     # Determine if this is a code generation task
-    current_plan = state.get("current_plan")
-    current_step = None
-    for step in current_plan.steps:
-        if not step.execution_res:
-            current_step = step
-            break
+    _, current_step = _get_current_step(state)
 
     # Add file generation tools for code generation tasks
     tools = [python_repl_tool]
@@ -0,0 +1,206 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Compaction of research observations before they are handed to the reporter.
+
+Observations are passed to the reporter verbatim while they fit in the token
+budget. Beyond it they are compacted map-reduce style: every observation larger
+than its share of the budget is summarized (all of them in parallel), then
+neighbouring summaries are merged and summarized again until the set fits.
+Source URLs that a summary dropped are appended to it, so citations survive.
+"""
+
+import logging
+import re
+from typing import Optional
+
+from langchain_core.messages import HumanMessage
+from langgraph.constants import TAG_NOSTREAM
+
+from src.config.agents import AGENT_LLM_MAP
+from src.llms.cache import with_llm_cache
+from src.llms.llm import get_llm_by_type
+from src.llms.token_budget import count_tokens, fit_messages
+from src.prompts.template import apply_prompt_template
+
+logger = logging.getLogger(__name__)
+
+# Smallest summary asked for, however many observations share the budget.
+MIN_SUMMARY_TOKENS = 200
+# Number of neighbouring summaries merged into one per reduce round.
+REDUCE_FAN_IN = 4
+MAX_REDUCE_ROUNDS = 3
+
+_URL_PATTERN = re.compile(r"https?://[^\s)\]>\"']+")
+
+
+def _total_tokens(observations: list[str], model: str) -> int:
+    return sum(count_tokens(observation, model) for observation in observations)
+
+
+def _preserve_citations(original: str, summary: str) -> str:
+    missing = []
+    for url in _URL_PATTERN.findall(original):
+        if url not in summary and url not in missing:
+            missing.append(url)
+    if not missing:
+        return summary
+    return summary + "\n\nSources:\n" + "\n".join(f"- {url}" for url in missing)
+
+
+def _summary_inputs(texts: list[str], max_tokens: int, locale: str, llm) -> list:
+    return [
+        fit_messages(
+            apply_prompt_template(
+                "observation_summarizer",
+                {
+                    "messages": [HumanMessage(content=text)],
+                    "max_tokens": max_tokens,
+                    "locale": locale,
+                },
+            ),
+            "observation_summarizer",
+            llm,
+        )
+        for text in texts
+    ]
+
+
+# The summaries are internal; keep them out of the client's message stream.
+_SUMMARY_CONFIG = {"tags": [TAG_NOSTREAM]}
+
+
+def _summarize(texts: list[str], max_tokens: int, locale: str) -> list[str]:
+    llm = get_llm_by_type(AGENT_LLM_MAP["observation_summarizer"])
+    responses = with_llm_cache(llm, "observation_summarizer").batch(
+        _summary_inputs(texts, max_tokens, locale, llm), _SUMMARY_CONFIG
+    )
+    return [
+        _preserve_citations(text, response.content)
+        for text, response in zip(texts, responses)
+    ]
+
+
+async def _asummarize(texts: list[str], max_tokens: int, locale: str) -> list[str]:
+    llm = get_llm_by_type(AGENT_LLM_MAP["observation_summarizer"])
+    responses = await with_llm_cache(llm, "observation_summarizer").abatch(
+        _summary_inputs(texts, max_tokens, locale, llm), _SUMMARY_CONFIG
+    )
+    return [
+        _preserve_citations(text, response.content)
+        for text, response in zip(texts, responses)
+    ]
+
+
+def _summarizer_model() -> Optional[str]:
+    return getattr(
+        get_llm_by_type(AGENT_LLM_MAP["observation_summarizer"]), "model_name", None
+    )
+
+
+def _needs_compaction(
+    observations: list[str], max_tokens: int, model: Optional[str]
+) -> bool:
+    total = _total_tokens(observations, model)
+    if not observations or total <= max_tokens:
+        return False
+    logger.info(
+        f"Compacting {len(observations)} observations of {total} tokens "
+        f"to fit a budget of {max_tokens} tokens"
+    )
+    return True
+
+
+def _oversized(
+    observations: list[str], max_tokens: int, model: Optional[str]
+) -> tuple[list[int], int]:
+    """Indexes of the observations that exceed their share of the budget."""
+    share = max(MIN_SUMMARY_TOKENS, max_tokens // len(observations))
+    indexes = [
+        index
+        for index, observation in enumerate(observations)
+        if count_tokens(observation, model) > share
+    ]
+    return indexes, share
+
+
+def _replace(
+    observations: list[str], indexes: list[int], summaries: list[str]
+) -> list[str]:
+    compacted = list(observations)
+    for index, summary in zip(indexes, summaries):
+        compacted[index] = summary
+    return compacted
+
+
+def _reduce_groups(
+    compacted: list[str], max_tokens: int, model: Optional[str]
+) -> list[str]:
+    """Groups of neighbouring observations to merge, or none once they fit."""
+    if _total_tokens(compacted, model) <= max_tokens or len(compacted) == 1:
+        return []
+    return [
+        "\n\n---\n\n".join(compacted[start : start + REDUCE_FAN_IN])
+        for start in range(0, len(compacted), REDUCE_FAN_IN)
+    ]
+
+
+def _log_compacted(compacted: list[str], model: Optional[str]) -> None:
+    logger.info(
+        f"Compacted observations to {len(compacted)} entries of "
+        f"{_total_tokens(compacted, model)} tokens"
+    )
+
+
+def compact_observations(
+    observations: list[str], max_tokens: int, locale: str = "en-US"
+) -> list[str]:
+    """
+    Fit ``observations`` into about ``max_tokens`` tokens.
+
+    Returns the observations unchanged when they already fit, otherwise a
+    shorter list of summaries in the original order.
+    """
+    model = _summarizer_model()
+    if not _needs_compaction(observations, max_tokens, model):
+        return observations
+
+    # Map: summarize the observations that exceed their share of the budget.
+    oversized, share = _oversized(observations, max_tokens, model)
+    summaries = _summarize([observations[i] for i in oversized], share, locale)
+    compacted = _replace(observations, oversized, summaries)
+
+    # Reduce: merge neighbouring observations until the set fits.
+    for _ in range(MAX_REDUCE_ROUNDS):
+        groups = _reduce_groups(compacted, max_tokens, model)
+        if not groups:
+            break
+        share = max(MIN_SUMMARY_TOKENS, max_tokens // len(groups))
+        compacted = _summarize(groups, share, locale)
+
+    _log_compacted(compacted, model)
+    return compacted
+
+
+async def acompact_observations(
+    observations: list[str], max_tokens: int, locale: str = "en-US"
+) -> list[str]:
+    """Async version of :func:`compact_observations`."""
+    model = _summarizer_model()
+    if not _needs_compaction(observations, max_tokens, model):
+        return observations
+
+    oversized, share = _oversized(observations, max_tokens, model)
+    summaries = await _asummarize([observations[i] for i in oversized], share, locale)
+    compacted = _replace(observations, oversized, summaries)
+
+    for _ in range(MAX_REDUCE_ROUNDS):
+        groups = _reduce_groups(compacted, max_tokens, model)
+        if not groups:
+            break
+        share = max(MIN_SUMMARY_TOKENS, max_tokens // len(groups))
+        compacted = await _asummarize(groups, share, locale)
+
+    _log_compacted(compacted, model)
+    return compacted
@@ -1,12 +1,28 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+from typing import Annotated
+
 from langgraph.graph import MessagesState
 
 from src.prompts.planner_model import Plan
 from src.rag import Resource
 
 
+def merge_step_results(
+    left: dict[int, str] | None, right: dict[int, str] | None
+) -> dict[int, str]:
+    """Merge step results written by concurrently running agents.
+
+    Results are keyed by the index of the step in the current plan, so the
+    order in which parallel branches finish does not matter. Writing ``None``
+    clears the pending results once they have been folded into the plan.
+    """
+    if right is None:
+        return {}
+    return {**(left or {}), **right}
+
+
 class State(MessagesState):
     """State for the agent system, extends MessagesState with next field."""
 
@@ -20,3 +36,5 @@ class State(MessagesState):
     auto_accepted_plan: bool = False
     enable_background_investigation: bool = True
     background_investigation_results: str = None
+    # Results of steps executed in the current research wave, keyed by step index
+    step_results: Annotated[dict[int, str], merge_step_results] = {}
@@ -0,0 +1,123 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Opt-in cache of LLM responses.
+
+Responses are keyed on a stable hash of the normalized messages and the model
+configuration LangChain passes as ``llm_string`` (model name, temperature,
+bound tools / structured-output schema). Entries are kept in an in-memory LRU
+backed by SQLite, and expire after a TTL.
+
+Caching is disabled unless ``LLM_CACHE_ENABLED`` is true, and then only
+applies to agents flagged in ``AGENT_LLM_CACHE``.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Optional, TypeVar
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumps, loads
+
+from src.config.agents import AGENT_LLM_CACHE
+from src.utils.cache import SQLiteCacheStore, TTLCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseChatModel)
+
+# Message fields that differ between otherwise identical conversations.
+_VOLATILE_MESSAGE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        normalized = {k: _normalize(v) for k, v in value.items()}
+        if normalized.get("type") == "constructor" and isinstance(
+            normalized.get("kwargs"), dict
+        ):
+            for field in _VOLATILE_MESSAGE_FIELDS:
+                normalized["kwargs"].pop(field, None)
+        return normalized
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Drop message ids and provider metadata from a serialized prompt."""
+    try:
+        return json.dumps(_normalize(json.loads(prompt)), sort_keys=True)
+    except ValueError:
+        return prompt
+
+
+class LLMResponseCache(BaseCache):
+    """LangChain cache that stores chat generations in a shared TTLCache."""
+
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+
+    @classmethod
+    def from_env(cls) -> "LLMResponseCache":
+        ttl = os.getenv("LLM_CACHE_TTL_SECONDS")
+        size = os.getenv("LLM_CACHE_MAX_ENTRIES")
+        path = os.getenv("LLM_CACHE_SQLITE_PATH", "data/llm_cache.sqlite")
+        return cls(
+            TTLCache(
+                ttl_seconds=float(ttl) if ttl else 24 * 3600,
+                max_entries=int(size) if size else 512,
+                disk_store=SQLiteCacheStore(path) if path else None,
+                name="llm_cache",
+            )
+        )
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        payload = f"{normalize_prompt(prompt)}\n{llm_string}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self.cache.get(self._key(prompt, llm_string))
+        if value is None:
+            return None
+        logger.debug(f"LLM cache hit, hit rate {self.cache.stats.hit_rate:.2%}")
+        return loads(value)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.cache.set(self._key(prompt, llm_string), dumps(return_val))
+
+    def clear(self, **kwargs: Any) -> None:
+        self.cache.clear()
+
+
+def llm_cache_enabled() -> bool:
+    return os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+@functools.cache
+def get_llm_response_cache() -> LLMResponseCache:
+    """Return the response cache shared by every cached LLM."""
+    return LLMResponseCache.from_env()
+
+
+_cached_llms: dict[int, BaseChatModel] = {}
+
+
+def with_llm_cache(llm: T, agent: str) -> T:
+    """
+    Return a copy of ``llm`` that uses the response cache, if caching is
+    enabled for ``agent``; otherwise return ``llm`` unchanged.
+    """
+    if not llm_cache_enabled() or not AGENT_LLM_CACHE.get(agent, False):
+        return llm
+    cached_llm = _cached_llms.get(id(llm))
+    if cached_llm is None:
+        cached_llm = llm.model_copy(update={"cache": get_llm_response_cache()})
+        _cached_llms[id(llm)] = cached_llm
+    return cached_llm
@@ -10,9 +10,14 @@ from langchain_openai import ChatOpenAI
 from src.config import load_yaml_config
 from src.config.agents import LLMType
 from src.llms.llm_with_retry import ChatOpenAIWithRetry
+from src.llms.rate_limiter import get_rate_limiter
+from src.llms.retry import get_circuit_breaker
+from src.llms.router import RoutedChatModel
+from src.prompts.layout import prefix_caching_enabled
+
 # Cache for LLM instances
-#_llm_cache: dict[LLMType, ChatOpenAI] = {}
-_llm_cache: dict[LLMType, ChatOpenAIWithRetry] = {}
+# _llm_cache: dict[LLMType, ChatOpenAI] = {}
+_llm_cache: dict[LLMType, ChatOpenAI] = {}
 
 
 def _get_env_llm_conf(llm_type: str) -> Dict[str, Any]:
@@ -30,7 +35,50 @@ def _get_env_llm_conf(llm_type: str) -> Dict[str, Any]:
     return conf
 
 
-def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> ChatOpenAIWithRetry:
+def _model_key(merged_conf: Dict[str, Any]) -> str:
+    model = str(merged_conf.get("model") or merged_conf.get("model_name") or "")
+    return f"{merged_conf.get('base_url', '')}/{model}"
+
+
+_RATE_LIMIT_KEYS = ("requests_per_minute", "tokens_per_minute", "max_concurrency")
+
+
+def _get_rate_limiter(merged_conf: Dict[str, Any]):
+    """Pop the rate limit settings from a model conf and build its limiter."""
+    limits = {key: merged_conf.pop(key, None) for key in _RATE_LIMIT_KEYS}
+    return get_rate_limiter(
+        _model_key(merged_conf),
+        requests_per_minute=float(limits["requests_per_minute"] or 0),
+        tokens_per_minute=float(limits["tokens_per_minute"] or 0),
+        max_concurrency=int(limits["max_concurrency"] or 0),
+    )
+
+
+def _create_endpoint(endpoint_conf: Dict[str, Any]) -> ChatOpenAIWithRetry:
+    merged_conf = dict(endpoint_conf)
+    # Add retry configuration
+    merged_conf["max_retries"] = int(os.getenv("API_MAX_RETRIES", "3"))
+    merged_conf["base_delay"] = float(os.getenv("API_BASE_DELAY", "1.0"))
+    merged_conf["retry_deadline"] = float(
+        os.getenv("API_RETRY_DEADLINE_SECONDS", "120")
+    )
+    merged_conf["circuit_breaker"] = get_circuit_breaker(
+        _model_key(merged_conf),
+        failure_threshold=int(os.getenv("API_CIRCUIT_BREAKER_THRESHOLD", "5")),
+        reset_timeout=float(os.getenv("API_CIRCUIT_BREAKER_RESET_SECONDS", "30")),
+    )
+
+    # Client-side rate limits, shared by every client of the same model
+    merged_conf["rate_limiter"] = _get_rate_limiter(merged_conf)
+
+    # Streams only report their usage, cached prompt tokens included, on request
+    if prefix_caching_enabled():
+        merged_conf.setdefault("stream_usage", True)
+
+    return ChatOpenAIWithRetry(**merged_conf)
+
+
+def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> ChatOpenAI:
     llm_type_map = {
         "reasoning": conf.get("REASONING_MODEL", {}),
         "basic": conf.get("BASIC_MODEL", {}),
@@ -49,16 +97,32 @@ def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> ChatOpenAIW
     if not merged_conf:
         raise ValueError(f"Unknown LLM Conf: {llm_type}")
 
-   # Add retry configuration
-    merged_conf['max_retries'] = int(os.getenv('API_MAX_RETRIES', '3'))
-    merged_conf['base_delay'] = float(os.getenv('API_BASE_DELAY', '1.0'))
-
-    return ChatOpenAIWithRetry(**merged_conf)
+    endpoints = merged_conf.pop("endpoints", None)
+    strategy = merged_conf.pop("routing", "failover")
+    hedge = str(merged_conf.pop("hedge", False)).lower() in ("1", "true", "yes")
+    hedge_delay = float(merged_conf.pop("hedge_delay", 5.0))
+    if not endpoints:
+        return _create_endpoint(merged_conf)
+
+    # Settings outside `endpoints` are shared by every endpoint
+    endpoint_confs = [{**merged_conf, **endpoint} for endpoint in endpoints]
+    primary_conf = {
+        key: value
+        for key, value in endpoint_confs[0].items()
+        if key not in _RATE_LIMIT_KEYS
+    }
+    return RoutedChatModel(
+        endpoints=[_create_endpoint(endpoint) for endpoint in endpoint_confs],
+        strategy=strategy,
+        hedge=hedge,
+        hedge_delay=hedge_delay,
+        **primary_conf,
+    )
 
 
 def get_llm_by_type(
     llm_type: LLMType,
-) -> ChatOpenAIWithRetry:
+) -> ChatOpenAI:
     """
     Get LLM instance by type. Returns cached instance if available.
     """
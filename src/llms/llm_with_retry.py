@@ -1,95 +1,234 @@
 import time
-import random
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
 from langchain_openai import ChatOpenAI
-import openai
-from openai import RateLimitError, InternalServerError
 import asyncio
 
+from src.llms.prompt_cache import record_prompt_cache_usage
+from src.llms.rate_limiter import (
+    RateLimiter,
+    estimate_message_tokens,
+    priority_from_metadata,
+)
+from src.llms.retry import CircuitBreaker, RetryPolicy, RetryState
+
 logger = logging.getLogger(__name__)
 
+
 class ChatOpenAIWithRetry(ChatOpenAI):
-    """ChatOpenAI with built-in retry mechanism for handling API overload and rate limits"""
+    """ChatOpenAI with built-in retry mechanism for handling API overload and rate limits
+
+    The same retry policy covers invoke, ainvoke, stream and astream. Streams
+    are only retried until their first chunk has been yielded. Each attempt
+    passes through the rate limiter, if any.
+    """
 
     def __init__(self, **kwargs):
         # Extract our custom retry parameters BEFORE calling super().__init__
-        max_retries = kwargs.pop('max_retries', 3)
-        base_delay = kwargs.pop('base_delay', 1.0)
-
+        max_retries = kwargs.pop("max_retries", 3)
+        base_delay = kwargs.pop("base_delay", 1.0)
+        retry_deadline = kwargs.pop("retry_deadline", 120.0)
+        circuit_breaker = kwargs.pop("circuit_breaker", None)
+        rate_limiter = kwargs.pop("rate_limiter", None)
+
+        # Retries are handled here, so the OpenAI client must not retry on its own
+        kwargs["max_retries"] = 0
         # Call parent constructor with remaining kwargs
         super().__init__(**kwargs)
 
         # Set attributes using object.__setattr__ to bypass Pydantic validation
-        object.__setattr__(self, '_max_retries', max_retries)
-        object.__setattr__(self, '_base_delay', base_delay)
-
-    def _calculate_delay(self, attempt: int) -> float:
-        """Calculate exponential backoff delay with jitter"""
-        delay = self._base_delay * (2 ** attempt)
-        jitter = random.uniform(0.1, 0.5) * delay
-        return delay + jitter
-
-    async def _agenerate_with_retry(self, *args, **kwargs):
-        """Generate with retry logic for handling API errors"""
-        last_exception = None
-
-        for attempt in range(self._max_retries):
-            try:
-                logger.info(f"API attempt {attempt + 1}/{self._max_retries}")
-                result = await super().agenerate(*args, **kwargs)
+        object.__setattr__(
+            self,
+            "_retry_policy",
+            RetryPolicy(
+                max_attempts=max(1, max_retries),
+                base_delay=base_delay,
+                deadline=retry_deadline or None,
+            ),
+        )
+        object.__setattr__(self, "_circuit_breaker", circuit_breaker)
+        object.__setattr__(self, "_rate_limiter", rate_limiter)
+
+    def _start_retry(self) -> RetryState:
+        breaker: Optional[CircuitBreaker] = self._circuit_breaker
+        return self._retry_policy.start(breaker, name=self.model_name)
+
+    def _limiter_args(self, messages: List[BaseMessage], run_manager) -> tuple:
+        metadata = getattr(run_manager, "metadata", None)
+        return estimate_message_tokens(messages), priority_from_metadata(metadata)
+
+    @staticmethod
+    def _result_tokens(result: ChatResult) -> Optional[int]:
+        usage = (result.llm_output or {}).get("token_usage") or {}
+        return usage.get("total_tokens")
+
+    @staticmethod
+    def _chunk_tokens(chunk: ChatGenerationChunk) -> Optional[int]:
+        usage = getattr(chunk.message, "usage_metadata", None)
+        return usage.get("total_tokens") if usage else None
+
+    def _record_prompt_cache(self, message: BaseMessage) -> None:
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            record_prompt_cache_usage(self.model_name, usage)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Streaming models generate through _stream, which retries itself
+        if self.streaming:
+            return super()._generate(messages, stop, run_manager, **kwargs)
+        with self._start_retry() as retry:
+            while True:
+                retry.before_attempt()
+                try:
+                    result = self._generate_once(messages, stop, run_manager, **kwargs)
+                except Exception as e:
+                    delay = retry.failed(e)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    continue
+                retry.succeeded()
+                for generation in result.generations:
+                    self._record_prompt_cache(generation.message)
                 return result
 
-            except (RateLimitError, InternalServerError) as e:
-                last_exception = e
-                error_code = getattr(e, 'status_code', 'unknown')
-                error_str = str(e).lower()
-
-                # Check if this is an Anthropic error (since you're using Anthropic API)
-                is_anthropic_error = any(keyword in error_str for keyword in [
-                    'overloaded', 'anthropic', 'claude', '529'
-                ])
-
-                if attempt < self._max_retries - 1:
-                    delay = self._calculate_delay(attempt)
-                    api_name = "Anthropic" if is_anthropic_error else "API"
-                    logger.warning(
-                        f"{api_name} error (code: {error_code}): {str(e)}. "
-                        f"Retrying in {delay:.2f} seconds... (attempt {attempt + 1}/{self._max_retries})"
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # Streaming models generate through _astream, which retries itself
+        if self.streaming:
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+        with self._start_retry() as retry:
+            while True:
+                retry.before_attempt()
+                try:
+                    result = await self._agenerate_once(
+                        messages, stop, run_manager, **kwargs
                     )
+                except Exception as e:
+                    delay = retry.failed(e)
+                    if delay is None:
+                        raise
                     await asyncio.sleep(delay)
-                else:
-                    api_name = "Anthropic" if is_anthropic_error else "API"
-                    logger.error(
-                        f"{api_name} failed after {self._max_retries} attempts. "
-                        f"Last error: {str(e)}"
-                    )
-
-            except Exception as e:
-                error_str = str(e).lower()
-
-                # Check if it's a retryable error (network issues, timeouts, etc.)
-                is_retryable = any(keyword in error_str for keyword in [
-                    'timeout', 'connection', '500', '502', '503', '504',
-                    'overloaded', 'rate limit', 'too many requests'
-                ])
+                    continue
+                retry.succeeded()
+                for generation in result.generations:
+                    self._record_prompt_cache(generation.message)
+                return result
 
-                if is_retryable and attempt < self._max_retries - 1:
-                    delay = self._calculate_delay(attempt)
-                    logger.warning(
-                        f"Retryable error: {str(e)}. "
-                        f"Retrying in {delay:.2f} seconds... (attempt {attempt + 1}/{self._max_retries})"
-                    )
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        with self._start_retry() as retry:
+            while True:
+                retry.before_attempt()
+                started = False
+                try:
+                    for chunk in self._stream_once(
+                        messages, stop, run_manager, **kwargs
+                    ):
+                        started = True
+                        self._record_prompt_cache(chunk.message)
+                        yield chunk
+                except Exception as e:
+                    # Chunks already handed to the caller can't be taken back
+                    delay = retry.failed(e, can_retry=not started)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    continue
+                retry.succeeded()
+                return
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        with self._start_retry() as retry:
+            while True:
+                retry.before_attempt()
+                started = False
+                try:
+                    async for chunk in self._astream_once(
+                        messages, stop, run_manager, **kwargs
+                    ):
+                        started = True
+                        self._record_prompt_cache(chunk.message)
+                        yield chunk
+                except Exception as e:
+                    # Chunks already handed to the caller can't be taken back
+                    delay = retry.failed(e, can_retry=not started)
+                    if delay is None:
+                        raise
                     await asyncio.sleep(delay)
-                    last_exception = e
-                else:
-                    # For other errors, don't retry
-                    logger.error(f"Non-retryable error: {str(e)}")
-                    raise e
-
-        # If we get here, all retries failed
-        raise last_exception
-
-    async def agenerate(self, *args, **kwargs):
-        """Override agenerate to use retry logic"""
-        return await self._agenerate_with_retry(*args, **kwargs)
\ No newline at end of file
+                    continue
+                retry.succeeded()
+                return
+
+    def _generate_once(self, messages, stop, run_manager, **kwargs) -> ChatResult:
+        limiter: Optional[RateLimiter] = self._rate_limiter
+        if limiter is None:
+            return super()._generate(messages, stop, run_manager, **kwargs)
+        with limiter.limit(*self._limiter_args(messages, run_manager)) as lease:
+            result = super()._generate(messages, stop, run_manager, **kwargs)
+            lease.record_usage(self._result_tokens(result))
+            return result
+
+    async def _agenerate_once(
+        self, messages, stop, run_manager, **kwargs
+    ) -> ChatResult:
+        limiter: Optional[RateLimiter] = self._rate_limiter
+        if limiter is None:
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+        async with limiter.alimit(*self._limiter_args(messages, run_manager)) as lease:
+            result = await super()._agenerate(messages, stop, run_manager, **kwargs)
+            lease.record_usage(self._result_tokens(result))
+            return result
+
+    def _stream_once(
+        self, messages, stop, run_manager, **kwargs
+    ) -> Iterator[ChatGenerationChunk]:
+        limiter: Optional[RateLimiter] = self._rate_limiter
+        if limiter is None:
+            yield from super()._stream(messages, stop, run_manager, **kwargs)
+            return
+        with limiter.limit(*self._limiter_args(messages, run_manager)) as lease:
+            for chunk in super()._stream(messages, stop, run_manager, **kwargs):
+                lease.record_usage(self._chunk_tokens(chunk))
+                yield chunk
+
+    async def _astream_once(
+        self, messages, stop, run_manager, **kwargs
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        limiter: Optional[RateLimiter] = self._rate_limiter
+        if limiter is None:
+            async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+                yield chunk
+            return
+        async with limiter.alimit(*self._limiter_args(messages, run_manager)) as lease:
+            async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+                lease.record_usage(self._chunk_tokens(chunk))
+                yield chunk
@@ -0,0 +1,73 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Provider prefix-cache statistics.
+
+OpenAI-compatible APIs report the prompt tokens served from their prefix cache
+as ``usage.prompt_tokens_details.cached_tokens`` (``cache_read`` in LangChain's
+usage metadata). They are counted per model for every response that reached
+the API, so responses served by the local LLM cache are not included.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrefixCacheStats:
+    requests: int = 0
+    # Requests with at least one prompt token served from the cache
+    hits: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    @property
+    def cached_token_rate(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+_stats: dict[str, PrefixCacheStats] = {}
+_stats_lock = threading.Lock()
+
+
+def record_prompt_cache_usage(
+    model: Optional[str], usage_metadata: Optional[dict[str, Any]]
+) -> None:
+    """Count the prompt and cached tokens of one API response."""
+    if not usage_metadata:
+        return
+    prompt_tokens = usage_metadata.get("input_tokens") or 0
+    details = usage_metadata.get("input_token_details") or {}
+    cached_tokens = details.get("cache_read") or 0
+    with _stats_lock:
+        stats = _stats.setdefault(model or "unknown", PrefixCacheStats())
+        stats.requests += 1
+        stats.hits += int(cached_tokens > 0)
+        stats.prompt_tokens += prompt_tokens
+        stats.cached_tokens += cached_tokens
+    logger.debug(
+        f"{model}: {cached_tokens} of {prompt_tokens} prompt tokens "
+        f"served from the provider's prefix cache"
+    )
+
+
+def prefix_cache_stats() -> dict[str, dict[str, Any]]:
+    """Prefix-cache usage observed per model since start-up."""
+    with _stats_lock:
+        return {
+            model: {
+                **vars(stats),
+                "hit_rate": stats.hit_rate,
+                "cached_token_rate": stats.cached_token_rate,
+            }
+            for model, stats in _stats.items()
+        }
@@ -0,0 +1,247 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Client-side rate limiting for LLM calls.
+
+Each model gets one limiter shared by every client instance in the process. It
+combines a requests-per-minute and a tokens-per-minute token bucket with a cap
+on concurrent calls. Callers queue by priority, so interactive nodes such as the
+coordinator are admitted before background work like the reporter when the
+limits are saturated.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator, Mapping, Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+# Lower values are admitted first. Keys are graph node names.
+NODE_PRIORITIES: dict[str, int] = {
+    "coordinator": 0,
+    "prompt_enhancer": 0,
+    "planner": 1,
+    "human_feedback": 1,
+    "researcher": 2,
+    "coder": 2,
+    "reporter": 3,
+    "background_investigator": 3,
+}
+DEFAULT_PRIORITY = 2
+
+_POLL_INTERVAL = 0.02
+
+
+def priority_from_metadata(metadata: Optional[Mapping[str, Any]]) -> int:
+    """Derive a call's priority from the LangGraph node that issued it."""
+    if not metadata:
+        return DEFAULT_PRIORITY
+    node = metadata.get("langgraph_node")
+    if node in NODE_PRIORITIES:
+        return NODE_PRIORITIES[node]
+    # Calls made inside an agent subgraph run in node "agent"; fall back to the
+    # outermost node of the checkpoint namespace (e.g. "researcher:<id>|...").
+    namespace = metadata.get("langgraph_checkpoint_ns") or ""
+    outer_node = namespace.split("|")[0].split(":")[0]
+    return NODE_PRIORITIES.get(outer_node, DEFAULT_PRIORITY)
+
+
+def estimate_message_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Cheap upper-bound style estimate of the prompt size of a request."""
+    return sum(len(str(message.content)) for message in messages) // 4 + 1
+
+
+class TokenBucket:
+    """Continuously refilling bucket allowing ``rate_per_minute`` units."""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.available = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.available = min(
+            self.capacity, self.available + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # Requests larger than the whole bucket wait for a full bucket.
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount: float) -> None:
+        # May go negative when actual usage exceeds the estimate; the debt is
+        # paid back by later callers waiting longer.
+        self.available -= amount
+
+
+@dataclass
+class Lease:
+    limiter: "RateLimiter"
+    estimated_tokens: int
+
+    def record_usage(self, total_tokens: Optional[int]) -> None:
+        """Correct the tokens bucket with the usage reported by the provider."""
+        if total_tokens is not None:
+            self.limiter._adjust_tokens(total_tokens - self.estimated_tokens)
+            self.estimated_tokens = total_tokens
+
+
+class RateLimiter:
+    """
+    Requests/min, tokens/min and concurrency limits for one model.
+
+    Works across threads and event loops: admission state is guarded by a
+    thread lock and waiters poll, so the same limiter can serve sync and async
+    callers at once.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        name: str = "llm",
+    ):
+        self.name = name
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._waiters: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+
+    def _enqueue(self, priority: int) -> tuple[int, int]:
+        ticket = (priority, next(self._sequence))
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _dequeue(self, ticket: tuple[int, int]) -> None:
+        with self._lock:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+
+    def _try_admit(self, ticket: tuple[int, int], tokens: int) -> float:
+        """Admit ``ticket`` if it's first in line and capacity allows.
+
+        Returns 0 when admitted, otherwise how long to wait before retrying.
+        """
+        with self._lock:
+            if self._waiters[0] != ticket:
+                return _POLL_INTERVAL
+            if self.max_concurrency and self.in_flight >= self.max_concurrency:
+                return _POLL_INTERVAL
+            now = time.monotonic()
+            wait = 0.0
+            if self.requests:
+                wait = max(wait, self.requests.time_until(1, now))
+            if self.tokens:
+                wait = max(wait, self.tokens.time_until(tokens, now))
+            if wait > 0:
+                return wait
+            if self.requests:
+                self.requests.consume(1)
+            if self.tokens:
+                self.tokens.consume(tokens)
+            self.in_flight += 1
+            heapq.heappop(self._waiters)
+            return 0.0
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _adjust_tokens(self, delta: int) -> None:
+        if self.tokens and delta:
+            with self._lock:
+                self.tokens.consume(delta)
+
+    @contextmanager
+    def limit(self, tokens: int, priority: int = DEFAULT_PRIORITY) -> Iterator[Lease]:
+        """Block until the call may proceed, holding a slot while inside."""
+        ticket = self._enqueue(priority)
+        started = time.monotonic()
+        try:
+            while (wait := self._try_admit(ticket, tokens)) > 0:
+                time.sleep(min(wait, 1.0))
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        self._log_wait(started, priority)
+        try:
+            yield Lease(self, tokens)
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def alimit(self, tokens: int, priority: int = DEFAULT_PRIORITY):
+        """Async counterpart of :meth:`limit`; waits without blocking the loop."""
+        ticket = self._enqueue(priority)
+        started = time.monotonic()
+        try:
+            while (wait := self._try_admit(ticket, tokens)) > 0:
+                await asyncio.sleep(min(wait, 1.0))
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        self._log_wait(started, priority)
+        try:
+            yield Lease(self, tokens)
+        finally:
+            self._release()
+
+    def _log_wait(self, started: float, priority: int) -> None:
+        waited = time.monotonic() - started
+        if waited > 0.5:
+            logger.info(
+                f"Rate limiter '{self.name}' delayed a priority {priority} call "
+                f"by {waited:.2f}s"
+            )
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    model: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    max_concurrency: Optional[int] = None,
+) -> Optional[RateLimiter]:
+    """
+    Return the limiter shared by all clients of ``model``, or None when no
+    limit is configured. The first configuration seen for a model wins.
+    """
+    if not (requests_per_minute or tokens_per_minute or max_concurrency):
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limiter = RateLimiter(
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+                max_concurrency=max_concurrency,
+                name=model,
+            )
+            _limiters[model] = limiter
+        return limiter
@@ -0,0 +1,273 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Retry policy for LLM calls.
+
+Errors are classified by type and HTTP status rather than by message text.
+Backoff is exponential with jitter, but a provider's ``Retry-After`` hint takes
+precedence. Each request has a deadline budget across all of its attempts, and a
+per-model circuit breaker fails calls fast while the provider is down instead
+of letting every caller wait out its own retries.
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+import openai
+
+logger = logging.getLogger(__name__)
+
+# 529 is the "overloaded" status used by Anthropic-compatible endpoints.
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a model whose circuit breaker is open."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether ``error`` is a transient provider or network failure."""
+    if isinstance(error, openai.APIConnectionError):
+        # Includes APITimeoutError.
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(
+        error,
+        (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError),
+    )
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait, from the error's response headers."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker shared by every client of a model.
+
+    After ``failure_threshold`` transient failures in a row the circuit opens
+    and calls fail immediately. Once ``reset_timeout`` has passed a single
+    probe call is let through; its outcome closes or re-opens the circuit. A
+    probe that ends without an outcome (cancelled, or failed for reasons that
+    say nothing about the provider) is released for the next call to retry.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 5, reset_timeout: float = 30.0, name: str = ""
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError or return whether the call is the probe."""
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            if (
+                not self._probing
+                and time.monotonic() - self.opened_at >= self.reset_timeout
+            ):
+                self._probing = True
+                return True
+        raise CircuitOpenError(
+            f"Circuit breaker for '{self.name}' is open after "
+            f"{self.failures} consecutive failures"
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit breaker for '{self.name}' closed")
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or (
+                self.opened_at is None and self.failures >= self.failure_threshold
+            ):
+                if not self._probing:
+                    logger.warning(
+                        f"Circuit breaker for '{self.name}' opened after "
+                        f"{self.failures} consecutive failures"
+                    )
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+    def release_probe(self) -> None:
+        """Let the next call probe, the current one ended without an outcome."""
+        with self._lock:
+            self._probing = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    model: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+) -> Optional[CircuitBreaker]:
+    """
+    Return the breaker shared by all clients of ``model``, or None when
+    ``failure_threshold`` is 0. The first configuration seen for a model wins.
+    """
+    if failure_threshold <= 0:
+        return None
+    with _breakers_lock:
+        breaker = _breakers.get(model)
+        if breaker is None:
+            breaker = CircuitBreaker(failure_threshold, reset_timeout, name=model)
+            _breakers[model] = breaker
+        return breaker
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Attributes:
+        max_attempts: Total attempts per request, including the first one.
+        base_delay: Backoff before the second attempt; doubles every attempt.
+        max_delay: Upper bound of a single computed backoff.
+        deadline: Seconds a request may spend across all attempts and waits.
+            A retry whose wait would overrun it is not attempted.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    deadline: Optional[float] = 120.0
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter after the ``attempt``-th failure."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay + random.uniform(0.1, 0.5) * delay
+
+    def start(
+        self, breaker: Optional[CircuitBreaker] = None, name: str = "API"
+    ) -> "RetryState":
+        return RetryState(self, breaker, name)
+
+
+class RetryState:
+    """
+    Bookkeeping for the attempts of a single request.
+
+    Use it as a context manager, so that a circuit breaker probe is released
+    however the request ends, including by cancellation.
+    """
+
+    def __init__(
+        self, policy: RetryPolicy, breaker: Optional[CircuitBreaker], name: str
+    ):
+        self.policy = policy
+        self.breaker = breaker
+        self.name = name
+        self.attempt = 0
+        self.started_at = time.monotonic()
+        self._probe = False
+
+    def __enter__(self) -> "RetryState":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def before_attempt(self) -> None:
+        """Count an attempt; raises CircuitOpenError if the model is shedding."""
+        if self.breaker:
+            self._probe = self.breaker.before_call()
+        self.attempt += 1
+
+    def succeeded(self) -> None:
+        if self.breaker:
+            self.breaker.record_success()
+        self._probe = False
+
+    def release(self) -> None:
+        """Release the breaker probe held by an attempt that has no outcome."""
+        if self._probe:
+            self._probe = False
+            self.breaker.release_probe()
+
+    def failed(self, error: BaseException, can_retry: bool = True) -> Optional[float]:
+        """
+        Record a failed attempt and return how long to wait before the next
+        one, or None if the error should be raised.
+        """
+        retryable = is_retryable(error)
+        if self.breaker:
+            if retryable:
+                self.breaker.record_failure()
+                self._probe = False
+            elif isinstance(error, openai.APIStatusError):
+                # A client error still means the provider is answering.
+                self.breaker.record_success()
+                self._probe = False
+            else:
+                self.release()
+        if not retryable:
+            logger.error(f"Non-retryable {self.name} error: {error}")
+            return None
+        if not can_retry or self.attempt >= self.policy.max_attempts:
+            logger.error(
+                f"{self.name} failed after {self.attempt} attempts. "
+                f"Last error: {error}"
+            )
+            return None
+        hint = retry_after(error)
+        delay = hint if hint is not None else self.policy.backoff(self.attempt)
+        if self.policy.deadline is not None:
+            elapsed = time.monotonic() - self.started_at
+            if elapsed + delay > self.policy.deadline:
+                logger.error(
+                    f"{self.name} error: {error}. Not retrying, a {delay:.2f}s wait "
+                    f"would exceed the {self.policy.deadline:.0f}s deadline"
+                )
+                return None
+        logger.warning(
+            f"{self.name} error (code: {getattr(error, 'status_code', 'unknown')}): "
+            f"{error}. Retrying in {delay:.2f} seconds... "
+            f"(attempt {self.attempt}/{self.policy.max_attempts})"
+        )
+        return delay
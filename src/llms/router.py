@@ -0,0 +1,383 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Routing of an LLM type across several OpenAI-compatible endpoints.
+
+``RoutedChatModel`` looks like a single ``ChatOpenAI`` (so ``bind_tools`` and
+``with_structured_output`` behave as usual), but every call is sent to one of
+its endpoints:
+
+- ``failover``: endpoints are tried in configured order; a transient error or an
+  open circuit breaker moves the call to the next one.
+- ``latency``: like failover, but endpoints are ordered by the exponentially
+  weighted moving average of their observed latency (time to first chunk for
+  streams). An endpoint that failed recently goes behind the others until
+  ``FAILURE_COOLDOWN_SECONDS`` have passed.
+
+With ``hedge`` enabled, a non-streaming call that hasn't returned after the
+primary endpoint's p95 latency is also sent to the next endpoint, and the first
+response wins. Streams fail over only until their first chunk, like retries.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+
+from src.llms.llm_with_retry import ChatOpenAIWithRetry
+from src.llms.retry import CircuitOpenError, is_retryable
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ROUTING_STRATEGIES = ("failover", "latency")
+# Observed latencies needed before the p95 replaces the configured hedge delay.
+MIN_HEDGE_SAMPLES = 20
+# How long a failed endpoint is routed to only after the others.
+FAILURE_COOLDOWN_SECONDS = 30.0
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor_lock = threading.Lock()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(thread_name_prefix="llm-hedge")
+        return _hedge_executor
+
+
+def _can_fail_over(error: BaseException) -> bool:
+    return isinstance(error, CircuitOpenError) or is_retryable(error)
+
+
+class EndpointStats:
+    """Latency statistics of one endpoint."""
+
+    def __init__(self, alpha: float = 0.2, window: int = 100):
+        self.alpha = alpha
+        self.ewma: Optional[float] = None
+        self.samples: deque[float] = deque(maxlen=window)
+        self.failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self.samples.append(latency)
+            self.ewma = (
+                latency
+                if self.ewma is None
+                else self.alpha * latency + (1 - self.alpha) * self.ewma
+            )
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failed_at = time.monotonic()
+
+    def routing_key(self) -> tuple[bool, float]:
+        """Sort key under latency routing: recently failed last, then by EWMA."""
+        with self._lock:
+            failed = (
+                self.failed_at is not None
+                and time.monotonic() - self.failed_at < FAILURE_COOLDOWN_SECONDS
+            )
+            return failed, self.ewma or 0.0
+
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            if len(self.samples) < MIN_HEDGE_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class RoutedChatModel(ChatOpenAI):
+    """ChatOpenAI facade that spreads calls over several endpoints."""
+
+    def __init__(
+        self,
+        endpoints: Sequence[ChatOpenAIWithRetry],
+        strategy: str = "failover",
+        hedge: bool = False,
+        hedge_delay: float = 5.0,
+        **kwargs,
+    ):
+        """
+        Args:
+            endpoints: Clients of the endpoints, primary first.
+            strategy: One of ``ROUTING_STRATEGIES``.
+            hedge: Send slow non-streaming calls to a second endpoint as well.
+            hedge_delay: Seconds to wait before hedging until the primary has
+                enough observed latencies for a p95.
+            **kwargs: ChatOpenAI settings of the primary endpoint, used to
+                format tools and structured output.
+        """
+        if not endpoints:
+            raise ValueError("RoutedChatModel needs at least one endpoint")
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(f"Unknown routing strategy: {strategy}")
+        super().__init__(**kwargs)
+        object.__setattr__(self, "_endpoints", list(endpoints))
+        object.__setattr__(
+            self, "_endpoint_stats", [EndpointStats() for _ in endpoints]
+        )
+        object.__setattr__(self, "_strategy", strategy)
+        object.__setattr__(self, "_hedge", hedge)
+        object.__setattr__(self, "_hedge_delay", hedge_delay)
+
+    def _ordered_endpoints(self) -> list[int]:
+        indexes = list(range(len(self._endpoints)))
+        if self._strategy == "latency":
+            # Endpoints without samples go first so that they get measured,
+            # unless they have just failed.
+            indexes.sort(key=lambda i: self._endpoint_stats[i].routing_key())
+        return indexes
+
+    def _hedge_after(self, index: int) -> float:
+        p95 = self._endpoint_stats[index].p95()
+        return p95 if p95 is not None else self._hedge_delay
+
+    def _timed(self, index: int, call: Callable[[ChatOpenAIWithRetry], T]) -> T:
+        started = time.monotonic()
+        try:
+            result = call(self._endpoints[index])
+        except Exception as e:
+            self._record_failure(index, e)
+            raise
+        self._endpoint_stats[index].record(time.monotonic() - started)
+        return result
+
+    async def _atimed(
+        self, index: int, call: Callable[[ChatOpenAIWithRetry], Awaitable[T]]
+    ) -> T:
+        started = time.monotonic()
+        try:
+            result = await call(self._endpoints[index])
+        except Exception as e:
+            self._record_failure(index, e)
+            raise
+        self._endpoint_stats[index].record(time.monotonic() - started)
+        return result
+
+    def _record_failure(self, index: int, error: BaseException) -> None:
+        # Only failures that say the endpoint is unavailable count against it
+        if _can_fail_over(error):
+            self._endpoint_stats[index].record_failure()
+
+    def _log_failover(self, index: int, error: BaseException) -> None:
+        logger.warning(
+            f"LLM endpoint {self._endpoints[index].model_name} "
+            f"({self._endpoints[index].openai_api_base}) failed: {error}. "
+            f"Failing over to the next endpoint"
+        )
+
+    def _route(self, call: Callable[[ChatOpenAIWithRetry], T]) -> T:
+        order = self._ordered_endpoints()
+        if self._hedge and len(order) > 1:
+            return self._route_hedged(order, call)
+        for position, index in enumerate(order):
+            try:
+                return self._timed(index, call)
+            except Exception as e:
+                if position == len(order) - 1 or not _can_fail_over(e):
+                    raise
+                self._log_failover(index, e)
+        raise AssertionError("unreachable")
+
+    def _route_hedged(
+        self, order: list[int], call: Callable[[ChatOpenAIWithRetry], T]
+    ) -> T:
+        executor = _get_hedge_executor()
+        remaining = list(order)
+        pending: dict[Future, int] = {}
+
+        def launch() -> None:
+            index = remaining.pop(0)
+            context = contextvars.copy_context()
+            pending[executor.submit(context.run, self._timed, index, call)] = index
+
+        launch()
+        hedge_at: Optional[float] = time.monotonic() + self._hedge_after(order[0])
+        while True:
+            timeout = None
+            if hedge_at is not None and remaining:
+                timeout = max(0.0, hedge_at - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.info("LLM call is slow, sending a hedged request")
+                hedge_at = None
+                launch()
+                continue
+            for future in done:
+                index = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    # The slower request finishes in the background; its
+                    # result is dropped.
+                    return future.result()
+                if not _can_fail_over(error) or (not remaining and not pending):
+                    raise error
+                if remaining:
+                    self._log_failover(index, error)
+                    launch()
+
+    async def _aroute(self, call: Callable[[ChatOpenAIWithRetry], Awaitable[T]]) -> T:
+        order = self._ordered_endpoints()
+        if self._hedge and len(order) > 1:
+            return await self._aroute_hedged(order, call)
+        for position, index in enumerate(order):
+            try:
+                return await self._atimed(index, call)
+            except Exception as e:
+                if position == len(order) - 1 or not _can_fail_over(e):
+                    raise
+                self._log_failover(index, e)
+        raise AssertionError("unreachable")
+
+    async def _aroute_hedged(
+        self, order: list[int], call: Callable[[ChatOpenAIWithRetry], Awaitable[T]]
+    ) -> T:
+        remaining = list(order)
+        pending: dict[asyncio.Task, int] = {}
+
+        def launch() -> None:
+            index = remaining.pop(0)
+            pending[asyncio.create_task(self._atimed(index, call))] = index
+
+        launch()
+        hedge_at: Optional[float] = time.monotonic() + self._hedge_after(order[0])
+        try:
+            while True:
+                timeout = None
+                if hedge_at is not None and remaining:
+                    timeout = max(0.0, hedge_at - time.monotonic())
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.info("LLM call is slow, sending a hedged request")
+                    hedge_at = None
+                    launch()
+                    continue
+                for task in done:
+                    index = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    if not _can_fail_over(error) or (not remaining and not pending):
+                        raise error
+                    if remaining:
+                        self._log_failover(index, error)
+                        launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self._route(
+            lambda endpoint: endpoint._generate(messages, stop, run_manager, **kwargs)
+        )
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await self._aroute(
+            lambda endpoint: endpoint._agenerate(messages, stop, run_manager, **kwargs)
+        )
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        order = self._ordered_endpoints()
+        for position, index in enumerate(order):
+            endpoint = self._endpoints[index]
+            started_at = time.monotonic()
+            started = False
+            try:
+                for chunk in endpoint._stream(messages, stop, run_manager, **kwargs):
+                    if not started:
+                        started = True
+                        self._endpoint_stats[index].record(
+                            time.monotonic() - started_at
+                        )
+                    yield chunk
+            except Exception as e:
+                if not started:
+                    self._record_failure(index, e)
+                last = position == len(order) - 1
+                if started or last or not _can_fail_over(e):
+                    raise
+                self._log_failover(index, e)
+                continue
+            return
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        order = self._ordered_endpoints()
+        for position, index in enumerate(order):
+            endpoint = self._endpoints[index]
+            started_at = time.monotonic()
+            started = False
+            try:
+                async for chunk in endpoint._astream(
+                    messages, stop, run_manager, **kwargs
+                ):
+                    if not started:
+                        started = True
+                        self._endpoint_stats[index].record(
+                            time.monotonic() - started_at
+                        )
+                    yield chunk
+            except Exception as e:
+                if not started:
+                    self._record_failure(index, e)
+                last = position == len(order) - 1
+                if started or last or not _can_fail_over(e):
+                    raise
+                self._log_failover(index, e)
+                continue
+            return
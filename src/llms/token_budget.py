@@ -0,0 +1,208 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Token counting and per-agent prompt budgets.
+
+Tokens are counted with the model's tiktoken encoding when one is available,
+falling back to ``cl100k_base`` and then to a four-characters-per-token
+estimate (tiktoken downloads its encodings on first use, which fails offline).
+Tokenizers are cached per model.
+
+``fit_messages`` brings a prompt within the budget of its agent by truncating
+the content of its least important messages first: tool outputs, then earlier
+assistant turns, then earlier user messages. The system prompt and the latest
+message are only truncated as a last resort. Messages are never dropped, so
+tool calls stay paired with their results.
+"""
+
+import functools
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence, Union
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+
+from src.config.agents import AGENT_TOKEN_BUDGET, DEFAULT_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken comes with langchain-openai
+    tiktoken = None
+
+Message = Union[BaseMessage, dict]
+
+# Tokens a chat message costs on top of its content (role, separators).
+MESSAGE_OVERHEAD_TOKENS = 4
+# Truncated messages keep at least this many tokens of content.
+MIN_KEPT_TOKENS = 64
+TRUNCATION_MARKER = "\n\n[...truncated to fit the context budget]"
+
+_ROLE_PRIORITIES = {"tool": 0, "ai": 1, "human": 2, "system": 3}
+
+
+@functools.lru_cache(maxsize=32)
+def get_tokenizer(model: Optional[str] = None) -> Any:
+    """Return the tiktoken encoding of ``model``, or None to estimate instead."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model or "")
+    except Exception:
+        pass
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"No tokenizer available, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    tokenizer = get_tokenizer(model)
+    if tokenizer is None:
+        return math.ceil(len(text) / 4)
+    return len(tokenizer.encode(text, disallowed_special=()))
+
+
+def _truncate_text(text: str, max_tokens: int, model: Optional[str]) -> str:
+    tokenizer = get_tokenizer(model)
+    if tokenizer is None:
+        kept = text[: max_tokens * 4]
+    else:
+        kept = tokenizer.decode(
+            tokenizer.encode(text, disallowed_special=())[:max_tokens]
+        )
+    return kept.rstrip() + TRUNCATION_MARKER
+
+
+def _role(message: Message) -> str:
+    if isinstance(message, dict):
+        role = message.get("role", "user")
+        return {"user": "human", "assistant": "ai"}.get(role, role)
+    return message.type
+
+
+def _content(message: Message) -> Any:
+    return message.get("content") if isinstance(message, dict) else message.content
+
+
+def _with_content(message: Message, content: str) -> Message:
+    if isinstance(message, dict):
+        return {**message, "content": content}
+    return message.model_copy(update={"content": content})
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part if isinstance(part, str) else str(part.get("text", ""))
+            for part in content
+        )
+    return str(content or "")
+
+
+def count_message_tokens(
+    messages: Sequence[Message], model: Optional[str] = None
+) -> int:
+    return sum(
+        count_tokens(_text(_content(message)), model) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+@dataclass
+class PromptTokenStats:
+    calls: int = 0
+    prompt_tokens: int = 0
+    max_prompt_tokens: int = 0
+    truncated_calls: int = 0
+
+
+_stats: dict[str, PromptTokenStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(agent: str, tokens: int, truncated: bool) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(agent, PromptTokenStats())
+        stats.calls += 1
+        stats.prompt_tokens += tokens
+        stats.max_prompt_tokens = max(stats.max_prompt_tokens, tokens)
+        stats.truncated_calls += int(truncated)
+
+
+def prompt_token_stats() -> dict[str, dict[str, int]]:
+    """Prompt sizes observed per agent since start-up."""
+    with _stats_lock:
+        return {agent: vars(stats).copy() for agent, stats in _stats.items()}
+
+
+def fit_messages(
+    messages: Sequence[Message],
+    agent: str,
+    llm: Optional[BaseChatModel] = None,
+    budget: Optional[int] = None,
+) -> list[Message]:
+    """
+    Truncate ``messages`` so the prompt fits the token budget of ``agent``.
+
+    Args:
+        messages: Chat messages, as message objects or role/content dicts.
+        agent: Agent name, used to look up its budget in AGENT_TOKEN_BUDGET and
+            to attribute the token counts.
+        llm: The model the prompt is for, to count with its tokenizer.
+        budget: Overrides the configured budget.
+    """
+    model = getattr(llm, "model_name", None)
+    budget = budget or AGENT_TOKEN_BUDGET.get(agent, DEFAULT_TOKEN_BUDGET)
+    messages = list(messages)
+    counts = [
+        count_tokens(_text(_content(message)), model) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    ]
+    total = sum(counts)
+    excess = total - budget
+
+    if excess > 0:
+        last = len(messages) - 1
+        marker_tokens = count_tokens(TRUNCATION_MARKER, model)
+
+        def priority(index: int) -> int:
+            if index == last:
+                return _ROLE_PRIORITIES["system"]
+            return _ROLE_PRIORITIES.get(_role(messages[index]), 1)
+
+        # Least important first; among equals, the oldest first.
+        for index in sorted(range(len(messages)), key=lambda i: (priority(i), i)):
+            if excess <= 0:
+                break
+            content = _content(messages[index])
+            if not isinstance(content, str):
+                continue
+            keep = max(
+                MIN_KEPT_TOKENS,
+                counts[index] - MESSAGE_OVERHEAD_TOKENS - excess - marker_tokens,
+            )
+            if keep >= counts[index] - MESSAGE_OVERHEAD_TOKENS:
+                continue
+            truncated = _truncate_text(content, keep, model)
+            new_count = count_tokens(truncated, model) + MESSAGE_OVERHEAD_TOKENS
+            excess -= counts[index] - new_count
+            counts[index] = new_count
+            messages[index] = _with_content(messages[index], truncated)
+
+        logger.warning(
+            f"{agent} prompt of {total} tokens exceeded its budget of {budget}, "
+            f"truncated to {sum(counts)} tokens"
+        )
+    else:
+        logger.info(f"{agent} prompt: {total} tokens (budget {budget})")
+    _record(agent, sum(counts), truncated=total > budget)
+    return messages
@@ -6,6 +6,7 @@ import logging
 from langchain.schema import HumanMessage, SystemMessage
 
 from src.config.agents import AGENT_LLM_MAP
+from src.llms.cache import with_llm_cache
 from src.llms.llm import get_llm_by_type
 from src.prompts.template import get_prompt_template
 
@@ -17,8 +18,9 @@ logger = logging.getLogger(__name__)
 
 def script_writer_node(state: PodcastState):
     logger.info("Generating script for podcast...")
-    model = get_llm_by_type(
-        AGENT_LLM_MAP["podcast_script_writer"]
+    model = with_llm_cache(
+        get_llm_by_type(AGENT_LLM_MAP["podcast_script_writer"]),
+        "podcast_script_writer",
     ).with_structured_output(Script, method="json_mode")
     script = model.invoke(
         [
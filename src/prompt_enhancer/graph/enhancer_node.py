@@ -6,6 +6,7 @@ import logging
 from langchain.schema import HumanMessage, SystemMessage
 
 from src.config.agents import AGENT_LLM_MAP
+from src.llms.cache import with_llm_cache
 from src.llms.llm import get_llm_by_type
 from src.prompts.template import env, apply_prompt_template
 from src.prompt_enhancer.graph.state import PromptEnhancerState
@@ -17,7 +18,9 @@ def prompt_enhancer_node(state: PromptEnhancerState):
     """Node that enhances user prompts using AI analysis."""
     logger.info("Enhancing user prompt...")
 
-    model = get_llm_by_type(AGENT_LLM_MAP["prompt_enhancer"])
+    model = with_llm_cache(
+        get_llm_by_type(AGENT_LLM_MAP["prompt_enhancer"]), "prompt_enhancer"
+    )
 
     try:
 
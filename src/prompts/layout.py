@@ -0,0 +1,75 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Prompt layout for provider prefix caching.
+
+Providers reuse the work done on a prompt prefix they have seen recently,
+which makes those input tokens cheaper and faster, but only up to the first
+token that differs. With ``PROMPT_PREFIX_CACHING`` enabled, prompts are
+assembled so that their prefix repeats across calls:
+
+- ``CURRENT_TIME`` is rendered at day resolution, so the system prompt stays
+  the same all day instead of changing every second.
+- Fixed instructions come right after the system prompt, and per-request
+  content (task, findings, observations) comes last.
+
+``CURRENT_TIME`` is also rendered at day resolution when the LLM response cache
+is enabled, since its keys include the rendered prompts.
+
+``PROMPT_CACHE_CONTROL`` additionally marks the end of the static prefix with
+an Anthropic-style ``cache_control`` content block, for providers and gateways
+that only cache up to explicit breakpoints.
+"""
+
+import os
+from typing import Union
+
+from langchain_core.messages import BaseMessage
+
+from src.llms.cache import llm_cache_enabled
+
+Message = Union[BaseMessage, dict]
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _flag(name: str) -> bool:
+    return os.getenv(name, "false").lower() in ("1", "true", "yes")
+
+
+def prefix_caching_enabled() -> bool:
+    return _flag("PROMPT_PREFIX_CACHING")
+
+
+def cache_control_enabled() -> bool:
+    return prefix_caching_enabled() and _flag("PROMPT_CACHE_CONTROL")
+
+
+def current_time_format() -> str:
+    """strftime format of CURRENT_TIME in the prompts."""
+    if prefix_caching_enabled() or llm_cache_enabled():
+        return "%a %b %d %Y"
+    return "%a %b %d %Y %H:%M:%S %z"
+
+
+def with_cache_breakpoint(message: Message) -> Message:
+    """Return ``message`` with a cache-control hint on its text content."""
+    content = message.get("content") if isinstance(message, dict) else message.content
+    if not isinstance(content, str):
+        return message
+    blocks = [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+    if isinstance(message, dict):
+        return {**message, "content": blocks}
+    return message.model_copy(update={"content": blocks})
+
+
+def static_first(static: list[Message], dynamic: list[Message]) -> list[Message]:
+    """
+    Lay out a prompt as its static messages followed by its dynamic ones, with
+    a cache breakpoint on the last static message when hints are enabled.
+    """
+    static = list(static)
+    if static and cache_control_enabled():
+        static[-1] = with_cache_breakpoint(static[-1])
+    return static + list(dynamic)
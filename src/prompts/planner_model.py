@@ -4,7 +4,7 @@
 from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class StepType(str, Enum):
@@ -19,6 +19,13 @@ class Step(BaseModel):
     title: str
     description: str = Field(..., description="Specify exactly what data to collect")
     step_type: StepType = Field(..., description="Indicates the nature of the step")
+    depends_on: Optional[List[int]] = Field(
+        default=None,
+        description=(
+            "Indexes (0-based) of the steps whose findings this step needs. "
+            "Leave unset to depend on every earlier step; use [] for an independent step"
+        ),
+    )
     execution_res: Optional[str] = Field(
         default=None, description="The Step execution result"
     )
@@ -36,6 +43,65 @@ class Plan(BaseModel):
         description="Research & Processing steps to get more context",
     )
 
+    @model_validator(mode="after")
+    def validate_step_dependencies(self) -> "Plan":
+        """Ensure ``depends_on`` references existing steps and forms a DAG."""
+        for index, step in enumerate(self.steps):
+            for dependency in step.depends_on or []:
+                if not 0 <= dependency < len(self.steps):
+                    raise ValueError(
+                        f"Step {index} depends on unknown step {dependency}"
+                    )
+                if dependency == index:
+                    raise ValueError(f"Step {index} depends on itself")
+        # Raises on cycles
+        self.topological_waves()
+        return self
+
+    def get_dependencies(self, index: int) -> List[int]:
+        """Return the direct dependencies of a step.
+
+        Steps without ``depends_on`` depend on every step before them.
+        """
+        depends_on = self.steps[index].depends_on
+        if depends_on is None:
+            return list(range(index))
+        return sorted(set(depends_on))
+
+    def get_ancestors(self, index: int) -> List[int]:
+        """Return the indexes of all transitive dependencies of a step, in plan order."""
+        ancestors = set()
+        pending = self.get_dependencies(index)
+        while pending:
+            dependency = pending.pop()
+            if dependency not in ancestors:
+                ancestors.add(dependency)
+                pending.extend(self.get_dependencies(dependency))
+        return sorted(ancestors)
+
+    def topological_waves(self) -> List[List[int]]:
+        """Group step indexes into waves that only depend on earlier waves.
+
+        Raises:
+            ValueError: If the step dependencies contain a cycle
+        """
+        remaining = {
+            index: set(self.get_dependencies(index)) for index in range(len(self.steps))
+        }
+        waves = []
+        while remaining:
+            wave = sorted(index for index, deps in remaining.items() if not deps)
+            if not wave:
+                raise ValueError(
+                    f"Step dependencies contain a cycle between steps {sorted(remaining)}"
+                )
+            waves.append(wave)
+            for index in wave:
+                del remaining[index]
+            for deps in remaining.values():
+                deps.difference_update(wave)
+        return waves
+
     class Config:
         json_schema_extra = {
             "examples": [
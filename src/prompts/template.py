@@ -1,12 +1,40 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-import os
+"""
+Prompt templates.
+
+Every template is compiled once at import, together with the set of variables
+it references (found with ``jinja2.meta``). Renders are memoized by the values
+of exactly those variables, so a node or a ReAct loop that applies the same
+prompt again gets the cached system prompt. Volatile variables such as
+``CURRENT_TIME`` are rendered as placeholders and substituted afterwards, which
+keeps the cached part independent of them.
+"""
+
 import dataclasses
+import logging
+import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from typing import Any, Hashable, Optional
+
+from jinja2 import (
+    Environment,
+    FileSystemLoader,
+    Template,
+    meta,
+    nodes,
+    select_autoescape,
+)
 from langgraph.prebuilt.chat_agent_executor import AgentState
+from pydantic import BaseModel
+
 from src.config.configuration import Configuration
+from src.prompts.layout import current_time_format
+
+logger = logging.getLogger(__name__)
 
 # Initialize Jinja2 environment
 env = Environment(
@@ -16,6 +44,124 @@ env = Environment(
     lstrip_blocks=True,
 )
 
+# Variables whose value changes between otherwise identical calls.
+VOLATILE_VARIABLES = ("CURRENT_TIME",)
+RENDER_CACHE_SIZE = int(os.getenv("PROMPT_RENDER_CACHE_SIZE", "256"))
+
+
+@dataclasses.dataclass(frozen=True)
+class CompiledPrompt:
+    template: Template
+    # Variables the template references; None when it includes other
+    # templates, whose variables are not known.
+    variables: Optional[frozenset[str]]
+    # Volatile variables that are only ever printed as is, and can therefore
+    # be substituted after rendering.
+    deferred: frozenset[str]
+
+
+def _placeholder(name: str) -> str:
+    return f"\x00{name}\x00"
+
+
+def _compile(template_name: str) -> CompiledPrompt:
+    source = env.loader.get_source(env, template_name)[0]
+    ast = env.parse(source)
+    variables = frozenset(meta.find_undeclared_variables(ast))
+    if list(meta.find_referenced_templates(ast)):
+        variables = None
+    printed = [
+        node.name
+        for output in ast.find_all(nodes.Output)
+        for node in output.nodes
+        if isinstance(node, nodes.Name)
+    ]
+    used = [node.name for node in ast.find_all(nodes.Name)]
+    deferred = frozenset(
+        name
+        for name in VOLATILE_VARIABLES
+        if name in used and used.count(name) == printed.count(name)
+    )
+    return CompiledPrompt(env.get_template(template_name), variables, deferred)
+
+
+def _compile_all() -> dict[str, CompiledPrompt]:
+    compiled = {}
+    for template_name in env.list_templates(extensions=["md"]):
+        try:
+            compiled[template_name] = _compile(template_name)
+        except Exception as e:
+            logger.warning(f"Failed to precompile prompt {template_name}: {e}")
+    return compiled
+
+
+_compiled = _compile_all()
+_compiled_lock = threading.Lock()
+
+
+def get_compiled_prompt(prompt_name: str) -> CompiledPrompt:
+    template_name = f"{prompt_name}.md"
+    compiled = _compiled.get(template_name)
+    if compiled is None:
+        compiled = _compile(template_name)
+        with _compiled_lock:
+            _compiled[template_name] = compiled
+    return compiled
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable form of a template variable, raising TypeError if there's none."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, BaseModel):
+        return type(value), tuple(
+            (name, _freeze(getattr(value, name))) for name in type(value).model_fields
+        )
+    hash(value)
+    return value
+
+
+_renders: OrderedDict[Hashable, str] = OrderedDict()
+_renders_lock = threading.Lock()
+
+
+def _render(prompt_name: str, compiled: CompiledPrompt, variables: dict) -> str:
+    try:
+        key = (prompt_name, _freeze(sorted(variables.items())))
+    except TypeError:
+        return compiled.template.render(**variables)
+    with _renders_lock:
+        rendered = _renders.get(key)
+        if rendered is not None:
+            _renders.move_to_end(key)
+            return rendered
+    rendered = compiled.template.render(**variables)
+    if RENDER_CACHE_SIZE > 0:
+        with _renders_lock:
+            _renders[key] = rendered
+            while len(_renders) > RENDER_CACHE_SIZE:
+                _renders.popitem(last=False)
+    return rendered
+
+
+def render_prompt(prompt_name: str, values: dict) -> str:
+    """Render a precompiled prompt with ``values``, reusing earlier renders."""
+    compiled = get_compiled_prompt(prompt_name)
+    names = values.keys() if compiled.variables is None else compiled.variables
+    variables = {name: values[name] for name in names if name in values}
+    deferred = {
+        name: variables.pop(name) for name in compiled.deferred if name in variables
+    }
+    variables.update({name: _placeholder(name) for name in deferred})
+    prompt = _render(prompt_name, compiled, variables)
+    for name, value in deferred.items():
+        prompt = prompt.replace(_placeholder(name), str(value))
+    return prompt
+
 
 def get_prompt_template(prompt_name: str) -> str:
     """
@@ -28,8 +174,7 @@ def get_prompt_template(prompt_name: str) -> str:
         The template string with proper variable substitution syntax
     """
     try:
-        template = env.get_template(f"{prompt_name}.md")
-        return template.render()
+        return render_prompt(prompt_name, {})
     except Exception as e:
         raise ValueError(f"Error loading template {prompt_name}: {e}")
 
@@ -49,17 +194,20 @@ def apply_prompt_template(
     """
     # Convert state to dict for template rendering
     state_vars = {
-        "CURRENT_TIME": datetime.now().strftime("%a %b %d %Y %H:%M:%S %z"),
+        "CURRENT_TIME": datetime.now().strftime(current_time_format()),
         **state,
     }
 
-    # Add configurable variables
+    # Add configurable variables; read as attributes, as asdict() would deep
+    # copy resources and MCP settings on every call
     if configurable:
-        state_vars.update(dataclasses.asdict(configurable))
+        state_vars.update(
+            (f.name, getattr(configurable, f.name))
+            for f in dataclasses.fields(configurable)
+        )
 
     try:
-        template = env.get_template(f"{prompt_name}.md")
-        system_prompt = template.render(**state_vars)
+        system_prompt = render_prompt(prompt_name, state_vars)
         return [{"role": "system", "content": system_prompt}] + state["messages"]
     except Exception as e:
         raise ValueError(f"Error applying template {prompt_name}: {e}")
@@ -6,6 +6,7 @@ import logging
 from langchain.schema import HumanMessage, SystemMessage
 
 from src.config.agents import AGENT_LLM_MAP
+from src.llms.cache import with_llm_cache
 from src.llms.llm import get_llm_by_type
 from src.prose.graph.state import ProseState
 from src.prompts.template import get_prompt_template
@@ -15,7 +16,9 @@ logger = logging.getLogger(__name__)
 
 def prose_improve_node(state: ProseState):
     logger.info("Generating prose improve content...")
-    model = get_llm_by_type(AGENT_LLM_MAP["prose_writer"])
+    model = with_llm_cache(
+        get_llm_by_type(AGENT_LLM_MAP["prose_writer"]), "prose_writer"
+    )
     prose_content = model.invoke(
         [
             SystemMessage(content=get_prompt_template("prose/prose_improver")),
@@ -2,8 +2,8 @@
 # SPDX-License-Identifier: MIT
 
 import os
-import requests
 from src.rag.retriever import Chunk, Document, Resource, Retriever
+from src.utils import http_client
 from urllib.parse import urlparse
 
 
@@ -55,7 +55,7 @@ class RAGFlowProvider(Retriever):
             "page_size": self.page_size,
         }
 
-        response = requests.post(
+        response = http_client.post(
             f"{self.api_url}/api/v1/retrieval", headers=headers, json=payload
         )
 
@@ -96,7 +96,7 @@ class RAGFlowProvider(Retriever):
         if query:
             params["name"] = query
 
-        response = requests.get(
+        response = http_client.get(
             f"{self.api_url}/api/v1/datasets", headers=headers, params=params
         )
 
@@ -1,6 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
 import json
 import logging
@@ -12,6 +13,7 @@ from fastapi.responses import FileResponse
 from starlette.background import BackgroundTask
 
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response, StreamingResponse
 from langchain_core.messages import AIMessageChunk, ToolMessage, BaseMessage
@@ -35,8 +37,9 @@ from src.server.chat_request import (
     GenerateProseRequest,
     TTSRequest,
 )
+from src.server.graph_registry import CompiledGraphRegistry
 from src.server.mcp_request import MCPServerMetadataRequest, MCPServerMetadataResponse
-from src.server.mcp_utils import load_mcp_tools
+from src.server.mcp_utils import load_mcp_tools_cached
 from src.server.rag_request import (
     RAGConfigResponse,
     RAGResourceRequest,
@@ -49,6 +52,18 @@ logger = logging.getLogger(__name__)
 
 INTERNAL_SERVER_ERROR_DETAIL = "Internal Server Error"
 
+# Per-endpoint limits on concurrent blocking work, so that a burst of slow
+# TTS or generation calls cannot exhaust the worker's thread pool
+ENDPOINT_CONCURRENCY_LIMITS = {
+    "tts": asyncio.Semaphore(int(os.getenv("TTS_MAX_CONCURRENCY", "8"))),
+    "podcast": asyncio.Semaphore(int(os.getenv("PODCAST_MAX_CONCURRENCY", "2"))),
+    "ppt": asyncio.Semaphore(int(os.getenv("PPT_MAX_CONCURRENCY", "2"))),
+    "prompt_enhancer": asyncio.Semaphore(
+        int(os.getenv("PROMPT_ENHANCER_MAX_CONCURRENCY", "8"))
+    ),
+    "rag": asyncio.Semaphore(int(os.getenv("RAG_MAX_CONCURRENCY", "8"))),
+}
+
 app = FastAPI(
     title="DeerFlow API",
     description="API for Deer",
@@ -66,6 +81,16 @@ app.add_middleware(
 
 graph = build_graph_with_memory()
 
+# Sub-workflows are compiled once, on first use, and shared by all requests
+workflows = CompiledGraphRegistry(
+    {
+        "podcast": build_podcast_graph,
+        "ppt": build_ppt_graph,
+        "prose": build_prose_graph,
+        "prompt_enhancer": build_prompt_enhancer_graph,
+    }
+)
+
 
 @app.post("/api/chat/stream")
 async def chat_stream(request: ChatRequest):
@@ -86,6 +111,7 @@ async def chat_stream(request: ChatRequest):
             request.max_plan_iterations,
             request.max_step_num,
             request.max_search_results,
+            request.max_parallel_steps,
             request.auto_accepted_plan,
             request.interrupt_feedback,
             request.mcp_settings,
@@ -103,6 +129,7 @@ async def _astream_workflow_generator(
     max_plan_iterations: int,
     max_step_num: int,
     max_search_results: int,
+    max_parallel_steps: int,
     auto_accepted_plan: bool,
     interrupt_feedback: str,
     mcp_settings: dict,
@@ -132,6 +159,7 @@ async def _astream_workflow_generator(
             "max_plan_iterations": max_plan_iterations,
             "max_step_num": max_step_num,
             "max_search_results": max_search_results,
+            "max_parallel_steps": max_parallel_steps,
             "mcp_settings": mcp_settings,
             "report_style": report_style.value,
         },
@@ -160,7 +188,11 @@ async def _astream_workflow_generator(
         )
         event_stream_message: dict[str, any] = {
             "thread_id": thread_id,
-            "agent": agent[0].split(":")[0],
+            "agent": (
+                agent[0].split(":")[0]
+                if agent
+                else message_metadata.get("langgraph_node", "")
+            ),
             "id": message_chunk.id,
             "role": "assistant",
             "content": message_chunk.content,
@@ -222,17 +254,19 @@ async def text_to_speech(request: TTSRequest):
             cluster=cluster,
             voice_type=voice_type,
         )
-        # Call the TTS API
-        result = tts_client.text_to_speech(
-            text=request.text[:1024],
-            encoding=request.encoding,
-            speed_ratio=request.speed_ratio,
-            volume_ratio=request.volume_ratio,
-            pitch_ratio=request.pitch_ratio,
-            text_type=request.text_type,
-            with_frontend=request.with_frontend,
-            frontend_type=request.frontend_type,
-        )
+        # Call the TTS API off the event loop
+        async with ENDPOINT_CONCURRENCY_LIMITS["tts"]:
+            result = await run_in_threadpool(
+                tts_client.text_to_speech,
+                text=request.text[:1024],
+                encoding=request.encoding,
+                speed_ratio=request.speed_ratio,
+                volume_ratio=request.volume_ratio,
+                pitch_ratio=request.pitch_ratio,
+                text_type=request.text_type,
+                with_frontend=request.with_frontend,
+                frontend_type=request.frontend_type,
+            )
 
         if not result["success"]:
             raise HTTPException(status_code=500, detail=str(result["error"]))
@@ -260,8 +294,9 @@ async def generate_podcast(request: GeneratePodcastRequest):
     try:
         report_content = request.content
         print(report_content)
-        workflow = build_podcast_graph()
-        final_state = workflow.invoke({"input": report_content})
+        workflow = workflows.get("podcast")
+        async with ENDPOINT_CONCURRENCY_LIMITS["podcast"]:
+            final_state = await workflow.ainvoke({"input": report_content})
         audio_bytes = final_state["output"]
         return Response(content=audio_bytes, media_type="audio/mp3")
     except Exception as e:
@@ -274,11 +309,11 @@ async def generate_ppt(request: GeneratePPTRequest):
     try:
         report_content = request.content
         print(report_content)
-        workflow = build_ppt_graph()
-        final_state = workflow.invoke({"input": report_content})
+        workflow = workflows.get("ppt")
+        async with ENDPOINT_CONCURRENCY_LIMITS["ppt"]:
+            final_state = await workflow.ainvoke({"input": report_content})
         generated_file_path = final_state["generated_file_path"]
-        with open(generated_file_path, "rb") as f:
-            ppt_bytes = f.read()
+        ppt_bytes = await run_in_threadpool(_read_file_bytes, generated_file_path)
         return Response(
             content=ppt_bytes,
             media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
@@ -288,12 +323,17 @@ async def generate_ppt(request: GeneratePPTRequest):
         raise HTTPException(status_code=500, detail=INTERNAL_SERVER_ERROR_DETAIL)
 
 
+def _read_file_bytes(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
 @app.post("/api/prose/generate")
 async def generate_prose(request: GenerateProseRequest):
     try:
         sanitized_prompt = request.prompt.replace("\r\n", "").replace("\n", "")
         logger.info(f"Generating prose for prompt: {sanitized_prompt}")
-        workflow = build_prose_graph()
+        workflow = workflows.get("prose")
         events = workflow.astream(
             {
                 "content": request.prompt,
@@ -342,14 +382,15 @@ async def enhance_prompt(request: EnhancePromptRequest):
         else:
             report_style = ReportStyle.ACADEMIC
 
-        workflow = build_prompt_enhancer_graph()
-        final_state = workflow.invoke(
-            {
-                "prompt": request.prompt,
-                "context": request.context,
-                "report_style": report_style,
-            }
-        )
+        workflow = workflows.get("prompt_enhancer")
+        async with ENDPOINT_CONCURRENCY_LIMITS["prompt_enhancer"]:
+            final_state = await workflow.ainvoke(
+                {
+                    "prompt": request.prompt,
+                    "context": request.context,
+                    "report_style": report_style,
+                }
+            )
         return {"result": final_state["output"]}
     except Exception as e:
         logger.exception(f"Error occurred during prompt enhancement: {str(e)}")
@@ -367,14 +408,15 @@ async def mcp_server_metadata(request: MCPServerMetadataRequest):
         if request.timeout_seconds is not None:
             timeout = request.timeout_seconds
 
-        # Load tools from the MCP server using the utility function
-        tools = await load_mcp_tools(
+        # Load tools from the MCP server, or from the metadata cache
+        tools = await load_mcp_tools_cached(
             server_type=request.transport,
             command=request.command,
             args=request.args,
             url=request.url,
             env=request.env,
             timeout_seconds=timeout,
+            force_refresh=request.force_refresh,
         )
 
         # Create the response with tools
@@ -406,7 +448,9 @@ async def rag_resources(request: Annotated[RAGResourceRequest, Query()]):
     """Get the resources of the RAG."""
     retriever = build_retriever()
     if retriever:
-        return RAGResourcesResponse(resources=retriever.list_resources(request.query))
+        async with ENDPOINT_CONCURRENCY_LIMITS["rag"]:
+            resources = await run_in_threadpool(retriever.list_resources, request.query)
+        return RAGResourcesResponse(resources=resources)
     return RAGResourcesResponse(resources=[])
 
 
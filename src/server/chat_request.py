@@ -47,6 +47,9 @@ class ChatRequest(BaseModel):
     max_search_results: Optional[int] = Field(
         3, description="The maximum number of search results"
     )
+    max_parallel_steps: Optional[int] = Field(
+        3, description="The maximum number of plan steps executed concurrently"
+    )
     auto_accepted_plan: Optional[bool] = Field(
         False, description="Whether to automatically accept the plan"
     )
@@ -0,0 +1,43 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import logging
+import threading
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledGraphRegistry:
+    """
+    Registry that compiles each workflow graph once, on first use, and reuses it.
+
+    Compiled graphs without a checkpointer are stateless, so a single instance
+    can serve any number of concurrent requests.
+    """
+
+    def __init__(self, builders: dict[str, Callable[[], Any]]):
+        self._builders = builders
+        self._graphs: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """Return the compiled graph registered under ``name``, building it if needed."""
+        graph = self._graphs.get(name)
+        if graph is not None:
+            return graph
+        if name not in self._builders:
+            raise KeyError(f"Unknown workflow: {name}")
+        with self._lock:
+            # Another thread may have built the graph while we were waiting
+            graph = self._graphs.get(name)
+            if graph is None:
+                logger.info(f"Compiling {name} workflow")
+                graph = self._builders[name]()
+                self._graphs[name] = graph
+        return graph
+
+    def clear(self) -> None:
+        """Drop all compiled graphs, so they are rebuilt on next use."""
+        with self._lock:
+            self._graphs.clear()
@@ -25,6 +25,9 @@ class MCPServerMetadataRequest(BaseModel):
     timeout_seconds: Optional[int] = Field(
         None, description="Optional custom timeout in seconds for the operation"
     )
+    force_refresh: bool = Field(
+        False, description="Reload the tools instead of using cached metadata"
+    )
 
 
 class MCPServerMetadataResponse(BaseModel):
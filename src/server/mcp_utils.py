@@ -1,17 +1,34 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import time
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
 
+from src.utils.cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Tool metadata per server configuration, so that reopening the MCP settings
+# doesn't relaunch the server every time.
+mcp_metadata_cache = TTLCache.from_env(
+    "MCP_METADATA_CACHE", ttl_seconds=3600, max_entries=128
+)
+# Cached metadata older than this is still served, and refreshed in the background.
+MCP_METADATA_REFRESH_SECONDS = float(os.getenv("MCP_METADATA_REFRESH_SECONDS", "300"))
+
+_refresh_tasks: Dict[Tuple, asyncio.Task] = {}
+
 
 async def _get_tools_from_client_session(
     client_context_manager: Any, timeout_seconds: int = 10
@@ -102,3 +119,71 @@ async def load_mcp_tools(
             logger.exception(f"Error loading MCP tools: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
         raise
+
+
+def metadata_cache_key(
+    server_type: str,
+    command: Optional[str] = None,
+    args: Optional[List[str]] = None,
+    url: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> Tuple:
+    """Cache key of a server configuration; the env is hashed to keep secrets out."""
+    env_hash = hashlib.sha256(
+        json.dumps(env or {}, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return (server_type, command, tuple(args or ()), url, env_hash)
+
+
+async def _refresh_metadata(
+    key: Tuple, fetch: Callable[[], Awaitable[Dict[str, Any]]]
+) -> None:
+    try:
+        mcp_metadata_cache.set(key, await fetch())
+    except Exception as e:
+        # The stale entry stays until it expires.
+        logger.warning(f"Background refresh of MCP server metadata failed: {e}")
+
+
+async def load_mcp_tools_cached(
+    server_type: str,
+    command: Optional[str] = None,
+    args: Optional[List[str]] = None,
+    url: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    timeout_seconds: int = 60,
+    force_refresh: bool = False,
+) -> List:
+    """
+    Cached variant of :func:`load_mcp_tools`.
+
+    Concurrent requests for the same server share one load. Entries older than
+    ``MCP_METADATA_REFRESH_SECONDS`` are returned as they are while a background
+    task reloads them; ``force_refresh`` reloads the tools before returning.
+    Errors are not cached.
+    """
+    key = metadata_cache_key(server_type, command, args, url, env)
+
+    async def fetch() -> Dict[str, Any]:
+        tools = await load_mcp_tools(
+            server_type=server_type,
+            command=command,
+            args=args,
+            url=url,
+            env=env,
+            timeout_seconds=timeout_seconds,
+        )
+        return {"tools": tools, "fetched_at": time.time()}
+
+    if force_refresh:
+        entry = await fetch()
+        mcp_metadata_cache.set(key, entry)
+        return entry["tools"]
+
+    entry = await mcp_metadata_cache.aget_or_compute(key, fetch)
+    stale = time.time() - entry["fetched_at"] > MCP_METADATA_REFRESH_SECONDS
+    if stale and key not in _refresh_tasks:
+        task = asyncio.create_task(_refresh_metadata(key, fetch))
+        _refresh_tasks[key] = task
+        task.add_done_callback(lambda _: _refresh_tasks.pop(key, None))
+    return entry["tools"]
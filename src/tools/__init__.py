@@ -3,7 +3,7 @@
 
 import os
 
-from .crawl import crawl_tool
+from .crawl import batch_crawl_tool, crawl_tool
 from .python_repl import python_repl_tool
 from .retriever import get_retriever_tool
 from .search import get_web_search_tool
@@ -19,6 +19,7 @@ from .tts import VolcengineTTS
 
 __all__ = [
     "crawl_tool",
+    "batch_crawl_tool",
     "python_repl_tool",
     "get_web_search_tool",
     "get_retriever_tool",
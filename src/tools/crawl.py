@@ -1,16 +1,46 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import functools
 import logging
-from typing import Annotated
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Annotated, Optional, Union
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool, tool
 from .decorators import log_io
 
-from src.crawler import Crawler
+from src.crawler import Article, CrawlCache, Crawler
 
 logger = logging.getLogger(__name__)
 
+MAX_BATCH_CRAWL_URLS = 10
+
+# Text the crawled content should be relevant to, typically the research step
+# being executed. Set by the agent step so crawl excerpts focus on the task.
+crawl_relevance_query: ContextVar[Optional[str]] = ContextVar(
+    "crawl_relevance_query", default=None
+)
+
+
+def crawl_max_tokens() -> int:
+    """Token budget for the content returned per crawled page."""
+    return int(os.getenv("CRAWL_MAX_TOKENS", "1000"))
+
+
+@functools.cache
+def get_crawler() -> Crawler:
+    """Return the crawler shared by the crawl tools, backed by the crawl cache."""
+    return Crawler(cache=CrawlCache.from_env())
+
+
+def _format_article(url: str, article: Article) -> dict:
+    content = article.to_markdown_excerpt(
+        max_tokens=crawl_max_tokens(), query=crawl_relevance_query.get()
+    )
+    return {"url": url, "crawled_content": content}
+
 
 @tool
 @log_io
@@ -19,10 +49,65 @@ def crawl_tool(
 ) -> str:
     """Use this to crawl a url and get a readable content in markdown format."""
     try:
-        crawler = Crawler()
-        article = crawler.crawl(url)
-        return {"url": url, "crawled_content": article.to_markdown()[:1000]}
+        article = get_crawler().crawl(url)
+        return _format_article(url, article)
     except BaseException as e:
         error_msg = f"Failed to crawl. Error: {repr(e)}"
         logger.error(error_msg)
         return error_msg
+
+
+def _format_batch(
+    urls: list[str], results: list[Union[Article, BaseException]]
+) -> dict:
+    pages = []
+    for url, result in zip(urls, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to crawl {url}. Error: {repr(result)}")
+            pages.append(
+                {"url": url, "error": f"Failed to crawl. Error: {repr(result)}"}
+            )
+        else:
+            pages.append(_format_article(url, result))
+    failed = sum(1 for page in pages if "error" in page)
+    return {"results": pages, "succeeded": len(pages) - failed, "failed": failed}
+
+
+def _crawl_or_error(url: str) -> Union[Article, BaseException]:
+    try:
+        return get_crawler().crawl(url)
+    except Exception as e:
+        return e
+
+
+@log_io
+def batch_crawl(
+    urls: Annotated[
+        list[str], f"The urls to crawl, at most {MAX_BATCH_CRAWL_URLS} per call."
+    ],
+) -> dict:
+    """Use this to crawl several urls at once and get their readable content in markdown format."""
+    urls = urls[:MAX_BATCH_CRAWL_URLS]
+    max_workers = int(os.getenv("CRAWLER_MAX_CONCURRENCY", "5"))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        results = list(executor.map(_crawl_or_error, urls))
+    return _format_batch(urls, results)
+
+
+@log_io
+async def abatch_crawl(
+    urls: Annotated[
+        list[str], f"The urls to crawl, at most {MAX_BATCH_CRAWL_URLS} per call."
+    ],
+) -> dict:
+    """Use this to crawl several urls at once and get their readable content in markdown format."""
+    urls = urls[:MAX_BATCH_CRAWL_URLS]
+    results = await get_crawler().crawl_many(urls)
+    return _format_batch(urls, results)
+
+
+batch_crawl_tool = StructuredTool.from_function(
+    func=batch_crawl,
+    coroutine=abatch_crawl,
+    name="batch_crawl_tool",
+)
@@ -3,7 +3,14 @@
 
 import logging
 import functools
-from typing import Any, Callable, Type, TypeVar
+import inspect
+import json
+from typing import Any, Callable, ClassVar, Type, TypeVar
+
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel
+
+from src.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -21,20 +28,33 @@ def log_io(func: Callable) -> Callable:
         The wrapped function with input/output logging
     """
 
-    @functools.wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        # Log input parameters
-        func_name = func.__name__
+    def log_call(args: tuple, kwargs: dict) -> None:
         params = ", ".join(
             [*(str(arg) for arg in args), *(f"{k}={v}" for k, v in kwargs.items())]
         )
-        logger.info(f"Tool {func_name} called with parameters: {params}")
+        logger.info(f"Tool {func.__name__} called with parameters: {params}")
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            log_call(args, kwargs)
+            result = await func(*args, **kwargs)
+            logger.info(f"Tool {func.__name__} returned: {result}")
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Log input parameters
+        log_call(args, kwargs)
 
         # Execute the function
         result = func(*args, **kwargs)
 
         # Log the output
-        logger.info(f"Tool {func_name} returned: {result}")
+        logger.info(f"Tool {func.__name__} returned: {result}")
 
         return result
 
@@ -79,3 +99,118 @@ def create_logged_tool(base_tool_class: Type[T]) -> Type[T]:
     # Set a more descriptive name for the class
     LoggedTool.__name__ = f"Logged{base_tool_class.__name__}"
     return LoggedTool
+
+
+# Tool fields that describe the tool itself rather than the query it runs.
+_BASE_TOOL_FIELDS = frozenset(BaseTool.model_fields)
+_SECRET_FIELD_MARKERS = ("key", "secret", "token", "password")
+_PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+
+
+def _cacheable_params(model: BaseModel, skip: frozenset = frozenset()) -> dict:
+    """Collect the primitive, non-secret settings of a tool or API wrapper."""
+    params = {}
+    for field_name in type(model).model_fields:
+        if field_name in skip or any(m in field_name for m in _SECRET_FIELD_MARKERS):
+            continue
+        value = getattr(model, field_name, None)
+        if isinstance(value, BaseModel):
+            params[field_name] = _cacheable_params(value)
+        elif isinstance(value, (*_PRIMITIVE_TYPES, list, tuple, dict)):
+            params[field_name] = value
+    return params
+
+
+def _normalize_query(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).lower()
+    return value
+
+
+class CachedToolMixin:
+    """
+    A mixin class that caches tool results in a shared TTLCache.
+
+    The cache key combines the tool class, the normalized call arguments and
+    the tool's own settings (e.g. ``max_results``), so differently configured
+    tools never share entries. Concurrent identical calls are coalesced.
+    """
+
+    result_cache: ClassVar[TTLCache]
+
+    def _cache_key(self, *args: Any, **kwargs: Any) -> str:
+        kwargs.pop("run_manager", None)
+        return json.dumps(
+            {
+                "engine": self.__class__.__name__,
+                "args": [_normalize_query(arg) for arg in args],
+                "kwargs": {k: _normalize_query(v) for k, v in kwargs.items()},
+                "params": _cacheable_params(self, _BASE_TOOL_FIELDS),
+            },
+            sort_keys=True,
+            default=str,
+        )
+
+    @staticmethod
+    def _encode_result(result: Any) -> Any:
+        # content_and_artifact tools return a tuple, which JSON stores as a list.
+        if isinstance(result, tuple):
+            return {"__tuple__": list(result)}
+        return result
+
+    @staticmethod
+    def _decode_result(result: Any) -> Any:
+        if isinstance(result, dict) and "__tuple__" in result:
+            return tuple(result["__tuple__"])
+        return result
+
+    @staticmethod
+    def _should_cache(result: Any) -> bool:
+        # Tools that swallow errors return an empty artifact; don't cache those.
+        if isinstance(result, dict) and "__tuple__" in result:
+            return bool(result["__tuple__"][-1])
+        return bool(result)
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        """Override _run method to serve repeated calls from the cache."""
+        result = self.result_cache.get_or_compute(
+            self._cache_key(*args, **kwargs),
+            lambda: self._encode_result(
+                super(CachedToolMixin, self)._run(*args, **kwargs)
+            ),
+            should_cache=self._should_cache,
+        )
+        return self._decode_result(result)
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        """Override _arun method to serve repeated calls from the cache."""
+
+        async def compute() -> Any:
+            result = await super(CachedToolMixin, self)._arun(*args, **kwargs)
+            return self._encode_result(result)
+
+        result = await self.result_cache.aget_or_compute(
+            self._cache_key(*args, **kwargs),
+            compute,
+            should_cache=self._should_cache,
+        )
+        return self._decode_result(result)
+
+
+def create_cached_tool(base_tool_class: Type[T], cache: TTLCache) -> Type[T]:
+    """
+    Factory function to create a version of a tool class whose results are cached.
+
+    Args:
+        base_tool_class: The original tool class to be enhanced with caching
+        cache: The cache shared by all instances of the new class
+
+    Returns:
+        A new class that inherits from both CachedToolMixin and the base tool class
+    """
+
+    class CachedTool(CachedToolMixin, base_tool_class):
+        result_cache: ClassVar[TTLCache] = cache
+
+    CachedTool.__name__ = base_tool_class.__name__
+    return CachedTool
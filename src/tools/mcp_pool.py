@@ -0,0 +1,284 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Pool of warm MCP client sessions.
+
+Connecting to an MCP server spawns a subprocess (stdio) or opens a connection
+(SSE) and runs the protocol handshake, which takes seconds. The pool keeps one
+connected session per server configuration (keyed by a hash of it, env
+included) and hands its tools to every agent step that needs that server.
+
+Sessions are closed after an idle timeout by a reaper task of the pool, pinged
+before reuse once their last health check is old enough, and the number of
+pooled sessions is bounded; when
+every pooled session is busy, extra sessions are opened for the duration of
+one step only. Sessions can be shared globally or per conversation thread
+(``MCP_SESSION_SCOPE``).
+
+The MCP transports are anyio-based and must be closed by the task that opened
+them, so every session lives in an owner task of its own.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+
+logger = logging.getLogger(__name__)
+
+
+def server_config_key(server_config: dict[str, Any]) -> str:
+    """Stable hash of an MCP server configuration."""
+    payload = json.dumps(server_config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _PooledSession:
+    """A connected MCP server, owned by a background task."""
+
+    def __init__(self, key: str, server_name: str, server_config: dict[str, Any]):
+        self.key = key
+        self.server_name = server_name
+        self.server_config = server_config
+        self.client: Optional[MultiServerMCPClient] = None
+        self.tools: list[BaseTool] = []
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def open(self) -> None:
+        ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready))
+        await ready
+
+    async def _run(self, ready: asyncio.Future) -> None:
+        try:
+            async with MultiServerMCPClient(
+                {self.server_name: self.server_config}
+            ) as client:
+                self.client = client
+                self.tools = client.get_tools()
+                ready.set_result(None)
+                await self._stop.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            elif not isinstance(e, asyncio.CancelledError):
+                logger.warning(f"MCP server '{self.server_name}' session failed: {e}")
+
+    async def ping(self, timeout: float) -> bool:
+        if not self.alive or self.client is None:
+            return False
+        try:
+            session = self.client.sessions[self.server_name]
+            await asyncio.wait_for(session.send_ping(), timeout)
+        except Exception as e:
+            logger.warning(
+                f"MCP server '{self.server_name}' failed a health check: {e}"
+            )
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+    async def close(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            logger.warning(f"Error closing MCP server '{self.server_name}': {e}")
+
+
+class MCPSessionPool:
+    """Warm MCP sessions of one event loop."""
+
+    def __init__(
+        self,
+        max_size: int = 8,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 60.0,
+        scope: str = "global",
+        health_check_timeout: float = 5.0,
+        reap_interval: float = 60.0,
+    ):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.scope = scope
+        self.reap_interval = reap_interval
+        self._sessions: OrderedDict[str, _PooledSession] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> "MCPSessionPool":
+        return cls(
+            max_size=int(os.getenv("MCP_POOL_MAX_SIZE", "8")),
+            idle_timeout=float(os.getenv("MCP_POOL_IDLE_TIMEOUT_SECONDS", "300")),
+            health_check_interval=float(
+                os.getenv("MCP_POOL_HEALTH_CHECK_SECONDS", "60")
+            ),
+            scope=os.getenv("MCP_SESSION_SCOPE", "global"),
+        )
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _key(
+        self, server_name: str, server_config: dict[str, Any], thread_id: Optional[str]
+    ) -> str:
+        key = f"{server_name}:{server_config_key(server_config)}"
+        if self.scope == "thread" and thread_id:
+            key = f"{thread_id}:{key}"
+        return key
+
+    async def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key, session in list(self._sessions.items()):
+            if session.in_use == 0 and (
+                now - session.last_used > self.idle_timeout or not session.alive
+            ):
+                if self._sessions.pop(key, None) is session:
+                    await session.close()
+        # A lock that isn't held has no waiters either, so the locks of keys
+        # without a session can go.
+        for key, lock in list(self._locks.items()):
+            if key not in self._sessions and not lock.locked():
+                del self._locks[key]
+
+    async def _reap(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                await self._evict_idle()
+            except Exception as e:
+                logger.warning(f"Failed to close idle MCP sessions: {e}")
+
+    def _start_reaper(self) -> None:
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap())
+
+    async def _make_room(self) -> bool:
+        """Close the least recently used idle session if the pool is full."""
+        if len(self._sessions) < self.max_size:
+            return True
+        idle = [key for key, session in self._sessions.items() if not session.in_use]
+        if not idle:
+            return False
+        await self._sessions.pop(idle[0]).close()
+        return True
+
+    async def _acquire(
+        self, server_name: str, server_config: dict[str, Any], thread_id: Optional[str]
+    ) -> tuple[_PooledSession, bool]:
+        """Return a connected session and whether it belongs to the pool."""
+        key = self._key(server_name, server_config, thread_id)
+        self._start_reaper()
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            await self._evict_idle()
+            session = self._sessions.get(key)
+            if session is not None:
+                stale = (
+                    time.monotonic() - session.last_checked > self.health_check_interval
+                )
+                # Taken before the health check, so that neither the reaper
+                # nor another key's _make_room closes the session meanwhile
+                session.in_use += 1
+                if session.alive and (
+                    not stale or await session.ping(self.health_check_timeout)
+                ):
+                    self._sessions.move_to_end(key)
+                    return session, True
+                session.in_use -= 1
+                if self._sessions.get(key) is session:
+                    del self._sessions[key]
+                if session.in_use == 0:
+                    await session.close()
+
+            session = _PooledSession(key, server_name, server_config)
+            await session.open()
+            session.in_use += 1
+            if await self._make_room():
+                self._sessions[key] = session
+                return session, True
+            logger.info(
+                f"MCP session pool is full, using a one-off session for "
+                f"'{server_name}'"
+            )
+            return session, False
+
+    async def _release(self, session: _PooledSession, pooled: bool) -> None:
+        session.in_use -= 1
+        session.last_used = time.monotonic()
+        if not pooled or (
+            session.in_use == 0 and self._sessions.get(session.key) is not session
+        ):
+            await session.close()
+
+    @asynccontextmanager
+    async def tools(
+        self, servers: dict[str, dict[str, Any]], thread_id: Optional[str] = None
+    ) -> AsyncIterator[list[BaseTool]]:
+        """
+        Yield the tools of ``servers`` (name to connection config), keeping the
+        sessions they run on connected for the duration of the block.
+        """
+        acquired: list[tuple[_PooledSession, bool]] = []
+        try:
+            for server_name, server_config in servers.items():
+                acquired.append(
+                    await self._acquire(server_name, server_config, thread_id)
+                )
+            yield [tool for session, _ in acquired for tool in session.tools]
+        finally:
+            for session, pooled in acquired:
+                await self._release(session, pooled)
+
+    async def close(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        self._locks.clear()
+        for session in sessions:
+            await session.close()
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MCPSessionPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """Return the session pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = MCPSessionPool.from_env()
+        _pools[loop] = pool
+    return pool
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+from collections import OrderedDict
 from typing import List, Optional, Type
 from langchain_core.tools import BaseTool
 from langchain_core.callbacks import (
@@ -51,15 +52,29 @@ class RetrieverTool(BaseTool):
         return self._run(keywords, run_manager.get_sync())
 
 
+# Tools per resource set, shared so that agents built with them can be reused
+# from the agent cache.
+RETRIEVER_TOOL_CACHE_SIZE = 32
+_retriever_tools: OrderedDict[tuple, RetrieverTool] = OrderedDict()
+
+
 def get_retriever_tool(resources: List[Resource]) -> RetrieverTool | None:
     if not resources:
         return None
+    key = tuple((r.uri, r.title, r.description) for r in resources)
+    tool = _retriever_tools.get(key)
+    if tool is not None:
+        return tool
     logger.info(f"create retriever tool: {SELECTED_RAG_PROVIDER}")
     retriever = build_retriever()
 
     if not retriever:
         return None
-    return RetrieverTool(retriever=retriever, resources=resources)
+    tool = RetrieverTool(retriever=retriever, resources=resources)
+    _retriever_tools[key] = tool
+    while len(_retriever_tools) > RETRIEVER_TOOL_CACHE_SIZE:
+        _retriever_tools.popitem(last=False)
+    return tool
 
 
 if __name__ == "__main__":
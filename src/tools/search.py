@@ -1,6 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import functools
 import json
 import logging
 import os
@@ -14,18 +15,29 @@ from src.tools.tavily_search.tavily_search_results_with_images import (
     TavilySearchResultsWithImages,
 )
 
-from src.tools.decorators import create_logged_tool
+from src.tools.decorators import create_cached_tool, create_logged_tool
+from src.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
-# Create logged versions of the search tools
-LoggedTavilySearch = create_logged_tool(TavilySearchResultsWithImages)
-LoggedDuckDuckGoSearch = create_logged_tool(DuckDuckGoSearchResults)
-LoggedBraveSearch = create_logged_tool(BraveSearch)
-LoggedArxivSearch = create_logged_tool(ArxivQueryRun)
+# Results are shared by every search tool instance, so the same query issued by
+# the background investigation and later by the researcher hits the network once.
+search_cache = TTLCache.from_env("SEARCH_CACHE", ttl_seconds=3600, max_entries=1024)
+
+# Create logged and cached versions of the search tools
+LoggedTavilySearch = create_logged_tool(
+    create_cached_tool(TavilySearchResultsWithImages, search_cache)
+)
+LoggedDuckDuckGoSearch = create_logged_tool(
+    create_cached_tool(DuckDuckGoSearchResults, search_cache)
+)
+LoggedBraveSearch = create_logged_tool(create_cached_tool(BraveSearch, search_cache))
+LoggedArxivSearch = create_logged_tool(create_cached_tool(ArxivQueryRun, search_cache))
 
 
-# Get the selected search tool
+# Get the selected search tool. Instances are shared, so that agents built with
+# them can be reused from the agent cache.
+@functools.lru_cache(maxsize=16)
 def get_web_search_tool(max_search_results: int):
     if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value:
         return LoggedTavilySearch(
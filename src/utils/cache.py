@@ -0,0 +1,477 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+In-process TTL/LRU cache with single-flight request coalescing.
+
+Entries live in a size-bounded in-memory LRU and can optionally be mirrored to
+an on-disk store so they survive restarts and are shared between workers.
+Concurrent misses for the same key are coalesced: only one caller computes the
+value while the others wait for its result.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Hashable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+# Result handed to coalesced async callers whose leader was cancelled.
+_RETRY = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DiskCacheStore:
+    """
+    Stores JSON-serializable cache entries as one file per key.
+
+    Files are named by the SHA-256 digest of the key and can be gzip-compressed,
+    which pays off for large values such as crawled pages. Each file's
+    modification time is set to its expiry, so that writes can sweep expired
+    files and, with ``max_bytes``, the soonest-expiring ones beyond the limit
+    without reading them.
+    """
+
+    # Minimum seconds between two sweeps while the store is within its limit.
+    sweep_interval = 60.0
+
+    def __init__(
+        self, directory: str, compress: bool = False, max_bytes: Optional[int] = None
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self._open = gzip.open if compress else open
+        self._sweep_lock = threading.Lock()
+        self._next_sweep = 0.0
+        # Size of the directory at the last sweep plus the bytes written since.
+        self._approx_bytes = 0
+
+    def _path(self, key: Hashable) -> Path:
+        digest = hashlib.sha256(str(key).encode("utf-8")).hexdigest()
+        return self.directory / (
+            f"{digest}.json.gz" if self.compress else f"{digest}.json"
+        )
+
+    def get(self, key: Hashable) -> tuple[Any, float]:
+        """Return ``(value, expires_at)`` or ``(_MISSING, 0)``."""
+        path = self._path(key)
+        try:
+            with self._open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return _MISSING, 0.0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return _MISSING, 0.0
+        if entry.get("expires_at", 0) <= time.time():
+            path.unlink(missing_ok=True)
+            return _MISSING, 0.0
+        return entry.get("value"), entry["expires_at"]
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        path = self._path(key)
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with self._open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(
+                    {"expires_at": expires_at, "value": value}, f, ensure_ascii=False
+                )
+            os.utime(tmp_path, (expires_at, expires_at))
+            size = tmp_path.stat().st_size
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"Failed to persist cache entry {path}: {e}")
+            return
+        self._approx_bytes += size
+        self._maybe_sweep()
+
+    def delete(self, key: Hashable) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def _maybe_sweep(self) -> None:
+        over_limit = self.max_bytes is not None and self._approx_bytes > self.max_bytes
+        if not over_limit and time.time() < self._next_sweep:
+            return
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self.sweep()
+        finally:
+            self._sweep_lock.release()
+
+    def sweep(self) -> None:
+        """Delete expired entries, then the soonest-expiring ones over ``max_bytes``."""
+        now = time.time()
+        entries = []
+        for path in self.directory.glob("*.json*"):
+            if path.name.endswith(".tmp"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime <= now:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if self.max_bytes is not None and total > self.max_bytes:
+            entries.sort(key=lambda entry: entry[0])
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+        self._approx_bytes = total
+        self._next_sweep = now + self.sweep_interval
+
+
+class SQLiteCacheStore:
+    """
+    Stores JSON-serializable cache entries in a single SQLite table.
+
+    Suited to many small entries (e.g. LLM responses) that several worker
+    processes should share.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return hashlib.sha256(str(key).encode("utf-8")).hexdigest()
+
+    def get(self, key: Hashable) -> tuple[Any, float]:
+        """Return ``(value, expires_at)`` or ``(_MISSING, 0)``."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?",
+                (self._key(key),),
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            return _MISSING, 0.0
+        try:
+            return json.loads(row[0]), row[1]
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable cache entry in {self.path}: {e}")
+            return _MISSING, 0.0
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?)",
+                    (self._key(key), payload, expires_at),
+                )
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)
+                )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Failed to persist cache entry in {self.path}: {e}")
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE key = ?", (self._key(key),)
+            )
+
+
+class _InFlight:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after ``ttl_seconds``.
+
+    Args:
+        ttl_seconds: Lifetime of an entry. ``0`` disables caching entirely while
+            still coalescing concurrent identical calls.
+        max_entries: Maximum number of in-memory entries before the least
+            recently used one is evicted.
+        disk_store: Optional persistent store consulted on in-memory misses.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        max_entries: int = 1024,
+        disk_store: Optional[Union[DiskCacheStore, SQLiteCacheStore]] = None,
+        name: str = "cache",
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.disk_store = disk_store
+        self.name = name
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, _InFlight] = {}
+        self._async_inflight: dict[Hashable, asyncio.Future] = {}
+
+    @classmethod
+    def from_env(
+        cls,
+        prefix: str,
+        ttl_seconds: float = 3600,
+        max_entries: int = 1024,
+        directory: Optional[str] = None,
+        compress: bool = False,
+        dir_max_bytes: Optional[int] = None,
+    ) -> "TTLCache":
+        """
+        Build a cache configured by ``{prefix}_TTL_SECONDS``,
+        ``{prefix}_MAX_ENTRIES``, ``{prefix}_DIR`` and ``{prefix}_DIR_MAX_BYTES``
+        environment variables. Setting ``{prefix}_DIR`` to an empty string
+        disables the disk store.
+        """
+        ttl = os.getenv(f"{prefix}_TTL_SECONDS")
+        size = os.getenv(f"{prefix}_MAX_ENTRIES")
+        directory = os.getenv(f"{prefix}_DIR", directory)
+        max_bytes = os.getenv(f"{prefix}_DIR_MAX_BYTES")
+        return cls(
+            ttl_seconds=float(ttl) if ttl else ttl_seconds,
+            max_entries=int(size) if size else max_entries,
+            disk_store=(
+                DiskCacheStore(
+                    directory,
+                    compress=compress,
+                    max_bytes=int(max_bytes) if max_bytes else dir_max_bytes,
+                )
+                if directory
+                else None
+            ),
+            name=prefix.lower(),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup_locked(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+        return _MISSING
+
+    def _store_locked(self, key: Hashable, value: Any, expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _lookup(self, key: Hashable) -> Any:
+        if not self.enabled:
+            return _MISSING
+        with self._lock:
+            value = self._lookup_locked(key)
+        if value is _MISSING and self.disk_store is not None:
+            value, expires_at = self.disk_store.get(key)
+            if value is not _MISSING:
+                with self._lock:
+                    self._store_locked(key, value, expires_at)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._lookup(key)
+        with self._lock:
+            if value is _MISSING:
+                self.stats.misses += 1
+                return default
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store_locked(key, value, expires_at)
+        if self.disk_store is not None:
+            self.disk_store.set(key, value, expires_at)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk_store is not None:
+            self.disk_store.delete(key)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = CacheStats()
+
+    def stats_snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                **asdict(self.stats),
+                "hit_rate": self.stats.hit_rate,
+            }
+
+    def _store_result(
+        self,
+        key: Hashable,
+        value: Any,
+        should_cache: Optional[Callable[[Any], bool]],
+    ) -> None:
+        if should_cache is None or should_cache(value):
+            self.set(key, value)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return the cached value for ``key`` or compute it once.
+
+        Concurrent callers missing on the same key wait for the first caller's
+        result instead of computing it again. ``should_cache`` can veto caching
+        of a computed value (e.g. an error payload).
+        """
+        value = self._lookup(key)
+        with self._lock:
+            if value is not _MISSING:
+                self.stats.hits += 1
+                return value
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlight()
+                self._inflight[key] = call
+                self.stats.misses += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+            self._store_result(key, call.value, should_cache)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    async def aget_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Async counterpart of :meth:`get_or_compute`.
+
+        If the computing caller is cancelled, the callers waiting for it try
+        again, and one of them computes the value instead.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            value = self._lookup(key)
+            with self._lock:
+                if value is not _MISSING:
+                    self.stats.hits += 1
+                    return value
+                future = self._async_inflight.get(key)
+                leader = future is None or future.get_loop() is not loop
+                if leader:
+                    future = loop.create_future()
+                    self._async_inflight[key] = future
+                    self.stats.misses += 1
+                else:
+                    self.stats.coalesced += 1
+
+            if leader:
+                return await self._alead(key, future, compute, should_cache)
+            value = await asyncio.shield(future)
+            if value is not _RETRY:
+                return value
+
+    async def _alead(
+        self,
+        key: Hashable,
+        future: asyncio.Future,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Optional[Callable[[Any], bool]],
+    ) -> Any:
+        try:
+            value = await compute()
+            self._store_result(key, value, should_cache)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.set_result(_RETRY)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting.
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                if self._async_inflight.get(key) is future:
+                    del self._async_inflight[key]
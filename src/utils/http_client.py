@@ -0,0 +1,196 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Shared HTTP client for all outbound integrations.
+
+A single keep-alive connection pool is reused by every caller so that TCP and
+TLS handshakes are paid once per host instead of once per request. HTTP/2 is
+enabled when the optional ``h2`` package is installed, and the number of
+in-flight requests per host is bounded to avoid overwhelming upstream APIs.
+
+Both a sync (``get``/``post``/``request``) and an async
+(``aget``/``apost``/``arequest``) interface are provided.
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _build_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        _env_float("HTTP_TIMEOUT_SECONDS", 60.0),
+        connect=_env_float("HTTP_CONNECT_TIMEOUT_SECONDS", 10.0),
+    )
+
+
+def _build_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_env_int("HTTP_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=_env_int("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20),
+        keepalive_expiry=_env_float("HTTP_KEEPALIVE_EXPIRY_SECONDS", 60.0),
+    )
+
+
+def _client_kwargs() -> dict[str, Any]:
+    return {
+        "timeout": _build_timeout(),
+        "limits": _build_limits(),
+        "http2": HTTP2_AVAILABLE,
+        "follow_redirects": True,
+        "trust_env": True,
+    }
+
+
+def _max_concurrency_per_host() -> int:
+    return _env_int("HTTP_MAX_CONCURRENCY_PER_HOST", 10)
+
+
+def _host_of(url: str) -> str:
+    return urlsplit(str(url)).netloc.lower()
+
+
+def _normalize_body(kwargs: dict[str, Any], data: Any) -> None:
+    # httpx expects raw payloads as ``content``; keep accepting the
+    # requests-style ``data`` argument for pre-serialized bodies.
+    if data is None:
+        return
+    if isinstance(data, (str, bytes)):
+        kwargs["content"] = data
+    else:
+        kwargs["data"] = data
+
+
+_lock = threading.Lock()
+_sync_client: Optional[httpx.Client] = None
+_sync_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+# httpx.AsyncClient connections are bound to the event loop that opened them,
+# so async clients and semaphores are kept per loop.
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+) = weakref.WeakKeyDictionary()
+_async_host_semaphores: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]"
+) = weakref.WeakKeyDictionary()
+
+
+def get_client() -> httpx.Client:
+    """Return the process-wide pooled sync client."""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        with _lock:
+            if _sync_client is None or _sync_client.is_closed:
+                _sync_client = httpx.Client(**_client_kwargs())
+                logger.debug(f"Created shared HTTP client (http2={HTTP2_AVAILABLE})")
+    return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the pooled async client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**_client_kwargs())
+        _async_clients[loop] = client
+        logger.debug(f"Created shared async HTTP client (http2={HTTP2_AVAILABLE})")
+    return client
+
+
+@contextmanager
+def _host_slot(url: str):
+    host = _host_of(url)
+    with _lock:
+        semaphore = _sync_host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(_max_concurrency_per_host())
+            _sync_host_semaphores[host] = semaphore
+    with semaphore:
+        yield
+
+
+@asynccontextmanager
+async def _async_host_slot(url: str):
+    loop = asyncio.get_running_loop()
+    semaphores = _async_host_semaphores.setdefault(loop, {})
+    host = _host_of(url)
+    semaphore = semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_max_concurrency_per_host())
+        semaphores[host] = semaphore
+    async with semaphore:
+        yield
+
+
+def request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Send a request through the shared sync connection pool."""
+    with _host_slot(url):
+        return get_client().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs: Any) -> httpx.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, data: Any = None, **kwargs: Any) -> httpx.Response:
+    _normalize_body(kwargs, data)
+    return request("POST", url, **kwargs)
+
+
+async def arequest(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Send a request through the shared async connection pool."""
+    async with _async_host_slot(url):
+        return await get_async_client().request(method, url, **kwargs)
+
+
+async def aget(url: str, **kwargs: Any) -> httpx.Response:
+    return await arequest("GET", url, **kwargs)
+
+
+async def apost(url: str, data: Any = None, **kwargs: Any) -> httpx.Response:
+    _normalize_body(kwargs, data)
+    return await arequest("POST", url, **kwargs)
+
+
+def close() -> None:
+    """Close the shared sync client; a new one is created on next use."""
+    global _sync_client
+    with _lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+
+
+async def aclose() -> None:
+    """Close the async client bound to the running event loop."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+atexit.register(close)
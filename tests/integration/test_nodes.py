@@ -1,11 +1,15 @@
+import asyncio
 import json
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 # 在这里 mock 掉 get_llm_by_type，避免 ValueError
 with patch("src.llms.llm.get_llm_by_type", return_value=MagicMock()):
     from langgraph.types import Command
-    from src.graph.nodes import background_investigation_node
+    from src.graph.nodes import (
+        background_investigation_node,
+        background_investigation_node_async,
+    )
     from src.config import SearchEngine
     from langchain_core.messages import HumanMessage
 
@@ -122,3 +126,23 @@ def test_background_investigation_node_malformed_response(
         # Parse and verify the JSON content
         results = result["background_investigation_results"]
         assert json.loads(results) is None
+
+
+def test_background_investigation_node_async(
+    mock_state, mock_tavily_search, patch_config_from_runnable_config, mock_config
+):
+    """Test the async background_investigation_node awaits the search"""
+    with patch("src.graph.nodes.SELECTED_SEARCH_ENGINE", SearchEngine.TAVILY.value):
+        instance = mock_tavily_search.return_value
+        instance.ainvoke = AsyncMock(return_value=MOCK_SEARCH_RESULTS)
+
+        result = asyncio.run(
+            background_investigation_node_async(mock_state, mock_config)
+        )
+
+        instance.ainvoke.assert_awaited_once_with("test query")
+        instance.invoke.assert_not_called()
+        assert (
+            result["background_investigation_results"]
+            == "## Test Title 1\n\nTest Content 1\n\n## Test Title 2\n\nTest Content 2"
+        )
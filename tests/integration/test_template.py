@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import pytest
+from src.prompts import template as template_module
 from src.prompts.template import get_prompt_template, apply_prompt_template
 
 
@@ -143,3 +144,48 @@ def test_apply_prompt_template_reporter():
     messages_cn = apply_prompt_template("reporter", test_state_social_media_cn)
     system_content_cn = messages_cn[0]["content"]
     assert "小红书" in system_content_cn
+
+
+def test_templates_are_precompiled_with_their_variables():
+    compiled = template_module.get_compiled_prompt("researcher")
+    assert compiled.variables == {"CURRENT_TIME", "locale", "resources"}
+    assert compiled.deferred == {"CURRENT_TIME"}
+
+
+def test_renders_are_memoized_by_referenced_variables(monkeypatch):
+    renders = []
+    compiled = template_module.get_compiled_prompt("coordinator")
+    original = compiled.template.render
+
+    def render(**variables):
+        renders.append(variables)
+        return original(**variables)
+
+    monkeypatch.setattr(compiled.template, "render", render)
+    template_module._renders.clear()
+    for task in ("first task", "second task"):
+        apply_prompt_template("coordinator", {"messages": [], "task": task})
+    # ``task`` isn't referenced by the coordinator prompt, and CURRENT_TIME is
+    # substituted after rendering
+    assert len(renders) == 1
+    assert "task" not in renders[0]
+
+
+def test_current_time_is_substituted_into_cached_renders(monkeypatch):
+    class FixedDatetime:
+        value = "Mon Jan 01 2024 12:00:00 "
+
+        @classmethod
+        def now(cls):
+            return cls
+
+        @classmethod
+        def strftime(cls, fmt):
+            return cls.value
+
+    monkeypatch.setattr(template_module, "datetime", FixedDatetime)
+    first = apply_prompt_template("coder", {"messages": []})[0]["content"]
+    FixedDatetime.value = "Tue Jan 02 2024 12:00:00 "
+    second = apply_prompt_template("coder", {"messages": []})[0]["content"]
+    assert "Mon Jan 01 2024" in first and "Tue Jan 02 2024" in second
+    assert "\x00" not in second
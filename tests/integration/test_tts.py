@@ -45,7 +45,7 @@ class TestVolcengineTTS:
         assert tts.host == "openspeech.bytedance.com"
         assert tts.api_url == "https://openspeech.bytedance.com/api/v1/tts"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     def test_text_to_speech_success(self, mock_post):
         """Test successful text-to-speech conversion."""
         # Mock response
@@ -88,7 +88,7 @@ class TestVolcengineTTS:
         assert request_json["audio"]["encoding"] == "mp3"
         assert request_json["request"]["text"] == "Hello, world!"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     def test_text_to_speech_api_error(self, mock_post):
         """Test error handling when API returns an error."""
         # Mock response
@@ -114,7 +114,7 @@ class TestVolcengineTTS:
         assert result["error"] == {"code": 400, "message": "Bad request"}
         assert result["audio_data"] is None
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     def test_text_to_speech_no_data(self, mock_post):
         """Test error handling when API response doesn't contain data."""
         # Mock response
@@ -141,7 +141,7 @@ class TestVolcengineTTS:
         assert result["error"] == "No audio data returned"
         assert result["audio_data"] is None
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     def test_text_to_speech_with_custom_parameters(self, mock_post):
         """Test text_to_speech with custom parameters."""
         # Mock response
@@ -192,7 +192,7 @@ class TestVolcengineTTS:
         assert request_json["request"]["frontend_type"] == "custom"
         assert request_json["user"]["uid"] == "custom-uid"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.http_client.post")
     @patch("src.tools.tts.uuid.uuid4")
     def test_text_to_speech_auto_generated_uid(self, mock_uuid, mock_post):
         """Test that UUID is auto-generated if not provided."""
@@ -0,0 +1,67 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.tools import tool
+
+from src.agents import agents
+from src.graph import nodes
+
+
+@tool
+def lookup(query: str) -> str:
+    """Look something up."""
+    return query
+
+
+@tool
+def calculate(expression: str) -> str:
+    """Calculate an expression."""
+    return expression
+
+
+class FakeAgentModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+@pytest.fixture(autouse=True)
+def model(monkeypatch):
+    model = FakeAgentModel(messages=iter([]))
+    monkeypatch.setattr(agents, "get_llm_by_type", lambda llm_type: model)
+    agents.clear_agent_cache()
+    yield model
+    agents.clear_agent_cache()
+
+
+def test_agents_with_the_same_tools_are_reused():
+    first = agents.create_agent("researcher", "researcher", [lookup], "researcher")
+    again = agents.create_agent("researcher", "researcher", [lookup], "researcher")
+    assert again is first
+
+
+def test_agents_with_other_tools_or_types_are_built():
+    first = agents.create_agent("researcher", "researcher", [lookup], "researcher")
+    assert first is not agents.create_agent(
+        "researcher", "researcher", [lookup, calculate], "researcher"
+    )
+    assert first is not agents.create_agent("coder", "coder", [lookup], "coder")
+
+
+def test_agent_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(agents, "AGENT_CACHE_MAX_SIZE", 1)
+    first = agents.create_agent("researcher", "researcher", [lookup], "researcher")
+    agents.create_agent("coder", "coder", [calculate], "coder")
+    assert len(agents._agent_cache) == 1
+    assert first is not agents.create_agent(
+        "researcher", "researcher", [lookup], "researcher"
+    )
+
+
+def test_annotated_mcp_tools_are_memoized():
+    annotated = nodes._annotated_mcp_tool(lookup, "search-server")
+    assert annotated is not lookup
+    assert annotated.description.startswith("Powered by 'search-server'.")
+    assert lookup.description == "Look something up."
+    assert nodes._annotated_mcp_tool(lookup, "search-server") is annotated
@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import threading
+import time
+
+import pytest
+
+from src.crawler import Article, CrawlCache, Crawler, canonicalize_url
+from src.utils.cache import DiskCacheStore, TTLCache
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTPS://Example.COM:443/a?b=2&a=1#frag", "https://example.com/a?a=1&b=2"),
+        ("http://example.com", "http://example.com/"),
+        ("http://example.com:8080/x", "http://example.com:8080/x"),
+        (
+            "https://example.com/p?utm_source=x&id=3&gclid=y",
+            "https://example.com/p?id=3",
+        ),
+    ],
+)
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    class DummyJinaClient:
+        def crawl(self, url, return_format=None):
+            calls.append(url)
+            time.sleep(0.05)
+            return f"<html>{url}</html>"
+
+    class DummyReadabilityExtractor:
+        def extract_article(self, html):
+            return Article(title="Title", html_content=html)
+
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
+    )
+    return calls
+
+
+def test_cached_crawler_reuses_articles_across_url_spellings(fetches):
+    crawler = Crawler(cache=CrawlCache(TTLCache()))
+    first = crawler.crawl("https://example.com/a#intro")
+    second = crawler.crawl("https://EXAMPLE.com/a?utm_medium=mail")
+
+    assert fetches == ["https://example.com/a#intro"]
+    assert second.html_content == first.html_content
+    assert second.url == "https://EXAMPLE.com/a?utm_medium=mail"
+    assert second is not first
+
+
+def test_concurrent_crawls_of_one_url_fetch_once(fetches):
+    crawler = Crawler(cache=CrawlCache(TTLCache()))
+    threads = [
+        threading.Thread(target=crawler.crawl, args=("https://example.com/",))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetches == ["https://example.com/"]
+
+
+def test_articles_are_persisted_compressed(fetches, tmp_path):
+    def new_crawler():
+        store = DiskCacheStore(tmp_path, compress=True)
+        return Crawler(cache=CrawlCache(TTLCache(disk_store=store)))
+
+    new_crawler().crawl("https://example.com/")
+    article = new_crawler().crawl("https://example.com/")
+
+    assert fetches == ["https://example.com/"]
+    assert article.title == "Title"
+    assert [path.suffix for path in tmp_path.iterdir()] == [".gz"]
+
+
+def test_empty_articles_are_not_cached(monkeypatch):
+    calls = []
+
+    class EmptyJinaClient:
+        def crawl(self, url, return_format=None):
+            calls.append(url)
+            return ""
+
+    class EmptyReadabilityExtractor:
+        def extract_article(self, html):
+            return Article(title=None, html_content=None)
+
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", EmptyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", EmptyReadabilityExtractor
+    )
+    crawler = Crawler(cache=CrawlCache(TTLCache()))
+    crawler.crawl("https://example.com/")
+    crawler.crawl("https://example.com/")
+    assert len(calls) == 2
+
+
+def test_disk_cache_is_opt_in_and_bounded(monkeypatch, tmp_path):
+    monkeypatch.delenv("CRAWL_CACHE_DIR", raising=False)
+    assert CrawlCache.from_env().cache.disk_store is None
+
+    monkeypatch.setenv("CRAWL_CACHE_DIR", str(tmp_path))
+    store = CrawlCache.from_env().cache.disk_store
+    assert store.compress
+    assert store.max_bytes == 256 * 1024 * 1024
@@ -0,0 +1,81 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from src.crawler import Article
+from src.crawler import excerpt
+from src.crawler.excerpt import OMISSION_MARKER, estimate_tokens, markdown_excerpt
+from src.tools import crawl as crawl_module
+
+HTML = (
+    "<div><h1>Intro</h1><p>"
+    + "general words " * 50
+    + "</p><h2>Diet</h2><p>"
+    + "giant panda bamboo diet " * 30
+    + "</p><h2>Sleep</h2><p>"
+    + "cats sleep " * 80
+    + "</p></div>"
+)
+
+
+def test_excerpt_respects_the_token_budget():
+    result = markdown_excerpt(HTML, 50)
+    assert estimate_tokens(result) <= 52
+    assert result.startswith("Intro")
+    assert result.endswith(OMISSION_MARKER)
+
+
+def test_excerpt_stops_converting_once_the_budget_is_spent(monkeypatch):
+    converted = []
+
+    def fake_md(html):
+        converted.append(html)
+        return html
+
+    monkeypatch.setattr(excerpt, "md", fake_md)
+    markdown_excerpt(HTML, 10)
+    # Only the first chunk (the heading and its paragraph) is converted.
+    assert converted[0] == "<h1>Intro</h1>"
+    assert len(converted) == 2
+
+
+def test_excerpt_prefers_chunks_relevant_to_the_query():
+    result = markdown_excerpt(HTML, 200, query="What is the giant panda diet?")
+    assert "bamboo" in result
+    assert "cats sleep" not in result
+
+
+def test_non_contiguous_chunks_are_marked():
+    html = "<h1>A</h1><p>alpha</p><h1>B</h1><p>beta</p><h1>C</h1><p>alpha again</p>"
+    result = markdown_excerpt(html, 1000, query="alpha")
+    assert result.count("alpha") == 2
+    assert "beta" in result
+
+    result = markdown_excerpt(html, 6, query="alpha")
+    assert "beta" not in result
+    assert OMISSION_MARKER in result
+
+
+def test_article_excerpt_includes_title():
+    article = Article("Title", "<p>body</p>")
+    assert article.to_markdown_excerpt(100) == "# Title\n\nbody"
+
+
+def test_crawl_tool_uses_the_current_step_as_query(monkeypatch):
+    class StubCrawler:
+        def crawl(self, url):
+            article = Article("Pandas", HTML)
+            article.url = url
+            return article
+
+    monkeypatch.setattr(crawl_module, "get_crawler", lambda: StubCrawler())
+    monkeypatch.setenv("CRAWL_MAX_TOKENS", "200")
+
+    async def crawl_for_step():
+        crawl_module.crawl_relevance_query.set("giant panda diet")
+        return crawl_module.crawl_tool.invoke({"url": "https://example.com"})
+
+    content = asyncio.run(crawl_for_step())["crawled_content"]
+    assert "bamboo" in content
+    assert "cats sleep" not in content
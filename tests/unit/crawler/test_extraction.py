@@ -0,0 +1,82 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from concurrent.futures import Future
+
+import pytest
+
+from src.crawler import extraction
+from src.crawler.article import Article
+from src.crawler.readability_extractor import ReadabilityExtractor
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def fake_extract(html, use_readability=True):
+        calls.append(use_readability)
+        return {"title": "Title", "content": html}
+
+    monkeypatch.setattr(extraction, "extract_article_data", fake_extract)
+    monkeypatch.setenv("CRAWLER_INLINE_EXTRACTION_MAX_BYTES", "10")
+    return calls
+
+
+def test_small_pages_use_the_inline_fast_path(calls, monkeypatch):
+    monkeypatch.setattr(extraction, "_get_pool", pytest.fail)
+    assert extraction.extract("<p>x</p>")["content"] == "<p>x</p>"
+    assert calls == [False]
+
+
+def test_large_pages_are_dispatched_to_the_pool(calls, monkeypatch):
+    monkeypatch.setenv("CRAWLER_EXTRACTION_WORKERS", "2")
+    submitted = []
+
+    class FakePool:
+        def submit(self, fn, html):
+            submitted.append(html)
+            future = Future()
+            future.set_result(fn(html))
+            return future
+
+    monkeypatch.setattr(extraction, "_get_pool", lambda workers: FakePool())
+    html = "<p>" + "x" * 100 + "</p>"
+    assert extraction.extract(html)["content"] == html
+    assert submitted == [html]
+    assert calls == [True]
+
+
+def test_disabled_pool_extracts_inline_with_readability(calls, monkeypatch):
+    monkeypatch.setenv("CRAWLER_EXTRACTION_WORKERS", "0")
+    monkeypatch.setattr(extraction, "_get_pool", pytest.fail)
+    extraction.extract("<p>" + "x" * 100 + "</p>")
+    assert calls == [True]
+
+
+def test_readability_extractor_fast_path_extracts_content():
+    html = "<html><head><title>Hello</title></head><body><p>World</p></body></html>"
+    article = ReadabilityExtractor().extract_article(html)
+    assert article.title == "Hello"
+    assert "World" in article.html_content
+
+
+def test_pages_are_measured_in_bytes(calls, monkeypatch):
+    monkeypatch.setenv("CRAWLER_EXTRACTION_WORKERS", "0")
+    # 5 characters, 15 bytes
+    extraction.extract("\u00e9t\u00e9\u6f22\u5b57\u6587")
+    assert calls == [True]
+
+
+def test_markdown_is_converted_by_the_extraction():
+    html = "<html><head><title>Hello</title></head><body><p>World</p></body></html>"
+    article = ReadabilityExtractor().extract_article(html)
+    assert "World" in article.markdown
+
+
+def test_converted_markdown_is_reused(monkeypatch):
+    monkeypatch.setattr("src.crawler.article.md", pytest.fail)
+    article = Article.from_dict(
+        Article("Title", "<p>body</p>", markdown="body").to_dict()
+    )
+    assert article.to_markdown() == "# Title\n\nbody"
@@ -0,0 +1,139 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+from langgraph.types import Send
+
+from src.graph.builder import continue_to_running_research_team, get_next_step_indexes
+from src.graph.nodes import research_team_node
+from src.graph.types import merge_step_results
+from src.prompts.planner_model import Plan, Step, StepType
+
+
+def _step(title, step_type=StepType.RESEARCH, execution_res=None, depends_on=[]):
+    return Step(
+        need_search=step_type == StepType.RESEARCH,
+        title=title,
+        description=f"{title} description",
+        step_type=step_type,
+        depends_on=depends_on,
+        execution_res=execution_res,
+    )
+
+
+def _plan(*steps):
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="thought",
+        title="title",
+        steps=list(steps),
+    )
+
+
+def _config(max_parallel_steps=3):
+    return {"configurable": {"max_parallel_steps": max_parallel_steps}}
+
+
+def test_independent_research_steps_run_together():
+    plan = _plan(_step("a"), _step("b"), _step("c"))
+    assert get_next_step_indexes(plan, 3) == [0, 1, 2]
+
+
+def test_concurrency_cap_is_respected():
+    plan = _plan(_step("a"), _step("b"), _step("c"))
+    assert get_next_step_indexes(plan, 2) == [0, 1]
+    assert get_next_step_indexes(plan, 1) == [0]
+
+
+def test_dependent_step_waits_for_previous_steps():
+    plan = _plan(
+        _step("a"),
+        _step("b"),
+        _step("c", StepType.PROCESSING, depends_on=[0, 1]),
+        _step("d"),
+    )
+    assert get_next_step_indexes(plan, 5) == [0, 1, 3]
+
+    plan.steps[0].execution_res = "done"
+    assert get_next_step_indexes(plan, 5) == [1, 3]
+
+    plan.steps[1].execution_res = "done"
+    assert get_next_step_indexes(plan, 5) == [2, 3]
+
+
+def test_steps_without_declared_dependencies_run_sequentially():
+    plan = _plan(
+        _step("a", depends_on=None),
+        _step("b", depends_on=None),
+        _step("c", depends_on=None),
+    )
+    assert get_next_step_indexes(plan, 3) == [0]
+
+    plan.steps[0].execution_res = "done"
+    assert get_next_step_indexes(plan, 3) == [1]
+
+
+def test_ready_steps_are_not_blocked_by_waiting_steps():
+    plan = _plan(
+        _step("a"),
+        _step("b", depends_on=[0]),
+        _step("c"),
+    )
+    assert get_next_step_indexes(plan, 3) == [0, 2]
+
+
+def test_continue_to_running_research_team_fans_out():
+    plan = _plan(
+        _step("a", execution_res="done"),
+        _step("b"),
+        _step("c"),
+    )
+    sends = continue_to_running_research_team({"current_plan": plan}, _config())
+    assert all(isinstance(send, Send) for send in sends)
+    assert [send.node for send in sends] == ["researcher", "researcher"]
+    assert [send.arg["current_step_index"] for send in sends] == [1, 2]
+
+
+def test_continue_to_running_research_team_routes_code_generation_to_coder():
+    plan = _plan(_step("a", StepType.CODE_GENERATION))
+    sends = continue_to_running_research_team({"current_plan": plan}, _config())
+    assert [send.node for send in sends] == ["coder"]
+
+
+@pytest.mark.parametrize(
+    "plan",
+    [None, _plan(), _plan(_step("a", execution_res="done"))],
+)
+def test_continue_to_running_research_team_returns_to_planner(plan):
+    assert (
+        continue_to_running_research_team({"current_plan": plan}, _config())
+        == "planner"
+    )
+
+
+def test_merge_step_results():
+    assert merge_step_results({0: "a"}, {1: "b"}) == {0: "a", 1: "b"}
+    assert merge_step_results({0: "a"}, None) == {}
+
+
+def test_research_team_node_folds_results_in_step_order():
+    plan = _plan(_step("a"), _step("b"), _step("c"))
+    update = research_team_node(
+        {
+            "current_plan": plan,
+            "observations": ["earlier"],
+            "step_results": {2: "result c", 0: "result a"},
+        }
+    )
+    assert update["observations"] == ["earlier", "result a", "result c"]
+    assert update["step_results"] is None
+    assert [step.execution_res for step in plan.steps] == [
+        "result a",
+        None,
+        "result c",
+    ]
+
+
+def test_research_team_node_without_results():
+    assert research_team_node({"current_plan": _plan(_step("a"))}) is None
@@ -0,0 +1,104 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import operator
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, Send, interrupt
+
+from src.graph.checkpointer import SQLiteSaver, TTLMemorySaver, build_checkpointer
+
+
+class _State(TypedDict):
+    items: list[int]
+    results: Annotated[list[int], operator.add]
+    answer: str
+
+
+def _fan_out(state: _State):
+    return [Send("double", {"value": item}) for item in state["items"]]
+
+
+def _double(state: dict):
+    return {"results": [state["value"] * 2]}
+
+
+def _ask(state: _State):
+    return {"answer": interrupt("confirm?")}
+
+
+def _build_graph(checkpointer):
+    builder = StateGraph(_State)
+    builder.add_node("double", _double)
+    builder.add_node("ask", _ask)
+    builder.add_conditional_edges(START, _fan_out, ["double"])
+    builder.add_edge("double", "ask")
+    builder.add_edge("ask", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def _config(thread_id="thread-1"):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_sqlite_saver_persists_state_across_instances(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    graph = _build_graph(SQLiteSaver(path))
+    graph.invoke({"items": [1, 2, 3], "results": []}, _config())
+
+    # A new saver on the same file resumes the interrupted thread
+    graph = _build_graph(SQLiteSaver(path))
+    result = graph.invoke(Command(resume="yes"), _config())
+    assert sorted(result["results"]) == [2, 4, 6]
+    assert result["answer"] == "yes"
+    assert len(list(graph.checkpointer.list(_config()))) > 1
+
+
+def test_sqlite_saver_async_api(tmp_path):
+    graph = _build_graph(SQLiteSaver(str(tmp_path / "checkpoints.sqlite")))
+
+    async def run():
+        await graph.ainvoke({"items": [5], "results": []}, _config())
+        return await graph.ainvoke(Command(resume="ok"), _config())
+
+    result = asyncio.run(run())
+    assert result["results"] == [10]
+
+
+def test_sqlite_saver_keep_last_and_ttl(tmp_path):
+    saver = SQLiteSaver(
+        str(tmp_path / "checkpoints.sqlite"), keep_last=2, ttl_seconds=60
+    )
+    graph = _build_graph(saver)
+    graph.invoke({"items": [1, 2], "results": []}, _config())
+    assert len(list(saver.list(_config()))) == 2
+
+    assert saver.evict_expired_threads(force=True) == []
+    saver.ttl_seconds = -1
+    assert saver.evict_expired_threads(force=True) == ["thread-1"]
+    assert saver.get_tuple(_config()) is None
+
+
+def test_ttl_memory_saver_evicts_idle_threads():
+    saver = TTLMemorySaver(ttl_seconds=-1)
+    graph = _build_graph(saver)
+    graph.invoke({"items": [1], "results": []}, _config())
+    assert saver.get_tuple(_config()) is not None
+    assert saver.evict_expired_threads(force=True) == ["thread-1"]
+    assert saver.get_tuple(_config()) is None
+
+
+def test_build_checkpointer(monkeypatch, tmp_path):
+    monkeypatch.delenv("CHECKPOINTER", raising=False)
+    assert isinstance(build_checkpointer(), TTLMemorySaver)
+
+    monkeypatch.setenv("CHECKPOINTER", "sqlite")
+    monkeypatch.setenv("CHECKPOINTER_SQLITE_PATH", str(tmp_path / "db" / "cp.sqlite"))
+    assert isinstance(build_checkpointer(), SQLiteSaver)
+
+    monkeypatch.setenv("CHECKPOINTER", "unknown")
+    with pytest.raises(ValueError):
+        build_checkpointer()
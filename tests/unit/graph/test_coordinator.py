@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.graph import nodes
+
+HANDOFF = AIMessage(
+    content="",
+    tool_calls=[
+        {
+            "name": "handoff_to_planner",
+            "args": {"task_title": "pandas", "locale": "en-US"},
+            "id": "call-1",
+        }
+    ],
+)
+GREETING = AIMessage(content="Hello!")
+
+
+class FakeCoordinatorModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+@pytest.fixture
+def search(monkeypatch):
+    calls = []
+
+    async def background_investigation(state, config):
+        calls.append(state["messages"][-1].content)
+        await asyncio.sleep(0.05)
+        return {"background_investigation_results": "pandas eat bamboo"}
+
+    monkeypatch.setattr(
+        nodes, "background_investigation_node_async", background_investigation
+    )
+    monkeypatch.setenv("SPECULATIVE_BACKGROUND_INVESTIGATION", "true")
+    return calls
+
+
+def _run(monkeypatch, reply):
+    model = FakeCoordinatorModel(messages=iter([reply]))
+    monkeypatch.setattr(nodes, "get_llm_by_type", lambda llm_type: model)
+    state = {
+        "messages": [HumanMessage(content="What do pandas eat?")],
+        "enable_background_investigation": True,
+    }
+    return asyncio.run(nodes.coordinator_node_async(state, {}))
+
+
+def test_speculative_search_goes_straight_to_the_planner(monkeypatch, search):
+    command = _run(monkeypatch, HANDOFF)
+    assert search == ["What do pandas eat?"]
+    assert command.goto == "planner"
+    assert command.update["background_investigation_results"] == "pandas eat bamboo"
+    assert command.update["locale"] == "en-US"
+
+
+def test_speculative_search_is_discarded_when_the_conversation_ends(
+    monkeypatch, search
+):
+    command = _run(monkeypatch, GREETING)
+    assert command.goto == "__end__"
+    assert "background_investigation_results" not in command.update
+
+
+def test_without_speculation_the_investigator_node_runs(monkeypatch, search):
+    monkeypatch.setenv("SPECULATIVE_BACKGROUND_INVESTIGATION", "false")
+    command = _run(monkeypatch, HANDOFF)
+    assert search == []
+    assert command.goto == "background_investigator"
+
+
+def test_speculative_search_is_cancelled_when_the_coordinator_fails(monkeypatch):
+    cancelled = []
+
+    async def background_investigation(state, config):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    def broken_command(state, configurable, response):
+        raise ValueError("bad response")
+
+    monkeypatch.setattr(
+        nodes, "background_investigation_node_async", background_investigation
+    )
+    monkeypatch.setattr(nodes, "_coordinator_command", broken_command)
+    monkeypatch.setenv("SPECULATIVE_BACKGROUND_INVESTIGATION", "true")
+    model = FakeCoordinatorModel(messages=iter([HANDOFF]))
+    monkeypatch.setattr(nodes, "get_llm_by_type", lambda llm_type: model)
+    state = {
+        "messages": [HumanMessage(content="What do pandas eat?")],
+        "enable_background_investigation": True,
+    }
+
+    async def run():
+        with pytest.raises(ValueError):
+            await nodes.coordinator_node_async(state, {})
+        await asyncio.sleep(0.01)
+        # Checked while the loop runs, as asyncio.run cancels leftover tasks
+        assert cancelled == [True]
+
+    asyncio.run(run())
@@ -0,0 +1,51 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from langchain_core.language_models import FakeListChatModel
+
+from src.graph import observations as observations_module
+from src.graph.observations import acompact_observations, compact_observations
+
+
+def _use_model(monkeypatch, responses):
+    model = FakeListChatModel(responses=responses)
+    monkeypatch.setattr(observations_module, "get_llm_by_type", lambda _: model)
+    return model
+
+
+def test_observations_within_budget_are_untouched(monkeypatch):
+    _use_model(monkeypatch, [])
+    observations = ["short finding", "another finding"]
+    assert compact_observations(observations, 1000) is observations
+
+
+def test_only_oversized_observations_are_summarized(monkeypatch):
+    _use_model(monkeypatch, ["summary of the long step"])
+    observations = ["short finding", "long finding " * 400]
+    compacted = compact_observations(observations, 500)
+    assert compacted == ["short finding", "summary of the long step"]
+
+
+def test_summaries_keep_their_citations(monkeypatch):
+    _use_model(monkeypatch, ["pandas eat bamboo"])
+    observation = "Pandas eat bamboo. " * 300 + "[Pandas](https://example.com/pandas)"
+    compacted = compact_observations([observation], 300)
+    assert compacted == ["pandas eat bamboo\n\nSources:\n- https://example.com/pandas"]
+
+
+def test_summaries_are_reduced_until_they_fit(monkeypatch):
+    # The map round leaves 8 summaries of ~250 tokens; one reduce round merges
+    # them into 2.
+    summary = "word " * 200
+    _use_model(monkeypatch, [summary] * 8 + ["merged"] * 2)
+    compacted = compact_observations(["finding " * 1000] * 8, 1000)
+    assert compacted == ["merged", "merged"]
+
+
+def test_async_compaction_matches_the_sync_one(monkeypatch):
+    summary = "word " * 200
+    _use_model(monkeypatch, [summary] * 8 + ["merged"] * 2)
+    compacted = asyncio.run(acompact_observations(["finding " * 1000] * 8, 1000))
+    assert compacted == ["merged", "merged"]
@@ -0,0 +1,112 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langgraph.graph import END, START, StateGraph
+
+from src.graph import nodes, observations
+from src.graph.types import State
+from src.prompts.planner_model import Plan
+
+REPORT = "## Key Points\n\n- pandas eat bamboo"
+
+
+def _build_reporter_graph(node=nodes.reporter_node):
+    builder = StateGraph(State)
+    builder.add_node("reporter", node)
+    builder.add_edge(START, "reporter")
+    builder.add_edge("reporter", END)
+    return builder.compile()
+
+
+def _state():
+    return {
+        "messages": [],
+        "observations": ["pandas eat bamboo"],
+        "current_plan": Plan(
+            locale="en-US",
+            has_enough_context=True,
+            thought="thought",
+            title="Pandas",
+            steps=[],
+        ),
+    }
+
+
+def test_reporter_streams_the_report_and_stores_it(monkeypatch):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content=REPORT)]))
+    monkeypatch.setattr(nodes, "get_llm_by_type", lambda llm_type: model)
+    monkeypatch.setattr(observations, "get_llm_by_type", lambda llm_type: model)
+    chunks, final_state = [], None
+    for mode, event in _build_reporter_graph().stream(
+        _state(), stream_mode=["messages", "values"]
+    ):
+        if mode == "messages":
+            chunk, metadata = event
+            assert metadata["langgraph_node"] == "reporter"
+            chunks.append(chunk)
+        else:
+            final_state = event
+
+    assert len(chunks) > 1
+    assert all(isinstance(chunk, AIMessageChunk) for chunk in chunks)
+    assert "".join(chunk.content for chunk in chunks) == REPORT
+    assert final_state["final_report"] == REPORT
+
+
+def test_reporter_emits_tokens_without_a_streaming_consumer(monkeypatch):
+    class TokenCollector(BaseCallbackHandler):
+        def __init__(self):
+            self.tokens = []
+
+        def on_llm_new_token(self, token, **kwargs):
+            self.tokens.append(token)
+
+    model = GenericFakeChatModel(messages=iter([AIMessage(content=REPORT)]))
+    monkeypatch.setattr(nodes, "get_llm_by_type", lambda llm_type: model)
+    monkeypatch.setattr(observations, "get_llm_by_type", lambda llm_type: model)
+    collector = TokenCollector()
+    result = nodes.reporter_node(_state(), {"callbacks": [collector]})
+
+    assert len(collector.tokens) > 1
+    assert result == {"final_report": REPORT}
+
+
+def test_async_reporter_streams_the_report(monkeypatch):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content=REPORT)]))
+    monkeypatch.setattr(nodes, "get_llm_by_type", lambda llm_type: model)
+    monkeypatch.setattr(observations, "get_llm_by_type", lambda llm_type: model)
+
+    async def run():
+        chunks, final_state = [], None
+        graph = _build_reporter_graph(nodes.reporter_node_async)
+        async for mode, event in graph.astream(
+            _state(), stream_mode=["messages", "values"]
+        ):
+            if mode == "messages":
+                chunks.append(event[0])
+            else:
+                final_state = event
+        return chunks, final_state
+
+    chunks, final_state = asyncio.run(run())
+    assert len(chunks) > 1
+    assert "".join(chunk.content for chunk in chunks) == REPORT
+    assert final_state["final_report"] == REPORT
+
+
+def test_prefix_caching_puts_the_instructions_first(monkeypatch):
+    configurable = nodes.Configuration()
+    default, _ = nodes._reporter_prompt(_state(), configurable, ["finding"])
+    monkeypatch.setenv("PROMPT_PREFIX_CACHING", "true")
+    stable, _ = nodes._reporter_prompt(_state(), configurable, ["finding"])
+
+    def names(messages):
+        return [getattr(message, "name", None) for message in messages[1:]]
+
+    assert names(default) == [None, "system", "observation", "system"]
+    assert names(stable) == ["system", "system", None, "observation"]
@@ -0,0 +1,99 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from datetime import datetime, timedelta
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.graph import nodes
+from src.llms import cache as llm_cache
+from src.llms.cache import LLMResponseCache, with_llm_cache
+from src.prompts import template
+from src.utils.cache import SQLiteCacheStore, TTLCache
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    store = SQLiteCacheStore(str(tmp_path / "llm.sqlite"))
+    return LLMResponseCache(TTLCache(disk_store=store))
+
+
+def _model(cache, responses=("first", "second")):
+    return FakeListChatModel(responses=list(responses), cache=cache)
+
+
+def _messages(message_id):
+    return [
+        SystemMessage(content="You are a planner."),
+        HumanMessage(content="Plan a trip", id=message_id),
+    ]
+
+
+def test_identical_prompts_are_served_from_cache(response_cache):
+    model = _model(response_cache)
+    assert model.invoke(_messages("a")).content == "first"
+    # Message ids differ between runs but don't change the request.
+    assert model.invoke(_messages("b")).content == "first"
+    assert response_cache.cache.stats.hits == 1
+
+
+def test_model_configuration_is_part_of_the_key(response_cache):
+    _model(response_cache).invoke(_messages("a"))
+    other = _model(response_cache, responses=("other",))
+    assert other.invoke(_messages("a"), stop=["\n"]).content == "other"
+
+
+def test_responses_persist_in_sqlite(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    first = LLMResponseCache(TTLCache(disk_store=SQLiteCacheStore(path)))
+    _model(first).invoke(_messages("a"))
+
+    second = LLMResponseCache(TTLCache(disk_store=SQLiteCacheStore(path)))
+    assert _model(second).invoke(_messages("a")).content == "first"
+    assert second.cache.stats.hits == 1
+
+
+def test_with_llm_cache_is_opt_in(monkeypatch, response_cache):
+    model = _model(None)
+    monkeypatch.delenv("LLM_CACHE_ENABLED", raising=False)
+    assert with_llm_cache(model, "planner") is model
+
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    monkeypatch.setattr(llm_cache, "get_llm_response_cache", lambda: response_cache)
+    monkeypatch.setattr(llm_cache, "_cached_llms", {})
+    assert with_llm_cache(model, "researcher") is model
+
+    cached = with_llm_cache(model, "planner")
+    assert cached is not model
+    assert cached.cache is response_cache
+    assert with_llm_cache(model, "coordinator") is cached
+
+
+class FakeCoordinatorModel(FakeListChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def test_rendered_prompts_hit_the_cache_seconds_apart(monkeypatch, response_cache):
+    now = [datetime(2025, 5, 1, 10, 0, 0)]
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now[0]
+
+    monkeypatch.delenv("PROMPT_PREFIX_CACHING", raising=False)
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    monkeypatch.setattr(template, "datetime", Clock)
+    monkeypatch.setattr(llm_cache, "get_llm_response_cache", lambda: response_cache)
+    monkeypatch.setattr(llm_cache, "_cached_llms", {})
+    model = FakeCoordinatorModel(responses=["first", "second"])
+    monkeypatch.setattr(nodes, "get_llm_by_type", lambda llm_type: model)
+    state = {"messages": [HumanMessage(content="Hello")]}
+
+    nodes.coordinator_node(state, {})
+    now[0] += timedelta(seconds=5)
+    nodes.coordinator_node(state, {})
+    assert response_cache.cache.stats.hits == 1
@@ -0,0 +1,45 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_openai import ChatOpenAI
+
+from src.llms import prompt_cache
+from src.llms.llm_with_retry import ChatOpenAIWithRetry
+
+
+def _usage(prompt_tokens, cached_tokens):
+    return {
+        "input_tokens": prompt_tokens,
+        "output_tokens": 10,
+        "total_tokens": prompt_tokens + 10,
+        "input_token_details": {"cache_read": cached_tokens},
+    }
+
+
+def test_cached_prompt_tokens_are_counted_per_model(monkeypatch):
+    monkeypatch.setattr(prompt_cache, "_stats", {})
+    prompt_cache.record_prompt_cache_usage("model-a", _usage(2000, 1536))
+    prompt_cache.record_prompt_cache_usage("model-a", _usage(2000, 0))
+    prompt_cache.record_prompt_cache_usage("model-a", None)
+
+    stats = prompt_cache.prefix_cache_stats()["model-a"]
+    assert stats["requests"] == 2
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["cached_token_rate"] == 1536 / 4000
+
+
+def test_api_responses_are_recorded(monkeypatch):
+    monkeypatch.setattr(prompt_cache, "_stats", {})
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        message = AIMessage(content="ok", usage_metadata=_usage(1200, 1024))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    monkeypatch.setattr(ChatOpenAI, "_generate", fake_generate)
+    llm = ChatOpenAIWithRetry(model="model-b", api_key="sk-test")
+    llm.invoke([HumanMessage(content="hi")])
+
+    assert prompt_cache.prefix_cache_stats()["model-b"]["cached_tokens"] == 1024
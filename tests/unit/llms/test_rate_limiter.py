@@ -0,0 +1,169 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_openai import ChatOpenAI
+
+from src.llms import llm as llm_module
+from src.llms.rate_limiter import (
+    DEFAULT_PRIORITY,
+    RateLimiter,
+    TokenBucket,
+    get_rate_limiter,
+    priority_from_metadata,
+)
+
+
+def test_token_bucket_refills_over_time(monkeypatch):
+    bucket = TokenBucket(60)
+    bucket.consume(60)
+    assert bucket.time_until(1, bucket.updated_at) == pytest.approx(1.0)
+    assert bucket.time_until(1, bucket.updated_at + 1.0) == 0
+
+
+def test_requests_per_minute_is_enforced():
+    limiter = RateLimiter(requests_per_minute=600)  # one every 0.1s
+    limiter.requests.available = 1
+    started = time.monotonic()
+    for _ in range(3):
+        with limiter.limit(tokens=1):
+            pass
+    assert time.monotonic() - started >= 0.18
+
+
+def test_max_concurrency_is_enforced():
+    limiter = RateLimiter(max_concurrency=2)
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def call():
+        nonlocal in_flight, peak
+        with limiter.limit(tokens=1):
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 2
+
+
+def test_higher_priority_callers_are_admitted_first():
+    limiter = RateLimiter(max_concurrency=1)
+    order = []
+
+    async def call(name, priority, delay):
+        await asyncio.sleep(delay)
+        async with limiter.alimit(tokens=1, priority=priority):
+            order.append(name)
+            await asyncio.sleep(0.05)
+
+    async def run():
+        await asyncio.gather(
+            call("first", 2, 0),
+            call("reporter", 3, 0.01),
+            call("coordinator", 0, 0.02),
+        )
+
+    asyncio.run(run())
+    assert order == ["first", "coordinator", "reporter"]
+
+
+def test_usage_corrects_the_token_estimate():
+    limiter = RateLimiter(tokens_per_minute=1000)
+    with limiter.limit(tokens=100) as lease:
+        lease.record_usage(400)
+    assert limiter.tokens.available == pytest.approx(600, abs=1)
+
+
+def test_cancelled_waiters_leave_the_queue():
+    limiter = RateLimiter(max_concurrency=1)
+
+    async def run():
+        async with limiter.alimit(tokens=1):
+            waiter = asyncio.create_task(limiter.alimit(tokens=1).__aenter__())
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        assert limiter._waiters == []
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "metadata, expected",
+    [
+        (None, DEFAULT_PRIORITY),
+        ({"langgraph_node": "coordinator"}, 0),
+        (
+            {
+                "langgraph_node": "agent",
+                "langgraph_checkpoint_ns": "researcher:1|agent:2",
+            },
+            2,
+        ),
+        ({"langgraph_node": "reporter"}, 3),
+    ],
+)
+def test_priority_from_metadata(metadata, expected):
+    assert priority_from_metadata(metadata) == expected
+
+
+def test_limiters_are_shared_per_model():
+    first = get_rate_limiter("shared-model", requests_per_minute=10)
+    assert get_rate_limiter("shared-model", requests_per_minute=10) is first
+    assert get_rate_limiter("unlimited-model") is None
+
+
+def test_model_conf_limits_are_applied():
+    llm = llm_module._create_llm_use_conf(
+        "basic",
+        {
+            "BASIC_MODEL": {
+                "model": "limited-model",
+                "api_key": "key",
+                "requests_per_minute": 30,
+                "max_concurrency": 2,
+            }
+        },
+    )
+    assert llm._rate_limiter.max_concurrency == 2
+    assert llm._rate_limiter.requests.capacity == 30
+    assert "requests_per_minute" not in llm.model_kwargs
+
+
+def test_generate_goes_through_the_limiter(monkeypatch):
+    llm = llm_module._create_llm_use_conf(
+        "basic",
+        {
+            "BASIC_MODEL": {
+                "model": "counted-model",
+                "api_key": "k",
+                "max_concurrency": 1,
+            }
+        },
+    )
+    seen = []
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        seen.append(llm._rate_limiter.in_flight)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+    monkeypatch.setattr(ChatOpenAI, "_generate", fake_generate)
+    assert llm.invoke([HumanMessage(content="hi")]).content == "ok"
+    assert seen == [1]
+    assert llm._rate_limiter.in_flight == 0
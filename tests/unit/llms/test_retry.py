@@ -0,0 +1,206 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+
+from src.llms import llm_with_retry
+from src.llms.llm_with_retry import ChatOpenAIWithRetry
+from src.llms.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    is_retryable,
+    retry_after,
+)
+
+REQUEST = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+
+
+def _status_error(status, headers=None):
+    response = httpx.Response(status, headers=headers or {}, request=REQUEST)
+    if status == 429:
+        return openai.RateLimitError("rate limited", response=response, body=None)
+    if status >= 500:
+        return openai.InternalServerError("server error", response=response, body=None)
+    return openai.BadRequestError("bad request", response=response, body=None)
+
+
+def _result(text="ok"):
+    return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waited = []
+
+    async def fake_asleep(delay):
+        waited.append(delay)
+
+    monkeypatch.setattr(llm_with_retry.time, "sleep", waited.append)
+    monkeypatch.setattr(llm_with_retry.asyncio, "sleep", fake_asleep)
+    return waited
+
+
+def _llm(**kwargs):
+    return ChatOpenAIWithRetry(model="test-model", api_key="sk-test", **kwargs)
+
+
+def test_errors_are_classified_by_type_and_status():
+    assert is_retryable(_status_error(429))
+    assert is_retryable(_status_error(503))
+    assert is_retryable(openai.APITimeoutError(request=REQUEST))
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert not is_retryable(_status_error(400))
+    assert not is_retryable(ValueError("connection timeout"))
+
+
+def test_retry_after_headers():
+    assert retry_after(_status_error(429, {"retry-after": "7"})) == 7
+    assert retry_after(_status_error(429, {"retry-after-ms": "1500"})) == 1.5
+    date = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert retry_after(_status_error(429, {"retry-after": date})) == 0
+    assert retry_after(_status_error(429)) is None
+
+
+def test_invoke_retries_honoring_retry_after(monkeypatch, sleeps):
+    outcomes = [_status_error(429, {"retry-after": "3"}), _result("done")]
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(ChatOpenAI, "_generate", fake_generate)
+    assert _llm().invoke([HumanMessage(content="hi")]).content == "done"
+    assert sleeps == [3.0]
+
+
+def test_client_errors_are_not_retried(monkeypatch, sleeps):
+    calls = []
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append(messages)
+        raise _status_error(400)
+
+    monkeypatch.setattr(ChatOpenAI, "_generate", fake_generate)
+    with pytest.raises(openai.BadRequestError):
+        _llm().invoke([HumanMessage(content="hi")])
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_retries_stop_at_the_deadline(monkeypatch, sleeps):
+    calls = []
+
+    async def fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append(messages)
+        raise _status_error(503, {"retry-after": "60"})
+
+    monkeypatch.setattr(ChatOpenAI, "_agenerate", fake_agenerate)
+    llm = _llm(max_retries=5, retry_deadline=30)
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(llm.ainvoke([HumanMessage(content="hi")]))
+    assert len(calls) == 1
+
+
+def test_stream_retries_only_before_the_first_chunk(monkeypatch, sleeps):
+    attempts = []
+
+    def fake_stream(self, messages, stop=None, run_manager=None, **kwargs):
+        attempts.append(messages)
+        if len(attempts) == 1:
+            raise _status_error(503)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="a"))
+        if len(attempts) == 2:
+            raise _status_error(503)
+
+    monkeypatch.setattr(ChatOpenAI, "_stream", fake_stream)
+    chunks = []
+    with pytest.raises(openai.InternalServerError):
+        for chunk in _llm().stream([HumanMessage(content="hi")]):
+            chunks.append(chunk.content)
+    assert len(attempts) == 2
+    assert chunks == ["a"]
+
+
+def test_circuit_breaker_sheds_load_until_reset(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("src.llms.retry.time.monotonic", lambda: clock[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    state = RetryPolicy(max_attempts=1).start(breaker)
+
+    for _ in range(2):
+        state.before_attempt()
+        state.failed(_status_error(503))
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock[0] = 11
+    breaker.before_call()  # the probe goes through
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    breaker.before_call()
+    assert not breaker.is_open
+
+
+def _open_breaker():
+    # Open, and ready to let a probe through
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    return breaker
+
+
+def test_cancelled_probe_is_released(monkeypatch):
+    breaker = _open_breaker()
+    llm = _llm(circuit_breaker=breaker)
+
+    async def hang(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(ChatOpenAI, "_agenerate", hang)
+
+    async def run():
+        probe = asyncio.create_task(llm.ainvoke([HumanMessage(content="hi")]))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(run())
+    assert breaker.before_call()  # the next call probes instead
+
+
+def test_abandoned_stream_probe_is_released(monkeypatch):
+    breaker = _open_breaker()
+
+    def fake_stream(self, messages, stop=None, run_manager=None, **kwargs):
+        yield ChatGenerationChunk(message=AIMessageChunk(content="a"))
+        yield ChatGenerationChunk(message=AIMessageChunk(content="b"))
+
+    monkeypatch.setattr(ChatOpenAI, "_stream", fake_stream)
+    stream = _llm(circuit_breaker=breaker)._stream([HumanMessage(content="hi")])
+    next(stream)
+    stream.close()
+    assert breaker.before_call()
+
+
+def test_probe_failing_for_other_reasons_is_released(monkeypatch, sleeps):
+    breaker = _open_breaker()
+
+    def broken(self, messages, stop=None, run_manager=None, **kwargs):
+        raise ValueError("unparseable response")
+
+    monkeypatch.setattr(ChatOpenAI, "_generate", broken)
+    with pytest.raises(ValueError):
+        _llm(circuit_breaker=breaker).invoke([HumanMessage(content="hi")])
+    assert breaker.is_open
+    assert breaker.before_call()
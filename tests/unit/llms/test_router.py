@@ -0,0 +1,160 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import BaseModel
+
+from src.llms import llm as llm_module
+from src.llms.llm_with_retry import ChatOpenAIWithRetry
+from src.llms import router as router_module
+from src.llms.router import RoutedChatModel
+
+MESSAGES = [HumanMessage(content="hi")]
+
+
+def _unavailable():
+    request = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+    response = httpx.Response(503, request=request)
+    return openai.InternalServerError("unavailable", response=response, body=None)
+
+
+def _endpoint(name, reply=None, delay=0.0, error=None, calls=None):
+    endpoint = ChatOpenAIWithRetry(model=name, api_key="sk-test", max_retries=1)
+
+    def generate(messages, stop=None, run_manager=None, **kwargs):
+        if calls is not None:
+            calls.append((name, kwargs))
+        time.sleep(delay)
+        if error:
+            raise error
+        message = AIMessage(content=reply or name)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def agenerate(messages, stop=None, run_manager=None, **kwargs):
+        if calls is not None:
+            calls.append((name, kwargs))
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        message = AIMessage(content=reply or name)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def stream(messages, stop=None, run_manager=None, **kwargs):
+        if error:
+            raise error
+        yield ChatGenerationChunk(message=AIMessageChunk(content=name))
+
+    object.__setattr__(endpoint, "_generate", generate)
+    object.__setattr__(endpoint, "_agenerate", agenerate)
+    object.__setattr__(endpoint, "_stream", stream)
+    return endpoint
+
+
+def _router(endpoints, **kwargs):
+    return RoutedChatModel(
+        endpoints=endpoints, model="primary", api_key="sk-test", **kwargs
+    )
+
+
+def test_failover_on_transient_errors():
+    router = _router([_endpoint("a", error=_unavailable()), _endpoint("b")])
+    assert router.invoke(MESSAGES).content == "b"
+    assert asyncio.run(router.ainvoke(MESSAGES)).content == "b"
+    assert "".join(chunk.content for chunk in router.stream(MESSAGES)) == "b"
+
+
+def test_client_errors_do_not_fail_over():
+    router = _router([_endpoint("a", error=ValueError("bad")), _endpoint("b")])
+    with pytest.raises(ValueError):
+        router.invoke(MESSAGES)
+
+
+def test_latency_routing_prefers_the_faster_endpoint():
+    router = _router(
+        [_endpoint("slow", delay=0.05), _endpoint("fast")], strategy="latency"
+    )
+    # Both endpoints are unmeasured at first, then the fastest one wins.
+    assert [router.invoke(MESSAGES).content for _ in range(2)] == ["slow", "fast"]
+    assert router.invoke(MESSAGES).content == "fast"
+
+
+def test_latency_routing_puts_failing_endpoints_last(monkeypatch):
+    calls = []
+    router = _router(
+        [_endpoint("down", error=_unavailable(), calls=calls), _endpoint("up")],
+        strategy="latency",
+    )
+    assert [router.invoke(MESSAGES).content for _ in range(3)] == ["up"] * 3
+    assert calls == [("down", {})]
+
+    # After the cooldown the failed endpoint is tried again
+    monkeypatch.setattr(router_module, "FAILURE_COOLDOWN_SECONDS", 0.0)
+    router.invoke(MESSAGES)
+    assert len(calls) == 2
+
+
+def test_streams_record_the_time_to_first_chunk():
+    endpoint = _endpoint("a")
+
+    def stream(messages, stop=None, run_manager=None, **kwargs):
+        yield ChatGenerationChunk(message=AIMessageChunk(content="a"))
+        time.sleep(0.2)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="b"))
+
+    object.__setattr__(endpoint, "_stream", stream)
+    router = _router([endpoint], strategy="latency")
+    assert "".join(chunk.content for chunk in router.stream(MESSAGES)) == "ab"
+    assert router._endpoint_stats[0].ewma < 0.1
+
+
+def test_hedged_request_takes_the_first_response():
+    router = _router(
+        [_endpoint("slow", delay=0.5), _endpoint("fast")],
+        hedge=True,
+        hedge_delay=0.05,
+    )
+    started = time.monotonic()
+    assert router.invoke(MESSAGES).content == "fast"
+    assert asyncio.run(router.ainvoke(MESSAGES)).content == "fast"
+    assert time.monotonic() - started < 0.9
+
+
+def test_bound_kwargs_reach_the_endpoint():
+    class Answer(BaseModel):
+        text: str
+
+    calls = []
+    endpoint = _endpoint("a", reply='{"text": "hello"}', calls=calls)
+    structured = _router([endpoint]).with_structured_output(Answer, method="json_mode")
+    assert structured.invoke(MESSAGES) == Answer(text="hello")
+    assert calls[0][1]["response_format"] == {"type": "json_object"}
+
+
+def test_conf_with_endpoints_builds_a_router(monkeypatch):
+    conf = {
+        "BASIC_MODEL": {
+            "api_key": "sk-test",
+            "routing": "latency",
+            "hedge": True,
+            "endpoints": [
+                {"base_url": "https://a.example.com/v1", "model": "model-a"},
+                {"base_url": "https://b.example.com/v1", "model": "model-b"},
+            ],
+        }
+    }
+    llm = llm_module._create_llm_use_conf("basic", conf)
+    assert isinstance(llm, RoutedChatModel)
+    assert [e.model_name for e in llm._endpoints] == ["model-a", "model-b"]
+    assert llm.model_name == "model-a"
+
+    single = llm_module._create_llm_use_conf(
+        "basic", {"BASIC_MODEL": {"model": "model-a", "api_key": "sk-test"}}
+    )
+    assert isinstance(single, ChatOpenAIWithRetry)
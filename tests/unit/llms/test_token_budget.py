@@ -0,0 +1,60 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.llms import token_budget
+from src.llms.token_budget import (
+    TRUNCATION_MARKER,
+    count_message_tokens,
+    fit_messages,
+    prompt_token_stats,
+)
+
+
+def _messages():
+    return [
+        {"role": "system", "content": "You are a researcher. " * 50},
+        HumanMessage(content="Findings of earlier steps. " * 200),
+        AIMessage(
+            content="",
+            tool_calls=[{"name": "web_search", "args": {}, "id": "call-1"}],
+        ),
+        ToolMessage(content="search result " * 500, tool_call_id="call-1"),
+        HumanMessage(content="What do pandas eat?"),
+    ]
+
+
+def test_prompts_within_budget_are_unchanged():
+    messages = _messages()
+    assert fit_messages(messages, "researcher", budget=100_000) == messages
+
+
+def test_least_important_messages_are_truncated_first():
+    messages = _messages()
+    fitted = fit_messages(messages, "researcher", budget=1200)
+
+    assert count_message_tokens(fitted) <= 1200
+    assert len(fitted) == len(messages)
+    # The tool output goes first, then the earlier findings
+    assert fitted[3].content.endswith(TRUNCATION_MARKER)
+    assert fitted[3].tool_call_id == "call-1"
+    assert fitted[0] == messages[0]
+    assert fitted[-1] == messages[-1]
+    assert messages[3].content == "search result " * 500
+
+
+def test_token_counts_are_recorded_per_agent(monkeypatch):
+    monkeypatch.setattr(token_budget, "_stats", {})
+    fit_messages(_messages(), "coder", budget=100_000)
+    fit_messages(_messages(), "coder", budget=1200)
+
+    stats = prompt_token_stats()["coder"]
+    assert stats["calls"] == 2
+    assert stats["truncated_calls"] == 1
+    assert stats["max_prompt_tokens"] > 1200
+
+
+def test_counting_falls_back_to_an_estimate(monkeypatch):
+    monkeypatch.setattr(token_budget, "get_tokenizer", lambda model=None: None)
+    assert token_budget.count_tokens("a" * 40) == 10
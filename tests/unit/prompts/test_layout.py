@@ -0,0 +1,44 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from langchain_core.messages import HumanMessage
+
+from src.prompts.layout import CACHE_CONTROL, current_time_format, static_first
+from src.prompts.template import apply_prompt_template
+
+
+def test_layout_is_unchanged_by_default(monkeypatch):
+    monkeypatch.delenv("PROMPT_PREFIX_CACHING", raising=False)
+    monkeypatch.setenv("PROMPT_CACHE_CONTROL", "true")
+    system = {"role": "system", "content": "system prompt"}
+    task = HumanMessage(content="task")
+    assert static_first([system], [task]) == [system, task]
+    assert "%H" in current_time_format()
+
+
+def test_cache_breakpoint_marks_the_end_of_the_static_prefix(monkeypatch):
+    monkeypatch.setenv("PROMPT_PREFIX_CACHING", "true")
+    monkeypatch.setenv("PROMPT_CACHE_CONTROL", "true")
+    system = {"role": "system", "content": "system prompt"}
+    rules = HumanMessage(content="rules", name="system")
+    task = HumanMessage(content="task")
+
+    messages = static_first([system, rules], [task])
+    assert messages[0] == system
+    assert messages[1].content == [
+        {"type": "text", "text": "rules", "cache_control": CACHE_CONTROL}
+    ]
+    assert messages[2] is task
+    # The original message is left untouched
+    assert rules.content == "rules"
+
+
+def test_system_prompt_is_stable_within_a_day(monkeypatch):
+    monkeypatch.setenv("PROMPT_PREFIX_CACHING", "true")
+    system_prompt = apply_prompt_template("coordinator", {"messages": []})[0]
+    current_time = next(
+        line
+        for line in system_prompt["content"].splitlines()
+        if line.startswith("CURRENT_TIME:")
+    )
+    assert ":" not in current_time.removeprefix("CURRENT_TIME:")
@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+from pydantic import ValidationError
+
+from src.prompts.planner_model import Plan
+
+
+def _plan(*depends_on):
+    return {
+        "locale": "en-US",
+        "has_enough_context": False,
+        "thought": "thought",
+        "title": "title",
+        "steps": [
+            {
+                "need_search": True,
+                "title": f"step {i}",
+                "description": f"step {i} description",
+                "step_type": "research",
+                "depends_on": deps,
+            }
+            for i, deps in enumerate(depends_on)
+        ],
+    }
+
+
+def test_steps_without_depends_on_run_in_order():
+    plan = Plan.model_validate(_plan(None, None, None))
+    assert plan.topological_waves() == [[0], [1], [2]]
+    assert plan.get_ancestors(2) == [0, 1]
+
+
+def test_topological_waves():
+    plan = Plan.model_validate(_plan([], [], [0], [1, 2]))
+    assert plan.topological_waves() == [[0, 1], [2], [3]]
+
+
+def test_get_ancestors_is_transitive():
+    plan = Plan.model_validate(_plan([], [], [0], [2]))
+    assert plan.get_ancestors(3) == [0, 2]
+    assert plan.get_ancestors(1) == []
+
+
+def test_forward_references_are_allowed():
+    plan = Plan.model_validate(_plan([1], []))
+    assert plan.topological_waves() == [[1], [0]]
+
+
+@pytest.mark.parametrize(
+    "depends_on",
+    [
+        ([1], [0]),  # cycle
+        ([0],),  # self reference
+        ([], [5]),  # unknown step
+        ([1], None),  # cycle through implicit dependencies
+    ],
+)
+def test_invalid_dependencies_are_rejected(depends_on):
+    with pytest.raises(ValidationError):
+        Plan.model_validate(_plan(*depends_on))
@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import base64
+import importlib
+import time
+from typing import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from src.server.chat_request import GeneratePodcastRequest, TTSRequest
+
+# `src.server.app` is shadowed by the FastAPI instance re-exported by `src.server`
+app_module = importlib.import_module("src.server.app")
+
+BLOCKING_SECONDS = 0.5
+
+
+class _PodcastState(TypedDict):
+    input: str
+    output: bytes
+
+
+def _slow_podcast_node(state: _PodcastState):
+    # Simulates the synchronous script writer / TTS calls of the podcast graph
+    time.sleep(BLOCKING_SECONDS)
+    return {"output": b"audio"}
+
+
+def _build_slow_podcast_graph():
+    builder = StateGraph(_PodcastState)
+    builder.add_node("podcast", _slow_podcast_node)
+    builder.add_edge(START, "podcast")
+    builder.add_edge("podcast", END)
+    return builder.compile()
+
+
+class _SlowTTS:
+    def __init__(self, **kwargs):
+        pass
+
+    def text_to_speech(self, **kwargs):
+        time.sleep(BLOCKING_SECONDS)
+        return {"success": True, "audio_data": base64.b64encode(b"audio").decode()}
+
+
+async def _max_event_loop_lag(task_factory) -> float:
+    """Run a task while a simulated chat stream ticks, return the worst tick delay."""
+    task = asyncio.create_task(task_factory())
+    max_lag = 0.0
+    while not task.done():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        max_lag = max(max_lag, time.perf_counter() - start - 0.01)
+    await task
+    return max_lag
+
+
+def test_podcast_generation_does_not_block_event_loop(monkeypatch):
+    graph = _build_slow_podcast_graph()
+    monkeypatch.setattr(app_module.workflows, "get", lambda name: graph)
+
+    lag = asyncio.run(
+        _max_event_loop_lag(
+            lambda: app_module.generate_podcast(
+                GeneratePodcastRequest(content="report")
+            )
+        )
+    )
+    assert lag < BLOCKING_SECONDS / 2
+
+
+def test_tts_does_not_block_event_loop(monkeypatch):
+    monkeypatch.setenv("VOLCENGINE_TTS_APPID", "app")
+    monkeypatch.setenv("VOLCENGINE_TTS_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(app_module, "VolcengineTTS", _SlowTTS)
+
+    async def call_tts():
+        response = await app_module.text_to_speech(TTSRequest(text="hello"))
+        assert response.body == b"audio"
+
+    lag = asyncio.run(_max_event_loop_lag(call_tts))
+    assert lag < BLOCKING_SECONDS / 2
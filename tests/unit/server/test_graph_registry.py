@@ -0,0 +1,54 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import threading
+import time
+
+import pytest
+
+from src.server.graph_registry import CompiledGraphRegistry
+
+
+def test_graph_is_built_once():
+    calls = []
+
+    def build():
+        calls.append(1)
+        return object()
+
+    registry = CompiledGraphRegistry({"prose": build})
+    first = registry.get("prose")
+    assert registry.get("prose") is first
+    assert len(calls) == 1
+
+    registry.clear()
+    assert registry.get("prose") is not first
+    assert len(calls) == 2
+
+
+def test_concurrent_first_use_builds_once():
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry = CompiledGraphRegistry({"podcast": build})
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get("podcast")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_unknown_workflow():
+    with pytest.raises(KeyError):
+        CompiledGraphRegistry({}).get("missing")
@@ -0,0 +1,95 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from src.server import mcp_utils
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+
+    async def load_mcp_tools(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.01)
+        if kwargs["command"] == "broken":
+            raise HTTPException(status_code=500, detail="failed")
+        return [f"tool-{len(calls)}"]
+
+    monkeypatch.setattr(mcp_utils, "load_mcp_tools", load_mcp_tools)
+    mcp_utils.mcp_metadata_cache.clear()
+    yield calls
+    mcp_utils.mcp_metadata_cache.clear()
+
+
+def _load(**kwargs):
+    return mcp_utils.load_mcp_tools_cached(
+        "stdio", command=kwargs.pop("command", "uvx"), args=["server"], **kwargs
+    )
+
+
+def test_metadata_is_cached_per_configuration(loads):
+    async def run():
+        first, second = await asyncio.gather(_load(), _load())
+        other_env = await _load(env={"API_KEY": "x"})
+        return first, second, other_env, await _load()
+
+    first, second, other_env, again = asyncio.run(run())
+    assert first == second == again == ["tool-1"]
+    assert other_env == ["tool-2"]
+    assert len(loads) == 2
+
+
+def test_coalesced_callers_survive_a_cancelled_leader(loads):
+    async def run():
+        leader = asyncio.create_task(_load())
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(_load())
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == ["tool-2"]
+    assert len(loads) == 2
+
+
+def test_force_refresh_reloads(loads):
+    async def run():
+        await _load()
+        refreshed = await _load(force_refresh=True)
+        return refreshed, await _load()
+
+    assert asyncio.run(run()) == (["tool-2"], ["tool-2"])
+
+
+def test_stale_metadata_is_refreshed_in_background(loads, monkeypatch):
+    monkeypatch.setattr(mcp_utils, "MCP_METADATA_REFRESH_SECONDS", 0)
+
+    async def run():
+        await _load()
+        stale = await _load()
+        await asyncio.sleep(0.05)
+        return stale, await _load()
+
+    stale, refreshed = asyncio.run(run())
+    assert stale == ["tool-1"]
+    assert refreshed[0] != "tool-1"
+
+
+def test_errors_are_not_cached(loads):
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            asyncio.run(_load(command="broken"))
+    assert len(loads) == 2
+
+
+def test_env_is_hashed_in_the_key():
+    key = mcp_utils.metadata_cache_key("stdio", "uvx", ["a"], None, {"TOKEN": "secret"})
+    assert "secret" not in repr(key)
+    assert key != mcp_utils.metadata_cache_key("stdio", "uvx", ["a"], None, None)
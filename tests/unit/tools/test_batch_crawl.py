@@ -0,0 +1,75 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.crawler import Article, Crawler
+from src.tools import crawl as crawl_module
+from src.tools.crawl import batch_crawl_tool
+
+
+@pytest.fixture
+def crawler(monkeypatch):
+    state = {"in_flight": 0, "peak": 0, "calls": []}
+
+    class DummyJinaClient:
+        def crawl(self, url, return_format=None):
+            state["calls"].append(url)
+            if "bad" in url:
+                raise ConnectionError("unreachable")
+            return f"<p>{url}</p>"
+
+        async def acrawl(self, url, return_format=None):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.02)
+            state["in_flight"] -= 1
+            return self.crawl(url, return_format)
+
+    class DummyReadabilityExtractor:
+        def extract_article(self, html):
+            return Article(title="Title", html_content=html)
+
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", DummyJinaClient)
+    monkeypatch.setattr(
+        "src.crawler.crawler.ReadabilityExtractor", DummyReadabilityExtractor
+    )
+    crawler = Crawler()
+    monkeypatch.setattr(crawl_module, "get_crawler", lambda: crawler)
+    crawler.state = state
+    return crawler
+
+
+def test_crawl_many_keeps_order_and_reports_failures(crawler):
+    urls = ["https://a.com/", "https://bad.com/", "https://a.com/"]
+    results = asyncio.run(crawler.crawl_many(urls, max_concurrency=2))
+
+    assert isinstance(results[0], Article)
+    assert isinstance(results[1], ConnectionError)
+    assert results[2] is results[0]
+    assert crawler.state["calls"] == ["https://a.com/", "https://bad.com/"]
+
+
+def test_crawl_many_bounds_concurrency(crawler):
+    urls = [f"https://site{i}.com/" for i in range(6)]
+    results = asyncio.run(crawler.crawl_many(urls, max_concurrency=2))
+
+    assert all(isinstance(result, Article) for result in results)
+    assert crawler.state["peak"] == 2
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_batch_crawl_tool_returns_per_url_results(crawler, use_async):
+    tool_input = {"urls": ["https://a.com/", "https://bad.com/"]}
+    if use_async:
+        output = asyncio.run(batch_crawl_tool.ainvoke(tool_input))
+    else:
+        output = batch_crawl_tool.invoke(tool_input)
+
+    assert output["succeeded"] == 1
+    assert output["failed"] == 1
+    assert output["results"][0]["url"] == "https://a.com/"
+    assert "https://a.com/" in output["results"][0]["crawled_content"]
+    assert "unreachable" in output["results"][1]["error"]
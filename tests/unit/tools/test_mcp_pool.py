@@ -0,0 +1,139 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import sys
+import textwrap
+import time
+
+import pytest
+
+from src.tools.mcp_pool import MCPSessionPool, _PooledSession, server_config_key
+
+SERVER = textwrap.dedent("""
+    import os
+
+    from mcp.server.fastmcp import FastMCP
+
+    server = FastMCP("echo")
+
+    @server.tool()
+    def echo(text: str) -> str:
+        \"\"\"Echo the text back.\"\"\"
+        return f"{os.getpid()}:{text}"
+
+    server.run()
+    """)
+
+
+@pytest.fixture
+def server_config(tmp_path):
+    script = tmp_path / "echo_server.py"
+    script.write_text(SERVER)
+    return {"transport": "stdio", "command": sys.executable, "args": [str(script)]}
+
+
+async def _echo(pool, servers, text="hi", thread_id=None):
+    async with pool.tools(servers, thread_id) as tools:
+        (tool,) = tools
+        return await tool.ainvoke({"text": text})
+
+
+def test_config_key_is_stable():
+    assert server_config_key({"a": 1, "b": [2]}) == server_config_key(
+        {"b": [2], "a": 1}
+    )
+    assert server_config_key({"env": {"K": "1"}}) != server_config_key(
+        {"env": {"K": "2"}}
+    )
+
+
+def test_sessions_are_reused_across_steps(server_config):
+    async def run():
+        pool = MCPSessionPool()
+        servers = {"echo": server_config}
+        first = await _echo(pool, servers)
+        second = await _echo(pool, servers)
+        assert len(pool) == 1
+        await pool.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    # Same server process served both steps
+    assert first.split(":")[0] == second.split(":")[0]
+
+
+def test_idle_sessions_are_closed(server_config):
+    async def run():
+        pool = MCPSessionPool(idle_timeout=0)
+        servers = {"echo": server_config}
+        first = await _echo(pool, servers)
+        second = await _echo(pool, servers)
+        await pool.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.split(":")[0] != second.split(":")[0]
+
+
+def test_full_pool_falls_back_to_one_off_sessions(server_config):
+    async def run():
+        pool = MCPSessionPool(max_size=1, scope="thread")
+        servers = {"echo": server_config}
+        async with pool.tools(servers, "thread-1"):
+            await _echo(pool, servers, thread_id="thread-2")
+            assert len(pool) == 1
+        await pool.close()
+
+    asyncio.run(run())
+
+
+def test_idle_sessions_are_reaped_in_the_background(server_config):
+    async def run():
+        pool = MCPSessionPool(idle_timeout=0, reap_interval=0.05, scope="thread")
+        await _echo(pool, {"echo": server_config}, thread_id="thread-1")
+        await asyncio.sleep(0.5)
+        assert len(pool) == 0
+        assert pool._locks == {}
+        await pool.close()
+        assert pool._reaper is None
+
+    asyncio.run(run())
+
+
+@pytest.fixture
+def fake_sessions(monkeypatch):
+    closed = []
+
+    async def open(self):
+        self._task = asyncio.create_task(asyncio.Event().wait())
+
+    async def ping(self, timeout):
+        await asyncio.sleep(0.05)
+        self.last_checked = time.monotonic()
+        return True
+
+    async def close(self, timeout=10.0):
+        closed.append(self.server_name)
+        self._task.cancel()
+
+    monkeypatch.setattr(_PooledSession, "open", open)
+    monkeypatch.setattr(_PooledSession, "ping", ping)
+    monkeypatch.setattr(_PooledSession, "close", close)
+    return closed
+
+
+def test_sessions_are_not_closed_during_their_health_check(fake_sessions):
+    async def use(pool, server_name):
+        async with pool.tools({server_name: {}}):
+            await asyncio.sleep(0.01)
+
+    async def run():
+        pool = MCPSessionPool(max_size=1, health_check_interval=0)
+        await use(pool, "a")
+        # "a" is being pinged while "b" looks for room in the full pool
+        await asyncio.gather(use(pool, "a"), use(pool, "b"))
+        assert fake_sessions == ["b"]
+        await pool.close()
+
+    asyncio.run(run())
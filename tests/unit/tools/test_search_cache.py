@@ -0,0 +1,70 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from langchain_core.tools import BaseTool
+
+from src.tools.decorators import create_cached_tool, create_logged_tool
+from src.utils.cache import TTLCache
+
+calls = []
+
+
+class FakeSearch(BaseTool):
+    name: str = "web_search"
+    description: str = "fake search"
+    max_results: int = 5
+    response_format: str = "content_and_artifact"
+
+    def _run(self, query: str):
+        calls.append(query)
+        if query == "error":
+            return "failed", {}
+        return f"results for {query}", {"query": query}
+
+    async def _arun(self, query: str):
+        return self._run(query)
+
+
+def _make_tool_class():
+    calls.clear()
+    return create_logged_tool(create_cached_tool(FakeSearch, TTLCache()))
+
+
+def test_normalized_queries_share_a_cache_entry():
+    tool = _make_tool_class()()
+    first = tool.invoke({"query": "Cute  Panda"})
+    second = tool.invoke({"query": "cute panda "})
+
+    assert first == second == "results for Cute  Panda"
+    assert calls == ["Cute  Panda"]
+
+
+def test_cache_is_shared_between_instances_but_keyed_by_settings():
+    tool_class = _make_tool_class()
+    tool_class().invoke({"query": "q"})
+    tool_class().invoke({"query": "q"})
+    tool_class(max_results=10).invoke({"query": "q"})
+
+    assert calls == ["q", "q"]
+    assert tool_class.result_cache.stats.hits == 1
+
+
+def test_failed_searches_are_not_cached():
+    tool = _make_tool_class()()
+    tool.invoke({"query": "error"})
+    tool.invoke({"query": "error"})
+    assert calls == ["error", "error"]
+
+
+def test_async_calls_use_the_cache():
+    tool = _make_tool_class()()
+
+    async def run():
+        return await asyncio.gather(
+            tool.ainvoke({"query": "q"}), tool.ainvoke({"query": "q"})
+        )
+
+    assert asyncio.run(run()) == ["results for q", "results for q"]
+    assert calls == ["q"]
@@ -0,0 +1,179 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.cache import DiskCacheStore, TTLCache
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = TTLCache(ttl_seconds=10)
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+
+    now[0] += 11
+    assert cache.get("k") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_zero_ttl_disables_caching():
+    cache = TTLCache(ttl_seconds=0)
+    cache.set("k", "v")
+    assert cache.get("k") is None
+
+
+def test_concurrent_identical_calls_are_coalesced():
+    cache = TTLCache()
+    calls = 0
+    started = threading.Event()
+
+    def compute():
+        nonlocal calls
+        calls += 1
+        started.set()
+        time.sleep(0.1)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_compute("k", compute))
+        )
+        for _ in range(5)
+    ]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == 1
+    assert results == ["value"] * 5
+    assert cache.stats.misses == 1
+    assert cache.stats.coalesced + cache.stats.hits == 4
+
+
+def test_errors_are_not_cached():
+    cache = TTLCache()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("k", fail)
+    assert cache.get_or_compute("k", lambda: "ok") == "ok"
+
+
+def test_should_cache_can_veto_a_result():
+    cache = TTLCache()
+    cache.get_or_compute("k", lambda: "error", should_cache=lambda v: v != "error")
+    assert cache.get("k") is None
+
+
+def test_async_calls_are_coalesced():
+    cache = TTLCache()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.aget_or_compute("k", compute) for _ in range(5))
+        )
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert calls == 1
+    assert cache.stats.coalesced == 4
+    assert asyncio.run(cache.aget_or_compute("k", compute)) == "value"
+    assert calls == 1
+
+
+def test_waiting_calls_take_over_from_a_cancelled_leader():
+    cache = TTLCache()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        leader = asyncio.create_task(cache.aget_or_compute("k", compute))
+        await asyncio.sleep(0)
+        followers = [
+            asyncio.create_task(cache.aget_or_compute("k", compute)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(run()) == ["value"] * 3
+    assert calls == 2
+
+
+def test_disk_store_survives_a_new_cache(tmp_path):
+    TTLCache(disk_store=DiskCacheStore(tmp_path)).set("k", {"a": [1, 2]})
+
+    cache = TTLCache(disk_store=DiskCacheStore(tmp_path))
+    assert cache.get("k") == {"a": [1, 2]}
+
+
+def test_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("TEST_CACHE_TTL_SECONDS", "5")
+    monkeypatch.setenv("TEST_CACHE_MAX_ENTRIES", "7")
+    monkeypatch.setenv("TEST_CACHE_DIR", str(tmp_path))
+    cache = TTLCache.from_env("TEST_CACHE")
+    assert cache.ttl_seconds == 5
+    assert cache.max_entries == 7
+    assert cache.disk_store is not None
+
+
+def test_disk_store_sweeps_expired_files_on_write(monkeypatch, tmp_path):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    store = DiskCacheStore(tmp_path)
+    store.set("old", "v", expires_at=1010.0)
+
+    now[0] += DiskCacheStore.sweep_interval + 20
+    store.set("new", "v", expires_at=now[0] + 10)
+    assert [path.name for path in tmp_path.iterdir()] == [store._path("new").name]
+
+
+def test_disk_store_keeps_within_max_bytes(tmp_path):
+    store = DiskCacheStore(tmp_path, max_bytes=300)
+    expires_at = time.time() + 60
+    for i in range(10):
+        store.set(i, "x" * 50, expires_at=expires_at + i)
+
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 300
+    assert store.get(9)[0] == "x" * 50
+    # The soonest-expiring entries go first
+    assert store.get(0)[1] == 0.0
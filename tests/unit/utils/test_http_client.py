@@ -0,0 +1,85 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.utils import http_client
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    requests_seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(request)
+        return httpx.Response(200, json={"body": request.content.decode()})
+
+    kwargs = http_client._client_kwargs()
+    monkeypatch.setattr(
+        http_client,
+        "_client_kwargs",
+        lambda: {**kwargs, "transport": httpx.MockTransport(handler)},
+    )
+    http_client.close()
+    yield requests_seen
+    http_client.close()
+
+
+def test_sync_client_is_shared(transport):
+    assert http_client.get_client() is http_client.get_client()
+
+    http_client.post("https://example.com/a", '{"x": 1}')
+    response = http_client.post("https://example.com/b", json={"y": 2})
+
+    assert response.json() == {"body": '{"y":2}'}
+    assert transport[0].content == b'{"x": 1}'
+    assert len(transport) == 2
+
+
+def test_async_client_is_shared_per_loop(transport):
+    async def run():
+        client = http_client.get_async_client()
+        assert http_client.get_async_client() is client
+        response = await http_client.aget("https://example.com/")
+        await http_client.aclose()
+        return response.status_code
+
+    assert asyncio.run(run()) == 200
+    assert asyncio.run(run()) == 200
+
+
+def test_sync_requests_are_limited_per_host(monkeypatch):
+    monkeypatch.setenv("HTTP_MAX_CONCURRENCY_PER_HOST", "2")
+    monkeypatch.setattr(http_client, "_sync_host_semaphores", {})
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_request(method, url, **kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+
+    class FakeClient:
+        request = staticmethod(fake_request)
+
+    monkeypatch.setattr(http_client, "get_client", lambda: FakeClient)
+    threads = [
+        threading.Thread(target=http_client.get, args=("https://limited.example/",))
+        for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2